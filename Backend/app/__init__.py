@@ -5,6 +5,23 @@ from flask_login import LoginManager
 from app.extensions import db, migrate, mail
 from app.config import Config
 from app.models.user import User
+from app.utils.search_index import register_search_index_listeners
+from app.utils.attribute_index import register_attribute_index_listeners
+from app.utils.category_counters import register_category_counter_listeners
+from app.utils.response_cache import init_response_cache
+from app.utils.conditional_get import register_conditional_get_listeners
+from app.utils.item_summary import register_item_summary_listeners
+from app.utils.platform_stats import register_platform_stats_listeners
+from app.utils.ledger import register_ledger_listeners
+from app.utils.owner_stats import register_owner_stats_listeners
+from app.utils.auth_cache import init_auth_cache
+from app.utils.log import init_logging
+from app.utils.passwords import init_password_hasher
+from app.utils.rate_limit import init_rate_limiter
+from app.utils.metrics import init_metrics
+from app.utils.profiling import init_profiling
+from app.utils.query_stats import init_query_stats
+from app.utils.slow_queries import init_slow_query_log
 
 # === Import all Blueprints ===
 from app.routes.auth import auth_bp
@@ -25,12 +42,26 @@ from app.routes.rental_browsing import rental_browsing_bp
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    init_logging(app)
 
     # === Extensions ===
     db.init_app(app)
     migrate.init_app(app, db)
     mail.init_app(app)
 
+    # === Model Event Listeners ===
+    register_search_index_listeners()
+    register_attribute_index_listeners()
+    register_category_counter_listeners()
+    register_conditional_get_listeners()
+    register_item_summary_listeners()
+    register_platform_stats_listeners()
+    register_ledger_listeners()
+    register_owner_stats_listeners()
+    init_response_cache(app)
+    init_auth_cache(app)
+    init_password_hasher(app)
+
     # === CORS ===
     frontend_origin = getattr(Config, 'FRONTEND_ORIGIN', "http://localhost:5173")
     CORS(app,
@@ -38,6 +69,15 @@ def create_app():
          supports_credentials=True,
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
          allow_headers=["Content-Type", "Authorization", "X-Requested-With"])
+    # === Request Instrumentation ===
+    init_metrics(app)  # First, so its timer covers the other before_request hooks
+    init_profiling(app)
+    init_query_stats(app)
+    init_slow_query_log(app)
+
+    # === Rate Limiting ===
+    init_rate_limiter(app)
+
     # === Flask-Login ===
     login_manager = LoginManager()
     login_manager.login_view = "auth.login"
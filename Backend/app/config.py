@@ -15,6 +15,76 @@ class Config:
     ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp", "pdf"}
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB
 
+    # Response cache for public catalog endpoints (per worker)
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_TTL = 60  # seconds
+    RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+    # Per-worker cache of authenticated users. Every hit is checked against the user's auth_version,
+    # so deactivation, restriction and deletion apply at once in all workers; the TTL only bounds
+    # how long non-revoking fields (username, email) can be stale.
+    AUTH_CACHE_TTL = 30  # seconds
+    AUTH_CACHE_MAX_ENTRIES = 4096
+    AUTH_VERSION_STORAGE_URL = None  # None checks the database; "redis://host:6379/0" checks Redis instead (needs redis)
+
+    # Per-request SQL statement counting; headers are for development, set APP_ENV=production to hide them
+    QUERY_STATS_ENABLED = True
+    QUERY_STATS_HEADERS = os.environ.get("APP_ENV", "development") != "production"
+    QUERY_STATS_N_PLUS_ONE_THRESHOLD = 10  # Identical statements per request logged as a probable N+1
+
+    # Slow-query log: statements over the threshold, with route, EXPLAIN and the type and length of
+    # each bound parameter. Values are only written with SLOW_QUERY_LOG_PARAMETER_VALUES (development:
+    # they include password and token hashes and emails)
+    SLOW_QUERY_LOG_ENABLED = True
+    SLOW_QUERY_LOG_PARAMETER_VALUES = False
+    SLOW_QUERY_THRESHOLD_MS = 200
+    SLOW_QUERY_LOG_PATH = os.path.join(os.getcwd(), "logs", "slow_queries.log")  # Shared by all workers; rotate externally
+
+    # Prometheus metrics at GET /metrics. With several gunicorn workers set METRICS_MULTIPROC_DIR
+    # to a directory they share; each worker writes its totals there and a scrape sums them.
+    METRICS_ENABLED = True
+    METRICS_MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR")
+    METRICS_FLUSH_INTERVAL = 5  # Seconds between a worker's snapshot writes
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")  # Required as "Authorization: Bearer <token>" when set
+
+    # On-demand profiling: an admin token plus "X-Profile: 1" (or ?_profile=1) samples that one
+    # request; the folded stacks are stored here, or returned inline with "X-Profile: folded"
+    PROFILING_ENABLED = True
+    PROFILING_INTERVAL_MS = 5
+    PROFILING_DIR = os.path.join(os.getcwd(), "logs", "profiles")
+    PROFILING_KEEP = 50  # Newest profiles kept per directory
+
+    # Rate limits ("<count>/<second|minute|hour|day>"), looked up by endpoint, then by blueprint.
+    # Authenticated requests are limited per user, anonymous ones per client IP.
+    RATE_LIMIT_ENABLED = True
+    RATE_LIMIT_STORAGE_URL = "memory://"  # Per worker; "redis://host:6379/0" shares buckets (needs redis)
+    RATE_LIMIT_PROXY_COUNT = 1  # Reverse proxies in front of gunicorn that append to X-Forwarded-For
+    RATE_LIMITS = {
+        "auth.login": "10/minute",  # bcrypt per attempt
+        "auth.register": "5/minute",
+        "auth": "60/minute",
+        "receipt": "20/minute",  # PDF rendering
+        "reports.export_report": "10/minute",
+        "reports.admin_export_system_report": "10/minute",
+        "reports": "60/minute",
+        "rental_browsing.search_items": "60/minute",
+        "rental_browsing": "300/minute",
+    }
+
+    # Tokens: short-lived JWT access tokens, renewed through rotating refresh tokens
+    ACCESS_TOKEN_TTL = 15 * 60  # seconds
+    REFRESH_TOKEN_TTL = 30 * 24 * 3600  # seconds
+
+    # Password hashing: bcrypt cost and the per-worker process pool that runs it
+    PASSWORD_HASH_ROUNDS = 12
+    PASSWORD_HASH_WORKERS = 2
+    PASSWORD_HASH_MAX_PENDING = 16  # Operations queued or running before logins get 503
+    PASSWORD_HASH_TIMEOUT = 10  # seconds
+
+    # Logging: "rentals.*" loggers go through a background queue to stdout
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")  # DEBUG re-enables per-row request tracing
+    LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")  # json or text
+
     # Flask-Mail settings
     MAIL_SERVER = "smtp.gmail.com"
     MAIL_PORT = 587
@@ -16,9 +16,14 @@ class RentalItem(db.Model):
     dynamic_data = db.Column(db.Text, nullable=True)  # JSON storage for owner's submitted values
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    # Keyset pagination index: (created_at, id) newest-first listings
+    __table_args__ = (
+        db.Index("ix_rental_items_created_at_id", "created_at", "id"),
+    )
+
     # Relationships
     owner = db.relationship("User", foreign_keys=[owner_id], backref=db.backref("owned_rental_items", lazy=True))
     category = db.relationship("Category", backref=db.backref("rental_items", lazy=True))
@@ -97,21 +102,9 @@ class RentalItem(db.Model):
         if not self.is_available:
             return False
         
-        # Check if there are any active bookings for this item
-        from app.models.booking import Booking
-        
-        # Look for active bookings (HELD or COMPLETED status)
-        active_bookings = Booking.query.filter_by(
-            rental_item_id=self.id
-        ).filter(
-            Booking.payment_status.in_(["HELD", "COMPLETED"])
-        ).first()
-        
-        # If there are active bookings, the item is not available
-        if active_bookings:
-            return False
-        
-        return True
+        # Look for active bookings (HELD or COMPLETED payment) with a single EXISTS query
+        from app.utils.availability import is_bookable
+        return is_bookable(self.id, include_pending=False)
 
     def mark_as_unavailable(self):
         """Mark the rental item as unavailable"""
@@ -12,5 +12,14 @@ from .complaint import Complaint
 from .user_restriction import UserRestriction
 from .owner_request import OwnerRequest
 from .owner_requirement import OwnerRequirement
+from .search_token import SearchToken
+from .item_attribute import ItemAttribute
+from .category_item_count import CategoryItemCount
+from .resource_version import ResourceVersion
+from .item_summary import ItemSummary
+from .refresh_token import RefreshToken
+from .daily_platform_stat import DailyPlatformStat
+from .ledger_entry import LedgerEntry, AccountBalance
+from .owner_stat import OwnerStat
 # from .report import Report
 # from .activity_log import ActivityLog
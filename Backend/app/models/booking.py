@@ -8,7 +8,7 @@ class Booking(db.Model):
     rental_item_id = db.Column(db.Integer, db.ForeignKey("rental_items.id"), nullable=False)
     renter_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     status = db.Column(db.String(20), default="Pending", nullable=False)  # Match DB: VARCHAR(20)
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
     # Payment fields (now non-nullable)
@@ -55,6 +55,11 @@ class Booking(db.Model):
     penalty_applied = db.Column(db.Boolean, nullable=True)  # Match DB: TINYINT
     owner_rating_penalty = db.Column(db.Integer, nullable=True)  # Match DB: INTEGER
     
+    # Keyset pagination index: (created_at, id) newest-first listings
+    __table_args__ = (
+        db.Index("ix_bookings_created_at_id", "created_at", "id"),
+    )
+
     # Relationships
     rental_item = db.relationship("RentalItem", backref=db.backref("bookings", lazy=True))
     renter = db.relationship("User", foreign_keys=[renter_id], backref=db.backref("renter_bookings", lazy=True))
@@ -149,6 +154,7 @@ class Booking(db.Model):
         self.payment_status = "HELD"
         self.payment_held_at = datetime.utcnow()
         self.status = "Payment_Held"
+        self._record_ledger("hold")
         return True
 
     def release_payment(self, admin_approved=True, rejection_reason=None):
@@ -178,8 +184,14 @@ class Booking(db.Model):
             print(f"[REVENUE] ❌ Payment REJECTED for booking #{self.id}")
             print(f"[REVENUE] 💸 No admin revenue generated - payment refunded")
             print(f"[REVENUE] 🔄 Service fee refunded: ${self.service_fee}")
+        self._record_ledger("release" if admin_approved else "reject", rejection_reason)
         return True
 
+    def _record_ledger(self, entry_type, note=None):
+        """Post this payment transition to the revenue ledger (same transaction as the change)"""
+        from app.utils.ledger import record_transition
+        record_transition(self, entry_type, note)
+
     def is_payment_completed(self):
         """Check if payment is completed and booking is active"""
         return self.payment_status == "COMPLETED" and self.status == "Confirmed"
@@ -215,6 +227,7 @@ class Booking(db.Model):
         self.status = "Owner_Rejected"
         self.payment_status = "FAILED"
         # Note: Refund logic will be handled in payment routes
+        self._record_ledger("owner_reject", reason)
         return True
     
     def user_confirm_delivery(self, code):
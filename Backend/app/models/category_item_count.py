@@ -0,0 +1,13 @@
+from app.extensions import db
+from datetime import datetime
+
+class CategoryItemCount(db.Model):
+    """Materialized number of bookable rental items per category"""
+    __tablename__ = "category_item_counts"
+
+    category_id = db.Column(db.Integer, db.ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    available_items = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CategoryItemCount {self.category_id}: {self.available_items}>"
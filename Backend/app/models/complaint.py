@@ -12,9 +12,14 @@ class Complaint(db.Model):
     description = db.Column(db.Text, nullable=False)
     status = db.Column(db.String(50), default="Pending", nullable=False)  # Pending / Resolved / Rejected
     admin_notes = db.Column(db.Text)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Keyset pagination index: (created_at, id) newest-first listings
+    __table_args__ = (
+        db.Index("ix_complaints_created_at_id", "created_at", "id"),
+    )
+
     # Relationships
     booking = db.relationship("Booking", backref=db.backref("complaints", lazy=True))
     complainant = db.relationship("User", foreign_keys=[complainant_id])
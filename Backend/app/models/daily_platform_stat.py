@@ -0,0 +1,19 @@
+from app.extensions import db
+from datetime import datetime
+
+class DailyPlatformStat(db.Model):
+    """Per-day rollup of one platform metric (e.g. "bookings.status.Pending").
+
+    delta is the net change written that day, maintained on every write; total is the
+    closing value at the end of the day, filled in by the nightly close job.
+    """
+    __tablename__ = "daily_platform_stats"
+
+    day = db.Column(db.Date, primary_key=True)
+    metric = db.Column(db.String(80), primary_key=True)
+    delta = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    total = db.Column(db.Numeric(14, 2), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<DailyPlatformStat {self.day} {self.metric}: {self.delta} / {self.total}>"
@@ -0,0 +1,25 @@
+from app.extensions import db
+
+class ItemAttribute(db.Model):
+    """Typed copy of one dynamic_data value, keyed by the CategoryRequirement it answers"""
+    __tablename__ = "item_attributes"
+
+    id = db.Column(db.Integer, primary_key=True)
+    rental_item_id = db.Column(db.Integer, db.ForeignKey("rental_items.id", ondelete="CASCADE"), nullable=False)
+    category_id = db.Column(db.Integer, db.ForeignKey("categories.id"), nullable=False)
+    requirement_id = db.Column(db.Integer, db.ForeignKey("category_requirements.id", ondelete="CASCADE"), nullable=False)
+
+    # Exactly the columns that could be parsed are filled in
+    value_text = db.Column(db.String(255), nullable=True)
+    value_number = db.Column(db.Float, nullable=True)
+    value_date = db.Column(db.Date, nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_item_attributes_number", "requirement_id", "value_number", "rental_item_id"),
+        db.Index("ix_item_attributes_text", "requirement_id", "value_text", "rental_item_id"),
+        db.Index("ix_item_attributes_date", "requirement_id", "value_date", "rental_item_id"),
+        db.Index("ix_item_attributes_rental_item_id", "rental_item_id"),
+    )
+
+    def __repr__(self):
+        return f"<ItemAttribute Item {self.rental_item_id}, Field {self.requirement_id}>"
@@ -0,0 +1,29 @@
+from app.extensions import db
+from datetime import datetime
+
+class ItemSummary(db.Model):
+    """Denormalized listing card of a rental item, refreshed on item, category and owner writes"""
+    __tablename__ = "item_summaries"
+
+    rental_item_id = db.Column(db.Integer, db.ForeignKey("rental_items.id", ondelete="CASCADE"), primary_key=True)
+    category_id = db.Column(db.Integer, nullable=False)
+    owner_id = db.Column(db.Integer, nullable=False)
+
+    # Card fields extracted from dynamic_data and the related rows
+    name = db.Column(db.String(255), nullable=True)
+    price = db.Column(db.Float, nullable=True)
+    thumbnail_url = db.Column(db.String(500), nullable=True)
+    category_name = db.Column(db.String(100), nullable=True)
+    owner_username = db.Column(db.String(50), nullable=True)
+
+    # The card pre-serialized as JSON, served as-is by the listing endpoints
+    summary_json = db.Column(db.Text, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_item_summaries_category_id", "category_id"),
+        db.Index("ix_item_summaries_owner_id", "owner_id"),
+    )
+
+    def __repr__(self):
+        return f"<ItemSummary Item {self.rental_item_id}: {self.name}>"
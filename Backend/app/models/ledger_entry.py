@@ -0,0 +1,43 @@
+from app.extensions import db
+from datetime import datetime
+
+class LedgerEntry(db.Model):
+    """One money movement on one account, written at every payment transition and never updated.
+
+    Accounts are colon-separated paths ("platform", "held:fees", "owner:12", ...); a booking's
+    position in an account is the sum of its entries there.
+    """
+    __tablename__ = "ledger_entries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    booking_id = db.Column(db.Integer, db.ForeignKey("bookings.id", ondelete="SET NULL"), nullable=True, index=True)
+    account = db.Column(db.String(60), nullable=False)
+    entry_type = db.Column(db.String(30), nullable=False)  # hold, release, reject, owner_reject, auto_release, ...
+    amount = db.Column(db.Numeric(14, 2), nullable=False)  # Signed: positive moves money into the account
+    note = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    # Per-account history and period sums: WHERE account ... AND created_at BETWEEN ...
+    __table_args__ = (
+        db.Index("ix_ledger_entries_account_created_at", "account", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<LedgerEntry {self.id} booking={self.booking_id} {self.account} {self.amount}>"
+
+
+class AccountBalance(db.Model):
+    """Running balance of a ledger account and of every account prefix ("held:owner" sums all
+    "held:owner:<id>" accounts), maintained in the same transaction as the entries.
+
+    bookings is the number of bookings with a non-zero position in the account.
+    """
+    __tablename__ = "account_balances"
+
+    account = db.Column(db.String(60), primary_key=True)
+    balance = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    bookings = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AccountBalance {self.account}: {self.balance} ({self.bookings} bookings)>"
@@ -0,0 +1,16 @@
+from app.extensions import db
+from datetime import datetime
+
+class OwnerStat(db.Model):
+    """Materialized per-owner, per-category dashboard figure (e.g. "bookings.pending"),
+    maintained on every booking and rental item write"""
+    __tablename__ = "owner_stats"
+
+    owner_id = db.Column(db.Integer, primary_key=True)
+    category_id = db.Column(db.Integer, primary_key=True)
+    metric = db.Column(db.String(40), primary_key=True)
+    value = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<OwnerStat owner={self.owner_id} category={self.category_id} {self.metric}: {self.value}>"
@@ -0,0 +1,23 @@
+from app.extensions import db
+from datetime import datetime
+
+class RefreshToken(db.Model):
+    """Rotating refresh token; only the SHA-256 of the token handed to the client is stored"""
+    __tablename__ = "refresh_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    token_hash = db.Column(db.String(64), nullable=False, unique=True)
+    family_id = db.Column(db.String(32), nullable=False)  # Shared by every rotation of one login
+    auth_version = db.Column(db.Integer, nullable=False, default=0)  # users.auth_version at issue time
+    expires_at = db.Column(db.DateTime, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    revoked_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_refresh_tokens_user_id", "user_id"),
+        db.Index("ix_refresh_tokens_family_id", "family_id"),
+    )
+
+    def __repr__(self):
+        return f"<RefreshToken {self.id} User {self.user_id}>"
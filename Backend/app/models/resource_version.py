@@ -0,0 +1,13 @@
+from app.extensions import db
+from datetime import datetime
+
+class ResourceVersion(db.Model):
+    """Monotonic version counter per cacheable resource scope, e.g. "category:3" or "notifications:12" """
+    __tablename__ = "resource_versions"
+
+    scope = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ResourceVersion {self.scope}: {self.version}>"
@@ -0,0 +1,20 @@
+from app.extensions import db
+
+class SearchToken(db.Model):
+    """Inverted index posting: one row per (token, rental item) pair"""
+    __tablename__ = "search_tokens"
+
+    id = db.Column(db.Integer, primary_key=True)
+    token = db.Column(db.String(64), nullable=False)
+    rental_item_id = db.Column(db.Integer, db.ForeignKey("rental_items.id", ondelete="CASCADE"), nullable=False)
+    term_frequency = db.Column(db.Integer, nullable=False, default=1)  # Occurrences of token in the item
+    doc_length = db.Column(db.Integer, nullable=False, default=1)  # Total tokens in the item (for BM25)
+
+    __table_args__ = (
+        # Covering index for prefix lookups and scoring without touching the table
+        db.Index("ix_search_tokens_token_item", "token", "rental_item_id", "term_frequency", "doc_length"),
+        db.Index("ix_search_tokens_rental_item_id", "rental_item_id"),
+    )
+
+    def __repr__(self):
+        return f"<SearchToken {self.token} -> Item {self.rental_item_id}>"
@@ -1,4 +1,6 @@
-from app.extensions import db, bcrypt
+from datetime import datetime
+from app.extensions import db
+from app.utils.passwords import hash_password, verify_password
 from flask_login import UserMixin
 
 class User(db.Model, UserMixin):
@@ -14,19 +16,26 @@ class User(db.Model, UserMixin):
     password = db.Column(db.String(200), nullable=False)   # hashed password stored here
     role = db.Column(db.String(20), default="user")  # user, owner, admin
     is_active = db.Column(db.Boolean, default=True, nullable=True)
-    created_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     is_restricted = db.Column(db.Boolean, default=False, nullable=False)
+    auth_version = db.Column(db.Integer, default=0, nullable=False, server_default="0")  # Bumped to revoke issued tokens
+
+    # Keyset pagination index: (created_at, id) newest-first listings
+    __table_args__ = (
+        db.Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     # Relationships (commented to avoid circular import issues if needed)
     # rental_items = db.relationship("RentalItem", backref="owner", lazy=True)
 
     def set_password(self, password):
         """Hash and store the password in the 'password' field."""
-        self.password = bcrypt.generate_password_hash(password).decode("utf-8")
+        self.password = hash_password(password)
 
     def check_password(self, password):
         """Verify a plaintext password against the stored hash."""
-        return bcrypt.check_password_hash(self.password, password)
+        matches, _ = verify_password(password, self.password)
+        return matches
 
     def __repr__(self):
         return f"<User {self.username}>"
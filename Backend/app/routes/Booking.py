@@ -5,9 +5,16 @@ from app.models.RentalItem import RentalItem
 from app.models.RentalInputField import RenterInputField
 from app.schemas.booking_schema import InitialBookingSchema, BookingSchema
 from app.utils.security import jwt_required
+from app.utils.streaming import stream_json, stream_rows
+from app.utils.pricing import quote_booking, PricingError
+from app.utils.attribute_index import parse_number
+from app.utils.conditional_get import conditional_get, notifications_stamp
+from app.utils.log import get_logger
 import json
 from datetime import datetime
 
+log = get_logger("booking")
+
 booking_bp = Blueprint("booking", __name__, url_prefix="/api/booking")
 
 # ------------------- Get Renter Input Fields for Item (User) -------------------
@@ -115,13 +122,20 @@ def submit_booking_requirements(item_id):
     if missing_fields:
         return jsonify({"error": "Missing required fields", "fields": missing_fields}), 400
 
-    # Strong validation: Ensure payment amount is calculated and valid
-    if "total_price" not in data["requirements_data"] or not data["requirements_data"]["total_price"]:
-        return jsonify({"error": "Payment amount could not be calculated. Please check your rental period and dates."}), 400
+    # Price is always recomputed server-side; the client's total_price is informational only
+    try:
+        quote = quote_booking(item_id, data["requirements_data"])
+    except PricingError as e:
+        return jsonify({"error": f"Payment amount could not be calculated: {e}. Please check your rental period and dates."}), 400
     
-    payment_amount = float(data["requirements_data"]["total_price"])
-    if payment_amount <= 0:
-        return jsonify({"error": "Invalid payment amount. Please check your rental period and dates."}), 400
+    payment_amount = quote["total_price"]
+    client_total = data["requirements_data"].get("total_price")
+    if client_total not in (None, "") and parse_number(client_total) != payment_amount:
+        # Usually a stale client-side price calculation; worth a look if it keeps happening
+        log.warning("submit_booking_requirements - item %s: client total %s replaced by server price %s",
+                    item_id, client_total, payment_amount)
+    data["requirements_data"]["total_price"] = payment_amount
+    data["requirements_data"]["rental_days"] = quote["rental_days"]
 
     # Create temporary booking record (requirements only, no payment details)
     booking = Booking(
@@ -318,6 +332,7 @@ def confirm_delivery(booking_id):
 # ------------------- USER NOTIFICATIONS -------------------
 @booking_bp.route("/notifications", methods=["GET"])
 @jwt_required
+@conditional_get(lambda kwargs: notifications_stamp(request.current_user.id), private=True)
 def get_user_notifications():
     """Get user notifications with detailed booking information"""
     try:
@@ -381,33 +396,29 @@ def mark_user_notification_read(notification_id):
 @booking_bp.route("/my-bookings", methods=["GET"])
 @jwt_required
 def view_own_bookings():
-    print(f"[DEBUG] view_own_bookings - User: {request.current_user}")
-    print(f"[DEBUG] view_own_bookings - User role: {request.current_user.role}")
-    print(f"[DEBUG] view_own_bookings - User ID: {request.current_user.id}")
+    log.debug("view_own_bookings - user %s (role: %s)", request.current_user.id, request.current_user.role)
     
     # Get search and filter parameters
     search = request.args.get('search', '').strip()
     status_filter = request.args.get('status', '').strip()
     date_filter = request.args.get('date', '').strip()
     
-    print(f"[DEBUG] Search params - search: '{search}', status: '{status_filter}', date: '{date_filter}'")
+    log.debug("Search params - search: '%s', status: '%s', date: '%s'", search, status_filter, date_filter)
     
     # Check if user exists in database
     from app.models.user import User
     db_user = User.query.get(request.current_user.id)
     if db_user:
-        print(f"[DEBUG] view_own_bookings - DB User: {db_user.username}, Role: {db_user.role}")
+        log.debug("view_own_bookings - DB User: %s, Role: %s", db_user.username, db_user.role)
     else:
-        print(f"[DEBUG] view_own_bookings - User not found in database!")
+        log.debug("view_own_bookings - User not found in database!")
         return jsonify({"error": "User not found in database"}), 404
     
     if request.current_user.role != "user":
-        print(f"[DEBUG] view_own_bookings - Role check failed: {request.current_user.role} != 'user'")
+        log.warning("view_own_bookings - Role check failed: %s != 'user'", request.current_user.role)
         return jsonify({"error": "Only users can view their bookings."}), 403
 
     try:
-        print(f"[DEBUG] view_own_bookings - Using simple approach to get all bookings...")
-        
         # Import required models
         from app.models.RentalItem import RentalItem
         from app.models.category import Category
@@ -417,248 +428,230 @@ def view_own_bookings():
         
         # Apply status filter if provided
         if status_filter:
-            print(f"[DEBUG] Applying status filter: {status_filter}")
+            log.debug("Applying status filter: %s", status_filter)
             query = query.filter(Booking.status == status_filter)
         
         # Apply date filter if provided
         if date_filter:
-            print(f"[DEBUG] Applying date filter: {date_filter}")
+            log.debug("Applying date filter: %s", date_filter)
             try:
                 filter_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
                 # We'll apply date filtering after we extract the dates from requirements_data
                 # For now, just mark that we need to filter by date
-                print(f"[DEBUG] Date filter will be applied after data extraction: {filter_date}")
             except ValueError as e:
-                print(f"[DEBUG] Invalid date format: {date_filter}, error: {e}")
+                log.warning("Invalid date format: %s, error: %s", date_filter, e)
                 # Continue without date filter if invalid
         
-        # Get filtered bookings
-        all_bookings = query.order_by(Booking.created_at.asc()).all()
-        print(f"[DEBUG] Found {len(all_bookings)} bookings after filtering")
+        # Get filtered bookings; item, category and owner are joined in (missing ones come back
+        # as None) so the rows can be streamed without per-booking lookups
+        rows = query.outerjoin(RentalItem, Booking.rental_item_id == RentalItem.id) \
+            .outerjoin(Category, RentalItem.category_id == Category.id) \
+            .outerjoin(User, RentalItem.owner_id == User.id) \
+            .with_entities(Booking, RentalItem, Category, User) \
+            .order_by(Booking.created_at.asc(), Booking.id.asc())
         
-        result = []
-        for booking in all_bookings:
-            print(f"[DEBUG] Processing booking {booking.id}")
-            
-            # Try to get related data, but don't fail if missing
-            rental_item = None
-            category = None
-            owner_user = None
-            
+        return stream_json("bookings", _generate_own_bookings(stream_rows(rows), search, date_filter))
+        
+    except Exception as e:
+        log.exception("view_own_bookings - Exception: %s", e)
+        return jsonify({"error": "Error fetching bookings", "details": str(e)}), 500
+
+def _generate_own_bookings(rows, search, date_filter):
+    """Yield the booking entries of view_own_bookings that pass the search and date filters"""
+    returned = 0
+    for booking, rental_item, category, owner_user in rows:
+        log.debug("Processing booking %s for item %s", booking.id, rental_item.id if rental_item else None)
+        
+        # Parse the rental item's dynamic data to get pricing
+        item_data = {}
+        if rental_item and rental_item.dynamic_data:
             try:
-                rental_item = RentalItem.query.get(booking.rental_item_id)
-                if rental_item:
-                    category = Category.query.get(rental_item.category_id) if rental_item.category_id else None
-                    owner_user = User.query.get(rental_item.owner_id) if rental_item.owner_id else None
+                import json
+                item_data = json.loads(rental_item.dynamic_data)
+                log.debug("Item dynamic data: %s", item_data)
             except Exception as e:
-                print(f"[DEBUG] Error getting related data for booking {booking.id}: {e}")
-                # Continue with basic data
-            
-            print(f"[DEBUG] Processing booking {booking.id} for item {rental_item.id if rental_item else 'None'}")
-            print(f"[DEBUG] Rental item: {rental_item}")
-            print(f"[DEBUG] Category: {category}")
-            print(f"[DEBUG] Owner user: {owner_user}")
-            
-            # Parse the rental item's dynamic data to get pricing
-            item_data = {}
-            if rental_item and rental_item.dynamic_data:
-                try:
-                    import json
-                    item_data = json.loads(rental_item.dynamic_data)
-                    print(f"[DEBUG] Item dynamic data: {item_data}")
-                except Exception as e:
-                    print(f"[DEBUG] Error parsing dynamic data: {e}")
-                    item_data = {}
-            
-            # Get requirements data to extract rental period and dates
-            requirements_data = booking.get_requirements_data()
-            print(f"[DEBUG] Requirements data: {requirements_data}")
-            
-            # Extract rental period and dates from requirements data
-            rental_period = "Unknown"
-            start_date = None
-            end_date = None
-            
-            # Look for rental period in various possible field names
-            period_fields = ['rental_period', 'Perido selection', 'period', 'Period']
-            for field in period_fields:
-                if field in requirements_data and requirements_data[field]:
-                    rental_period = str(requirements_data[field])
-                    break
-            
-            # Look for start date in various possible field names
-            start_date_fields = ['start_date', 'Start-date', 'start date', 'Start date']
-            for field in start_date_fields:
-                if field in requirements_data and requirements_data[field]:
-                    start_date = str(requirements_data[field])
-                    break
-            
-            # Look for end date in various possible field names
-            end_date_fields = ['end_date', 'End-date', 'end date', 'End date']
-            for field in end_date_fields:
-                if field in requirements_data and requirements_data[field]:
-                    end_date = str(requirements_data[field])
-                    break
-            
-            # Calculate rental days
-            rental_days = 0
-            if start_date and end_date:
-                try:
-                    start = datetime.strptime(start_date, '%Y-%m-%d')
-                    end = datetime.strptime(end_date, '%Y-%m-%d')
-                    rental_days = (end - start).days
-                    print(f"[DEBUG] Rental days calculated: {rental_days}")
-                except Exception as e:
-                    print(f"[DEBUG] Error calculating rental days: {e}")
-                    rental_days = 0
-            
-            # Apply date filter if provided (after extracting dates)
-            if date_filter and (start_date or end_date):
-                try:
-                    filter_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
-                    start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
-                    end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else None
-                    
-                    # Check if the filter date falls within the rental period
-                    date_matches = False
-                    if start_date_obj and end_date_obj:
-                        date_matches = start_date_obj <= filter_date <= end_date_obj
-                    elif start_date_obj:
-                        date_matches = start_date_obj == filter_date
-                    elif end_date_obj:
-                        date_matches = end_date_obj == filter_date
-                    
-                    if not date_matches:
-                        print(f"[DEBUG] Booking {booking.id} filtered out by date filter: {filter_date}")
-                        continue
-                        
-                except ValueError as e:
-                    print(f"[DEBUG] Error in date filtering: {e}")
-                    # Continue without date filter if there's an error
-            
-            # Get item rental price from dynamic data
-            item_rental_price = 0
-            item_name = "Unknown Item"
-            
-            # First try to use category name as base
-            if category and category.name:
-                item_name = f"{category.name} Item"
-                print(f"[DEBUG] Using category-based item name: {item_name}")
-            
-            if item_data:
-                # Look for item name - updated to match actual stored field names
-                name_fields = ['Item Name', 'Car name', 'item_name', 'Name', 'name']
-                for field in name_fields:
-                    if field in item_data and item_data[field]:
-                        item_name = str(item_data[field])
-                        print(f"[DEBUG] Found item name in field '{field}': {item_name}")
-                        break
-                
-                # If we found a specific name, combine it with category for better description
-                if item_name != f"{category.name} Item" and category and category.name:
-                    item_name = f"{category.name} - {item_name}"
-                    print(f"[DEBUG] Combined item name: {item_name}")
+                log.warning("Error parsing dynamic data: %s", e)
+                item_data = {}
+        
+        # Get requirements data to extract rental period and dates
+        requirements_data = booking.get_requirements_data()
+        log.debug("Requirements data: %s", requirements_data)
+        
+        # Extract rental period and dates from requirements data
+        rental_period = "Unknown"
+        start_date = None
+        end_date = None
+        
+        # Look for rental period in various possible field names
+        period_fields = ['rental_period', 'Perido selection', 'period', 'Period']
+        for field in period_fields:
+            if field in requirements_data and requirements_data[field]:
+                rental_period = str(requirements_data[field])
+                break
+        
+        # Look for start date in various possible field names
+        start_date_fields = ['start_date', 'Start-date', 'start date', 'Start date']
+        for field in start_date_fields:
+            if field in requirements_data and requirements_data[field]:
+                start_date = str(requirements_data[field])
+                break
+        
+        # Look for end date in various possible field names
+        end_date_fields = ['end_date', 'End-date', 'end date', 'End date']
+        for field in end_date_fields:
+            if field in requirements_data and requirements_data[field]:
+                end_date = str(requirements_data[field])
+                break
+        
+        # Calculate rental days
+        rental_days = 0
+        if start_date and end_date:
+            try:
+                start = datetime.strptime(start_date, '%Y-%m-%d')
+                end = datetime.strptime(end_date, '%Y-%m-%d')
+                rental_days = (end - start).days
+                log.debug("Rental days calculated: %s", rental_days)
+            except Exception as e:
+                log.warning("Error calculating rental days: %s", e)
+                rental_days = 0
+        
+        # Apply date filter if provided (after extracting dates)
+        if date_filter and (start_date or end_date):
+            try:
+                filter_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
+                start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
+                end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else None
                 
-                # Look for common price fields - updated to match actual stored field names
-                price_fields = ['Price', 'Car rice', 'price', 'Daily Rate', 'daily_rate', 'Hourly Rate', 'hourly_rate', 'Cost', 'cost']
-                for field in price_fields:
-                    if field in item_data and item_data[field]:
-                        try:
-                            item_rental_price = float(item_data[field])
-                            print(f"[DEBUG] Found price in field '{field}': {item_rental_price}")
-                            break
-                        except Exception as e:
-                            print(f"[DEBUG] Error parsing price from field '{field}': {e}")
-                            continue
-            
-            # Calculate total amount
-            payment_amount = float(booking.payment_amount) if booking.payment_amount else 0
-            service_fee = float(booking.service_fee) if booking.service_fee else 0
-            total_amount = payment_amount + service_fee
-            
-            print(f"[DEBUG] Financial data - Payment: {payment_amount}, Service Fee: {service_fee}, Total: {total_amount}")
-            
-            booking_data = {
-                "booking_id": booking.id,
-                "rental_item_id": booking.rental_item_id,
-                "rental_item_name": item_name,
-                "category_id": category.id if category else None,
-                "category_name": category.name if category else None,
-                "owner_id": owner_user.id if owner_user else None,
-                "owner_username": owner_user.username if owner_user else None,
-                "owner_email": owner_user.email if owner_user else None,
-                "renter_id": booking.renter_id,
-                "requirements_data": requirements_data,
-                "rental_period": rental_period,
-                "start_date": start_date,
-                "end_date": end_date,
-                "rental_days": rental_days,
-                "item_rental_price": item_rental_price,
-                "status": booking.status,
-                "payment_status": booking.payment_status,
-                "payment_amount": payment_amount,
-                "service_fee": service_fee,
-                "total_amount": total_amount,
-                "payment_method": getattr(booking, 'payment_method', 'Not specified'),
-                "payment_account": getattr(booking, 'payment_account', 'Not specified'),
-                "created_at": booking.created_at,
-                "updated_at": getattr(booking, 'updated_at', None),
-                "rental_item_data": item_data,
-                "payment_held_at": getattr(booking, 'payment_held_at', None),
-                "payment_released_at": getattr(booking, 'payment_released_at', None),
-                "admin_approved": getattr(booking, 'admin_approved', None),
-                # Add missing fields for status detection
-                "contract_accepted": getattr(booking, 'contract_accepted', None),
-                "owner_confirmation_status": getattr(booking, 'owner_confirmation_status', None),
-                "owner_confirmed_at": getattr(booking, 'owner_confirmed_at', None),
-                "confirmation_code": getattr(booking, 'confirmation_code', None),
-                "code_expiry": getattr(booking, 'code_expiry', None)
-            }
-            
-            # Apply search filter if provided
-            if search:
-                search_lower = search.lower()
-                searchable_fields = [
-                    str(booking_data['rental_item_name']),
-                    str(booking_data['category_name']),
-                    str(booking_data['owner_username']),
-                    str(booking_data['owner_email']),
-                    str(booking_data['booking_id']),
-                    str(booking_data['rental_item_id']),
-                    str(booking_data['status']),
-                    str(booking_data['payment_status']),
-                    str(booking_data['payment_amount']),
-                    str(booking_data['service_fee']),
-                    str(booking_data['total_amount']),
-                    str(booking_data['payment_method']),
-                    str(booking_data['payment_account']),
-                    str(booking_data['rental_days']),
-                    str(booking_data['start_date']),
-                    str(booking_data['end_date'])
-                ]
+                # Check if the filter date falls within the rental period
+                date_matches = False
+                if start_date_obj and end_date_obj:
+                    date_matches = start_date_obj <= filter_date <= end_date_obj
+                elif start_date_obj:
+                    date_matches = start_date_obj == filter_date
+                elif end_date_obj:
+                    date_matches = end_date_obj == filter_date
                 
-                # Check if any field contains the search term
-                if not any(search_lower in field.lower() for field in searchable_fields):
-                    print(f"[DEBUG] Booking {booking.id} filtered out by search term: {search}")
+                if not date_matches:
+                    log.debug("Booking %s filtered out by date filter: %s", booking.id, filter_date)
                     continue
+                    
+            except ValueError as e:
+                log.warning("Error in date filtering: %s", e)
+                # Continue without date filter if there's an error
+        
+        # Get item rental price from dynamic data
+        item_rental_price = 0
+        item_name = "Unknown Item"
+        
+        # First try to use category name as base
+        if category and category.name:
+            item_name = f"{category.name} Item"
+            log.debug("Using category-based item name: %s", item_name)
+        
+        if item_data:
+            # Look for item name - updated to match actual stored field names
+            name_fields = ['Item Name', 'Car name', 'item_name', 'Name', 'name']
+            for field in name_fields:
+                if field in item_data and item_data[field]:
+                    item_name = str(item_data[field])
+                    log.debug("Found item name in field '%s': %s", field, item_name)
+                    break
             
-            print(f"[DEBUG] Final booking data for booking {booking.id}:")
-            print(f"  - Status: {booking_data['status']}")
-            print(f"  - Payment Status: {booking_data['payment_status']}")
-            print(f"  - Contract Accepted: {booking_data['contract_accepted']}")
-            print(f"  - Admin Approved: {booking_data['admin_approved']}")
-            print(f"  - Owner Confirmation Status: {booking_data['owner_confirmation_status']}")
-            print(f"  - Confirmation Code: {booking_data['confirmation_code']}")
-            result.append(booking_data)
-        
-        print(f"[DEBUG] Returning {len(result)} complete booking records after search/filtering")
-        return jsonify({"bookings": result}), 200
+            # If we found a specific name, combine it with category for better description
+            if item_name != f"{category.name} Item" and category and category.name:
+                item_name = f"{category.name} - {item_name}"
+                log.debug("Combined item name: %s", item_name)
+            
+            # Look for common price fields - updated to match actual stored field names
+            price_fields = ['Price', 'Car rice', 'price', 'Daily Rate', 'daily_rate', 'Hourly Rate', 'hourly_rate', 'Cost', 'cost']
+            for field in price_fields:
+                if field in item_data and item_data[field]:
+                    try:
+                        item_rental_price = float(item_data[field])
+                        log.debug("Found price in field '%s': %s", field, item_rental_price)
+                        break
+                    except Exception as e:
+                        log.warning("Error parsing price from field '%s': %s", field, e)
+                        continue
         
-    except Exception as e:
-        print(f"[ERROR] view_own_bookings - Exception: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": "Error fetching bookings", "details": str(e)}), 500
+        # Calculate total amount
+        payment_amount = float(booking.payment_amount) if booking.payment_amount else 0
+        service_fee = float(booking.service_fee) if booking.service_fee else 0
+        total_amount = payment_amount + service_fee
+        
+        log.debug("Financial data - Payment: %s, Service Fee: %s, Total: %s", payment_amount, service_fee, total_amount)
+        
+        booking_data = {
+            "booking_id": booking.id,
+            "rental_item_id": booking.rental_item_id,
+            "rental_item_name": item_name,
+            "category_id": category.id if category else None,
+            "category_name": category.name if category else None,
+            "owner_id": owner_user.id if owner_user else None,
+            "owner_username": owner_user.username if owner_user else None,
+            "owner_email": owner_user.email if owner_user else None,
+            "renter_id": booking.renter_id,
+            "requirements_data": requirements_data,
+            "rental_period": rental_period,
+            "start_date": start_date,
+            "end_date": end_date,
+            "rental_days": rental_days,
+            "item_rental_price": item_rental_price,
+            "status": booking.status,
+            "payment_status": booking.payment_status,
+            "payment_amount": payment_amount,
+            "service_fee": service_fee,
+            "total_amount": total_amount,
+            "payment_method": getattr(booking, 'payment_method', 'Not specified'),
+            "payment_account": getattr(booking, 'payment_account', 'Not specified'),
+            "created_at": booking.created_at,
+            "updated_at": getattr(booking, 'updated_at', None),
+            "rental_item_data": item_data,
+            "payment_held_at": getattr(booking, 'payment_held_at', None),
+            "payment_released_at": getattr(booking, 'payment_released_at', None),
+            "admin_approved": getattr(booking, 'admin_approved', None),
+            # Add missing fields for status detection
+            "contract_accepted": getattr(booking, 'contract_accepted', None),
+            "owner_confirmation_status": getattr(booking, 'owner_confirmation_status', None),
+            "owner_confirmed_at": getattr(booking, 'owner_confirmed_at', None),
+            "confirmation_code": getattr(booking, 'confirmation_code', None),
+            "code_expiry": getattr(booking, 'code_expiry', None)
+        }
+        
+        # Apply search filter if provided
+        if search:
+            search_lower = search.lower()
+            searchable_fields = [
+                str(booking_data['rental_item_name']),
+                str(booking_data['category_name']),
+                str(booking_data['owner_username']),
+                str(booking_data['owner_email']),
+                str(booking_data['booking_id']),
+                str(booking_data['rental_item_id']),
+                str(booking_data['status']),
+                str(booking_data['payment_status']),
+                str(booking_data['payment_amount']),
+                str(booking_data['service_fee']),
+                str(booking_data['total_amount']),
+                str(booking_data['payment_method']),
+                str(booking_data['payment_account']),
+                str(booking_data['rental_days']),
+                str(booking_data['start_date']),
+                str(booking_data['end_date'])
+            ]
+            
+            # Check if any field contains the search term
+            if not any(search_lower in field.lower() for field in searchable_fields):
+                log.debug("Booking %s filtered out by search term: %s", booking.id, search)
+                continue
+        
+        log.debug("Booking %s - status: %s, payment: %s, contract: %s, admin approved: %s, owner confirmation: %s",
+                  booking.id, booking_data['status'], booking_data['payment_status'], booking_data['contract_accepted'],
+                  booking_data['admin_approved'], booking_data['owner_confirmation_status'])
+        returned += 1
+        yield booking_data
+    
+    log.debug("Returned %s complete booking records after search/filtering", returned)
 
 # ------------------- Test Current Booking Status -------------------
 @booking_bp.route("/test-booking-status/<int:booking_id>", methods=["GET"])
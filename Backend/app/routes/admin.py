@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response
 from app.extensions import db
 from app.models.owner_request import OwnerRequest
 from app.models.owner_requirement import OwnerRequirement
@@ -10,9 +10,19 @@ from app.schemas.owner_request_schema import OwnerRequestAdminSchema
 from app.schemas.category_schema import CategorySchema
 # Schema validation removed - using direct field mapping instead
 from app.utils.security import jwt_required, admin_required
+from app.utils.pagination import is_cursor_request, keyset_page, optional_total, CursorError
+from app.utils.response_cache import response_cache
+from app.utils.passwords import password_hasher
+from app.utils.slow_queries import slow_query_recorder
+from app.utils.profiling import profile_store
+from app.utils.platform_stats import DASHBOARD_TREND_METRICS, current_totals, daily_series
+from app.utils import ledger
+from app.utils.log import get_logger
 import json
 from datetime import datetime, timezone
 
+log = get_logger("admin")
+
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
 # ------------------- Owner Requests Routes -------------------
@@ -119,9 +129,24 @@ def list_users():
             )
         )
 
-    # Pagination
-    total = query.count()
-    users = query.offset((page - 1) * per_page).limit(per_page).all()
+    # Pagination: keyset on (created_at, id) when a cursor is supplied, offset otherwise
+    next_cursor = prev_cursor = None
+    if is_cursor_request():
+        try:
+            users, next_cursor, prev_cursor = keyset_page(
+                query,
+                User.created_at,
+                User.id,
+                request.args.get('cursor'),
+                per_page,
+                key=lambda user: (user.created_at, user.id)
+            )
+        except CursorError as e:
+            return jsonify({"error": str(e)}), 400
+        total = optional_total(query, "users", filtered=bool(role or status or search))
+    else:
+        total = query.count()
+        users = query.offset((page - 1) * per_page).limit(per_page).all()
 
     result = []
     for user in users:
@@ -144,7 +169,9 @@ def list_users():
         "total": total,
         "page": page,
         "per_page": per_page,
-        "total_pages": (total + per_page - 1) // per_page
+        "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
     }), 200
 
 @admin_bp.route("/users", methods=["POST"])
@@ -359,140 +386,34 @@ def delete_user(user_id):
 @jwt_required
 @admin_required
 def get_dashboard_stats():
-    """Get admin dashboard statistics"""
+    """Get admin dashboard statistics (from the daily_platform_stats rollups and ledger balances)"""
     try:
-        # Count total users by role
-        total_users = User.query.count()
-        total_owners = User.query.filter_by(role='owner').count()
-        total_renters = User.query.filter_by(role='user').count()
-        
-        # Count total categories and rental items - handle missing columns gracefully
-        total_categories = Category.query.count()
-        
-        from app.models.RentalItem import RentalItem
-        try:
-            total_rental_items = RentalItem.query.count()
-        except Exception as e:
-            print(f"Warning: Could not count rental items: {e}")
-            total_rental_items = 0
-        
-        # Count total bookings - handle missing columns gracefully
-        from app.models.booking import Booking
-        try:
-            total_bookings = Booking.query.count()
-            pending_bookings = Booking.query.filter_by(status='Pending').count()
-            completed_bookings = Booking.query.filter_by(status='Completed').count()
-        except Exception as e:
-            print(f"Warning: Could not count bookings: {e}")
-            total_bookings = 0
-            pending_bookings = 0
-            completed_bookings = 0
-        
-        # Count total complaints
-        from app.models.complaint import Complaint
-        try:
-            total_complaints = Complaint.query.count()
-            pending_complaints = Complaint.query.filter_by(status='Pending').count()
-        except Exception as e:
-            print(f"Warning: Could not count complaints: {e}")
-            total_complaints = 0
-            pending_complaints = 0
-        
-        # Calculate total revenue (from completed bookings) - handle missing columns gracefully
-        try:
-            # Get payment amounts from confirmed bookings (payment_status = 'COMPLETED' and status = 'Confirmed')
-            # Also include bookings that were admin_approved (from held payments)
-            total_payment_amounts = db.session.query(db.func.sum(Booking.payment_amount)).filter(
-                db.or_(
-                    db.and_(
-                        Booking.payment_status == 'COMPLETED',
-                        Booking.status == 'Confirmed'
-                    ),
-                    db.and_(
-                        Booking.payment_status == 'COMPLETED',
-                        Booking.admin_approved == True
-                    )
-                )
-            ).scalar() or 0
-            
-            # Get total service fees from confirmed bookings (this is the admin's revenue)
-            # Also include bookings that were admin_approved (from held payments)
-            total_service_fees = db.session.query(db.func.sum(Booking.service_fee)).filter(
-                db.or_(
-                    db.and_(
-                        Booking.payment_status == 'COMPLETED',
-                        Booking.status == 'Confirmed'
-                    ),
-                    db.and_(
-                        Booking.payment_status == 'COMPLETED',
-                        Booking.admin_approved == True
-                    )
-                )
-            ).scalar() or 0
-            
-            # Admin revenue is ONLY the service fees (not payment amounts - those go to owners)
-            total_revenue = float(total_service_fees)
-            
-            print(f"[REVENUE] Admin Dashboard - Payment amounts to owners: ${total_payment_amounts}")
-            print(f"[REVENUE] Admin Dashboard - Service fees (admin revenue): ${total_service_fees}")
-            print(f"[REVENUE] Admin Dashboard - Total admin revenue: ${total_revenue}")
-            
-            # Debug: Show the actual query results
-            print(f"[REVENUE] Debug - Query filters applied:")
-            print(f"[REVENUE] Debug - Looking for: payment_status='COMPLETED' AND (status='Confirmed' OR admin_approved=True)")
-            
-            # Let's also check individual bookings to see what's happening
-            debug_bookings = db.session.query(Booking).filter(
-                db.or_(
-                    db.and_(
-                        Booking.payment_status == 'COMPLETED',
-                        Booking.status == 'Confirmed'
-                    ),
-                    db.and_(
-                        Booking.payment_status == 'COMPLETED',
-                        Booking.admin_approved == True
-                    )
-                )
-            ).all()
-            
-            print(f"[REVENUE] Debug - Found {len(debug_bookings)} qualifying bookings:")
-            for booking in debug_bookings[:5]:  # Show first 5
-                print(f"[REVENUE] Debug - Booking #{booking.id}: status={booking.status}, payment_status={booking.payment_status}, admin_approved={booking.admin_approved}, service_fee=${booking.service_fee}")
-            
-        except Exception as e:
-            print(f"Warning: Could not calculate revenue: {e}")
-            total_revenue = 0
-        
-        # Count held payments
-        try:
-            held_payments = Booking.query.filter_by(payment_status='HELD').count()
-        except Exception as e:
-            print(f"Warning: Could not count held payments: {e}")
-            held_payments = 0
-        
+        stats = current_totals()
+        money = ledger.balances(ledger.PLATFORM, "held")
         return jsonify({
             "users": {
-                "total": total_users,
-                "owners": total_owners,
-                "renters": total_renters
+                "total": int(stats["users.total"]),
+                "owners": int(stats["users.role.owner"]),
+                "renters": int(stats["users.role.user"])
             },
-            "categories": total_categories,
-            "rental_items": total_rental_items,
+            "categories": int(stats["categories.total"]),
+            "rental_items": int(stats["rental_items.total"]),
             "bookings": {
-                "total": total_bookings,
-                "pending": pending_bookings,
-                "completed": completed_bookings
+                "total": int(stats["bookings.total"]),
+                "pending": int(stats["bookings.status.Pending"]),
+                "completed": int(stats["bookings.status.Completed"])
             },
             "complaints": {
-                "total": total_complaints,
-                "pending": pending_complaints
+                "total": int(stats["complaints.total"]),
+                "pending": int(stats["complaints.status.Pending"])
             },
-            "revenue": float(total_revenue),
-            "held_payments": held_payments
+            # Admin revenue is ONLY the service fees (payment amounts go to owners)
+            "revenue": float(money[ledger.PLATFORM][0]),
+            "held_payments": money["held"][1]
         }), 200
         
     except Exception as e:
-        print(f"Dashboard stats error: {e}")
+        log.exception("Dashboard stats error: %s", e)
         # Return partial data instead of 500 error
         return jsonify({
             "users": {"total": 0, "owners": 0, "renters": 0},
@@ -505,95 +426,73 @@ def get_dashboard_stats():
             "error": "Some data could not be retrieved"
         }), 200
 
+@admin_bp.route("/dashboard/trends", methods=["GET"])
+@jwt_required
+@admin_required
+def get_dashboard_trends():
+    """Daily values of dashboard metrics for the last ?days= days (default 30, today is live)"""
+    try:
+        days = min(max(int(request.args.get("days", 30)), 1), 366)
+    except ValueError:
+        return jsonify({"error": "days must be an integer"}), 400
+    metrics = [metric.strip() for metric in request.args.get("metrics", "").split(",") if metric.strip()]
+    metrics = metrics or list(DASHBOARD_TREND_METRICS)
+    if len(metrics) > 20:
+        return jsonify({"error": "At most 20 metrics per request"}), 400
+    return jsonify({"days": days, "metrics": metrics, "series": daily_series(metrics, days)}), 200
+
 @admin_bp.route("/dashboard/revenue", methods=["GET"])
 @jwt_required
 @admin_required
 def get_revenue_details():
-    """Get detailed revenue breakdown for admin dashboard"""
+    """Get detailed revenue breakdown for admin dashboard (ledger balances, no booking scans)"""
     try:
-        # Get all confirmed bookings with revenue details
-        # Also include bookings that were admin_approved (from held payments)
-        confirmed_bookings = Booking.query.filter(
-            db.or_(
-                db.and_(
-                    Booking.payment_status == 'COMPLETED',
-                    Booking.status == 'Confirmed'
-                ),
-                db.and_(
-                    Booking.payment_status == 'COMPLETED',
-                    Booking.admin_approved == True
-                )
-            )
-        ).all()
-        
-        total_revenue = 0
-        total_service_fees = 0
-        total_payment_amounts = 0
+        money = ledger.balances(ledger.PLATFORM, "owner", "held", ledger.HELD_FEES, "held:owner")
+        admin_revenue, confirmed_count = money[ledger.PLATFORM]
+        owner_payments, _ = money["owner"]
+        pending_total, held_count = money["held"]
+        pending_service_fees, _ = money[ledger.HELD_FEES]
+        owner_pending, _ = money["held:owner"]
+
+        # Month of the ledger posting, i.e. when the payment was released (or clawed back)
         revenue_by_month = {}
-        
-        for booking in confirmed_bookings:
-            payment_amount = float(booking.payment_amount or 0)
-            service_fee = float(booking.service_fee or 0)
-            
-            total_payment_amounts += payment_amount
-            total_service_fees += service_fee
-            total_revenue += service_fee  # Admin revenue is ONLY service fees
-            
-            # Group by month for trend analysis
-            if booking.payment_released_at:
-                month_key = booking.payment_released_at.strftime('%Y-%m')
-                if month_key not in revenue_by_month:
-                    revenue_by_month[month_key] = {
-                        'owner_payments': 0,  # Money that goes to owners
-                        'admin_revenue': 0,   # Money that goes to admin (service fees)
-                        'total_processed': 0, # Total money processed
-                        'bookings_count': 0
-                    }
-                revenue_by_month[month_key]['owner_payments'] += payment_amount
-                revenue_by_month[month_key]['admin_revenue'] += service_fee
-                revenue_by_month[month_key]['total_processed'] += payment_amount + service_fee
-                revenue_by_month[month_key]['bookings_count'] += 1
-        
-        # Get pending revenue (held payments)
-        held_bookings = Booking.query.filter_by(payment_status='HELD').all()
-        
-        pending_revenue = 0
-        pending_service_fees = 0
-        for booking in held_bookings:
-            pending_revenue += float(booking.payment_amount or 0) + float(booking.service_fee or 0)
-            pending_service_fees += float(booking.service_fee or 0)
-            
-        print(f"[REVENUE] Pending revenue from held payments: ${pending_revenue}")
-        print(f"[REVENUE] Pending service fees (admin): ${pending_service_fees}")
-        print(f"[REVENUE] Number of held bookings: {len(held_bookings)}")
-        
+        for month_key, flows in ledger.period_flows([ledger.PLATFORM, "owner"], "month").items():
+            fees, fee_bookings = flows.get(ledger.PLATFORM, (0, 0))
+            payments, payment_bookings = flows.get("owner", (0, 0))
+            revenue_by_month[month_key] = {
+                'owner_payments': float(payments),  # Money that goes to owners
+                'admin_revenue': float(fees),       # Money that goes to admin (service fees)
+                'total_processed': float(payments + fees),  # Total money processed
+                'bookings_count': max(fee_bookings, payment_bookings)
+            }
+
         return jsonify({
             "confirmed_revenue": {
-                "admin_revenue": float(total_service_fees),  # Admin gets service fees
-                "owner_payments": float(total_payment_amounts),  # Owners get payment amounts
-                "total_processed": float(total_payment_amounts + total_service_fees),  # Total money processed
-                "service_fees": float(total_service_fees),
-                "bookings_count": len(confirmed_bookings)
+                "admin_revenue": float(admin_revenue),  # Admin gets service fees
+                "owner_payments": float(owner_payments),  # Owners get payment amounts
+                "total_processed": float(owner_payments + admin_revenue),  # Total money processed
+                "service_fees": float(admin_revenue),
+                "bookings_count": confirmed_count
             },
             "pending_revenue": {
                 "admin_pending": float(pending_service_fees),  # Admin's pending service fees
-                "owner_pending": float(pending_revenue - pending_service_fees),  # Owners' pending payments
-                "total_pending": float(pending_revenue),  # Total pending money
+                "owner_pending": float(owner_pending),  # Owners' pending payments
+                "total_pending": float(pending_total),  # Total pending money
                 "service_fees": float(pending_service_fees),
-                "bookings_count": len(held_bookings)
+                "bookings_count": held_count
             },
             "revenue_by_month": revenue_by_month,
             "summary": {
-                "admin_total_revenue": float(total_service_fees),  # This is what admin actually gets
-                "owners_total_payments": float(total_payment_amounts),  # This goes to owners
-                "total_money_processed": float(total_payment_amounts + total_service_fees),  # Total handled
+                "admin_total_revenue": float(admin_revenue),  # This is what admin actually gets
+                "owners_total_payments": float(owner_payments),  # This goes to owners
+                "total_money_processed": float(owner_payments + admin_revenue),  # Total handled
                 "pending_admin_revenue": float(pending_service_fees),
-                "total_service_fees": float(total_service_fees + pending_service_fees)
+                "total_service_fees": float(admin_revenue + pending_service_fees)
             }
         }), 200
         
     except Exception as e:
-        print(f"Revenue details error: {e}")
+        log.exception("Revenue details error: %s", e)
         return jsonify({
             "error": "Could not fetch revenue details",
             "details": str(e)
@@ -1094,151 +993,158 @@ def get_all_bookings():
                 )
             )
 
-        # Pagination
-        total = query.count()
-        bookings = query.offset((page - 1) * per_page).limit(per_page).all()
+        # Pagination: keyset on (created_at, id) when a cursor is supplied, offset otherwise
+        next_cursor = prev_cursor = None
+        if is_cursor_request():
+            bookings, next_cursor, prev_cursor = keyset_page(
+                query, Booking.created_at, Booking.id, request.args.get('cursor'),
+                per_page, key=lambda row: (row[0].created_at, row[0].id)
+            )
+            total = optional_total(query, "bookings", filtered=bool(status or date or search))
+        else:
+            total = query.count()
+            bookings = query.offset((page - 1) * per_page).limit(per_page).all()
 
         result = []
         for booking, rental_item, owner in bookings:
             try:
-                print(f"\n=== DEBUG: Processing Admin Booking {booking.id} ===")
-                print(f"Rental Item ID: {rental_item.id if rental_item else 'None'}")
+                log.debug("Processing admin booking %s", booking.id)
+                log.debug("Rental Item ID: %s", rental_item.id if rental_item else 'None')
                 
                 # Get category information
                 category_name = "Unknown"
                 if hasattr(rental_item, 'category') and rental_item.category:
                     category_name = rental_item.category.name
-                    print(f"Category Name: {category_name}")
+                    log.debug("Category Name: %s", category_name)
                 else:
-                    print(f"Category not found or not accessible")
+                    log.debug("Category not found or not accessible")
                 
                 # Get meaningful item name from dynamic data
                 item_name = "Unknown Item"
                 item_data = {}
                 
-                print(f"Initial item_name: {item_name}")
+                log.debug("Initial item_name: %s", item_name)
                 
                 # First try to get category name for better item identification
                 if rental_item and hasattr(rental_item, 'category') and rental_item.category:
                     category_name = rental_item.category.name
                     # Use category name as base for item name
                     item_name = f"{category_name} Item"
-                    print(f"After category: item_name = {item_name}")
+                    log.debug("After category: item_name = %s", item_name)
                 else:
-                    print(f"Category not available, keeping item_name as: {item_name}")
+                    log.debug("Category not available, keeping item_name as: %s", item_name)
                 
                 # Then try to extract from dynamic data if available
-                print(f"Checking dynamic_data...")
-                print(f"Has dynamic_data attr: {hasattr(rental_item, 'dynamic_data')}")
+                log.debug("Checking dynamic_data...")
+                log.debug("Has dynamic_data attr: %s", hasattr(rental_item, 'dynamic_data'))
                 if rental_item:
-                    print(f"Rental item dynamic_data: {rental_item.dynamic_data}")
-                    print(f"Dynamic data type: {type(rental_item.dynamic_data)}")
+                    log.debug("Rental item dynamic_data: %s", rental_item.dynamic_data)
+                    log.debug("Dynamic data type: %s", type(rental_item.dynamic_data))
                 
                 if rental_item and hasattr(rental_item, 'dynamic_data') and rental_item.dynamic_data:
-                    print(f"Dynamic data found and not empty!")
+                    log.debug("Dynamic data found and not empty!")
                     try:
                         import json
                         if isinstance(rental_item.dynamic_data, str):
-                            print(f"Dynamic data is string, parsing JSON...")
+                            log.debug("Dynamic data is string, parsing JSON...")
                             item_data = json.loads(rental_item.dynamic_data)
-                            print(f"Parsed JSON data: {item_data}")
+                            log.debug("Parsed JSON data: %s", item_data)
                         else:
-                            print(f"Dynamic data is not string, using as-is...")
+                            log.debug("Dynamic data is not string, using as-is...")
                             item_data = rental_item.dynamic_data
-                            print(f"Direct data: {item_data}")
+                            log.debug("Direct data: %s", item_data)
                         
                         # Try to construct a meaningful name from the actual stored data
-                        print(f"Processing item_data: {item_data}")
+                        log.debug("Processing item_data: %s", item_data)
                         if item_data:
-                            print(f"Item data is not empty, processing...")
+                            log.debug("Item data is not empty, processing...")
                             # Look for brand/model combinations (common in car rentals)
                             brand = item_data.get('Brand', '')
                             model = item_data.get('Model', '')
-                            print(f"Brand: '{brand}', Model: '{model}'")
+                            log.debug("Brand: '%s', Model: '%s'", brand, model)
                             
                             if brand and model:
                                 item_name = f"{brand} {model}"
-                                print(f"Using brand + model: {item_name}")
+                                log.debug("Using brand + model: %s", item_name)
                             elif brand:
                                 item_name = f"{brand} {category_name}"
-                                print(f"Using brand + category: {item_name}")
+                                log.debug("Using brand + category: %s", item_name)
                             elif model:
                                 item_name = f"{model} {category_name}"
-                                print(f"Using model + category: {item_name}")
+                                log.debug("Using model + category: %s", item_name)
                             else:
-                                print(f"No brand/model found, continuing...")
+                                log.debug("No brand/model found, continuing...")
                             
                             # Look for property details (common in house rentals)
                             bedrooms = item_data.get('Bedrooms', '')
                             property_type = item_data.get('Property Type', '')
-                            print(f"Brand: '{bedrooms}', Property Type: '{property_type}'")
+                            log.debug("Brand: '%s', Property Type: '%s'", bedrooms, property_type)
                             
                             if bedrooms and property_type:
                                 item_name = f"{bedrooms} Bedroom {property_type}"
-                                print(f"Using bedrooms + property type: {item_name}")
+                                log.debug("Using bedrooms + property type: %s", item_name)
                             elif property_type:
                                 item_name = f"{property_type} {category_name}"
-                                print(f"Using property type + category: {item_name}")
+                                log.debug("Using property type + category: %s", item_name)
                             else:
-                                print(f"No property details found, continuing...")
+                                log.debug("No property details found, continuing...")
                             
                             # Look for device details (common in electronics)
                             device_type = item_data.get('Device Type', '')
                             device_brand = item_data.get('Brand', '')
-                            print(f"Device Type: '{device_type}', Device Brand: '{device_brand}'")
+                            log.debug("Device Type: '%s', Device Brand: '%s'", device_type, device_brand)
                             
                             if device_type and device_brand:
                                 item_name = f"{device_brand} {device_type}"
-                                print(f"Using device brand + type: {item_name}")
+                                log.debug("Using device brand + type: %s", item_name)
                             elif device_type:
                                 item_name = f"{device_type} {category_name}"
-                                print(f"Using device type + category: {item_name}")
+                                log.debug("Using device type + category: %s", item_name)
                             else:
-                                print(f"No device details found, continuing...")
+                                log.debug("No device details found, continuing...")
                             
                             # If still no good name, try to use any descriptive field
-                            print(f"Current item_name: '{item_name}', checking if it's still category default...")
+                            log.debug("Current item_name: '%s', checking if it's still category default...", item_name)
                             if item_name == f"{category_name} Item":
-                                print(f"Still using category default, trying descriptive fields...")
+                                log.debug("Still using category default, trying descriptive fields...")
                                 for field_name, field_value in item_data.items():
-                                    print(f"Checking field: '{field_name}' = '{field_value}'")
+                                    log.debug("Checking field: '%s' = '%s'", field_name, field_value)
                                     if field_value and str(field_value).strip() and field_name not in ['Brand', 'Model', 'Bedrooms', 'Property Type', 'Device Type']:
                                         item_name = f"{category_name} - {str(field_value)[:30]}"
-                                        print(f"Using descriptive field: {item_name}")
+                                        log.debug("Using descriptive field: %s", item_name)
                                         break
                             else:
-                                print(f"Item name already updated, skipping descriptive fields")
+                                log.debug("Item name already updated, skipping descriptive fields")
                             
                             # Final fallback: use category + ID
                             if item_name == f"{category_name} Item":
                                 item_name = f"{category_name} #{rental_item.id}"
-                                print(f"Using final fallback: {item_name}")
+                                log.debug("Using final fallback: %s", item_name)
                             else:
-                                print(f"Final item_name: {item_name}")
+                                log.debug("Final item_name: %s", item_name)
                     except Exception as e:
-                        print(f"Error parsing dynamic data for admin item {rental_item.id}: {str(e)}")
+                        log.warning("Error parsing dynamic data for admin item %s: %s", rental_item.id, str(e))
                         item_data = {}
                 else:
-                    print(f"No dynamic data available")
-                    print(f"Rental item exists: {rental_item is not None}")
+                    log.debug("No dynamic data available")
+                    log.debug("Rental item exists: %s", rental_item is not None)
                     if rental_item:
-                        print(f"Has dynamic_data: {hasattr(rental_item, 'dynamic_data')}")
+                        log.debug("Has dynamic_data: %s", hasattr(rental_item, 'dynamic_data'))
                         if hasattr(rental_item, 'dynamic_data'):
-                            print(f"Dynamic data value: {rental_item.dynamic_data}")
-                            print(f"Dynamic data truthy: {bool(rental_item.dynamic_data)}")
+                            log.debug("Dynamic data value: %s", rental_item.dynamic_data)
+                            log.debug("Dynamic data truthy: %s", bool(rental_item.dynamic_data))
                 
                 # Final fallback if no name was found
                 if item_name == "Unknown Item":
                     item_name = f"Rental Item #{rental_item.id}"
-                    print(f"Using ultimate fallback: {item_name}")
+                    log.debug("Using ultimate fallback: %s", item_name)
                 
                 # Debug logging
-                print(f"[DEBUG] Admin Item {rental_item.id} - Category: {category_name}, Final Name: {item_name}")
-                print(f"[DEBUG] Admin Dynamic data: {item_data}")
-                print(f"=== END DEBUG: Admin Booking {booking.id} ===\n")
+                log.debug("Admin Item %s - Category: %s, Final Name: %s", rental_item.id, category_name, item_name)
+                log.debug("Admin Dynamic data: %s", item_data)
                 
             except Exception as e:
-                print(f"Error processing admin booking {booking.id}: {str(e)}")
+                log.warning("Error processing admin booking %s: %s", booking.id, str(e))
                 item_name = f"Rental Item #{rental_item.id if rental_item else 'Unknown'}"
                 category_name = "Unknown"
                 item_data = {}
@@ -1283,11 +1189,15 @@ def get_all_bookings():
             "total": total,
             "page": page,
             "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
+            "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
         }), 200
         
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Error fetching bookings: {e}")
+        log.exception("Error fetching bookings: %s", e)
         return jsonify({
             "bookings": [],
             "total": 0,
@@ -1334,9 +1244,17 @@ def get_all_complaints():
                 )
             )
 
-        # Pagination
-        total = query.count()
-        complaints = query.offset((page - 1) * per_page).limit(per_page).all()
+        # Pagination: keyset on (created_at, id) when a cursor is supplied, offset otherwise
+        next_cursor = prev_cursor = None
+        if is_cursor_request():
+            complaints, next_cursor, prev_cursor = keyset_page(
+                query, Complaint.created_at, Complaint.id, request.args.get('cursor'),
+                per_page, key=lambda row: (row[0].created_at, row[0].id)
+            )
+            total = optional_total(query, "complaints", filtered=bool(status or complaint_type or search))
+        else:
+            total = query.count()
+            complaints = query.offset((page - 1) * per_page).limit(per_page).all()
 
         result = []
         for complaint, booking, complainant in complaints:
@@ -1384,9 +1302,13 @@ def get_all_complaints():
             "total": total,
             "page": page,
             "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
+            "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
         }), 200
         
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error fetching complaints: {e}")
         return jsonify({
@@ -1445,9 +1367,17 @@ def get_all_payments():
                 )
             )
 
-        # Pagination
-        total = query.count()
-        payments = query.offset((page - 1) * per_page).limit(per_page).all()
+        # Pagination: keyset on (created_at, id) when a cursor is supplied, offset otherwise
+        next_cursor = prev_cursor = None
+        if is_cursor_request():
+            payments, next_cursor, prev_cursor = keyset_page(
+                query, Booking.created_at, Booking.id, request.args.get('cursor'),
+                per_page, key=lambda row: (row[0].created_at, row[0].id)
+            )
+            total = optional_total(query, "bookings", filtered=bool(status or method or date or search))
+        else:
+            total = query.count()
+            payments = query.offset((page - 1) * per_page).limit(per_page).all()
 
         result = []
         for payment_data in payments:
@@ -1492,9 +1422,13 @@ def get_all_payments():
             "total": total,
             "page": page,
             "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
+            "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
         }), 200
         
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error fetching payments: {e}")
         return jsonify({
@@ -1941,3 +1875,104 @@ def reject_held_payment(booking_id):
 
 
 
+
+# ------------------- Response Cache Routes -------------------
+
+@admin_bp.route("/cache/stats", methods=["GET"])
+@jwt_required
+@admin_required
+def get_response_cache_stats():
+    """Hit/miss metrics of this worker's public catalog response cache"""
+    return jsonify(response_cache.snapshot()), 200
+
+@admin_bp.route("/cache/clear", methods=["POST"])
+@jwt_required
+@admin_required
+def clear_response_cache():
+    """Drop every cached response in this worker"""
+    response_cache.clear()
+    return jsonify({"message": "Response cache cleared"}), 200
+
+# ------------------- Password Hashing Routes -------------------
+
+@admin_bp.route("/password-hashing/stats", methods=["GET"])
+@jwt_required
+@admin_required
+def get_password_hashing_stats():
+    """Cost, pool size, counters and latency percentiles of this worker's password hashing"""
+    return jsonify(password_hasher.stats()), 200
+
+# ------------------- Slow Query Routes -------------------
+
+@admin_bp.route("/slow-queries", methods=["GET"])
+@jwt_required
+@admin_required
+def get_slow_queries():
+    """Top slow statements from the slow-query log, grouped by SQL text"""
+    sort = request.args.get("sort", "total")
+    if sort not in ("total", "count", "max"):
+        return jsonify({"error": "sort must be one of total, count, max"}), 400
+    try:
+        limit = min(max(int(request.args.get("limit", 20)), 1), 100)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    return jsonify(slow_query_recorder.summary(limit=limit, sort=sort)), 200
+
+# ------------------- Profiling Routes -------------------
+
+@admin_bp.route("/profiles", methods=["GET"])
+@jwt_required
+@admin_required
+def get_profiles():
+    """Request profiles stored by this host (send "X-Profile: 1" with an admin token to record one)"""
+    return jsonify({"profiles": profile_store.list()}), 200
+
+@admin_bp.route("/profiles/<profile_id>", methods=["GET"])
+@jwt_required
+@admin_required
+def download_profile(profile_id):
+    """Folded stacks of one profile, for flamegraph.pl or speedscope"""
+    folded = profile_store.read(profile_id)
+    if folded is None:
+        return jsonify({"error": "Profile not found"}), 404
+    return Response(folded, mimetype="text/plain",
+                    headers={"Content-Disposition": f"attachment; filename={profile_id}.folded"})
+
+# ------------------- Ledger Routes -------------------
+
+@admin_bp.route("/ledger", methods=["GET"])
+@jwt_required
+@admin_required
+def get_ledger_entries():
+    """Ledger entries newest first, filtered by ?booking_id= or ?account= (an account or prefix),
+    keyset-paged with ?cursor="""
+    from app.models.ledger_entry import LedgerEntry
+    per_page = min(request.args.get("per_page", 50, type=int), 200)
+    query = LedgerEntry.query
+    booking_id = request.args.get("booking_id", type=int)
+    account = request.args.get("account", "").strip()
+    if booking_id:
+        query = query.filter(LedgerEntry.booking_id == booking_id)
+    if account:
+        query = query.filter(db.or_(LedgerEntry.account == account, LedgerEntry.account.like(f"{account}:%")))
+    try:
+        entries, next_cursor, prev_cursor = keyset_page(
+            query, LedgerEntry.created_at, LedgerEntry.id, request.args.get("cursor"), per_page
+        )
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "entries": [{
+            "id": entry.id,
+            "booking_id": entry.booking_id,
+            "account": entry.account,
+            "entry_type": entry.entry_type,
+            "amount": float(entry.amount),
+            "note": entry.note,
+            "created_at": entry.created_at.isoformat()
+        } for entry in entries],
+        "balance": float(ledger.balances(account)[account][0]) if account else None,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
+    }), 200
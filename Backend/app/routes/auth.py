@@ -2,11 +2,17 @@ from flask import Blueprint, request, jsonify
 from app.models.user import User
 from app.extensions import db
 from app.schemas.user_schema import UserRegisterSchema, UserLoginSchema
-from app.utils.security import generate_jwt
+from app.utils.security import generate_jwt, verify_jwt, get_request_token
+from app.utils.tokens import (issue_refresh_token, rotate_refresh_token, revoke_refresh_token,
+                              revoke_access_token, access_token_ttl, TokenError)
+from app.utils.passwords import hash_password, verify_password, password_hasher, PasswordServiceBusy
+from app.utils.log import get_logger
 from flask_cors import cross_origin
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/api/auth")
 
+log = get_logger("auth")
+
 
 # ------------------- Register -------------------
 @auth_bp.route("/register", methods=["POST", "OPTIONS"])
@@ -36,7 +42,10 @@ def register():
         username=data["username"],
         role='user',
     )
-    new_user.set_password(data["password"])  # hashes password internally
+    try:
+        new_user.set_password(data["password"])  # hashes password internally
+    except PasswordServiceBusy as e:
+        return jsonify({"error": str(e)}), 503
 
     db.session.add(new_user)
     db.session.commit()
@@ -50,43 +59,126 @@ def register():
 def login():
     try:
         if request.method == "OPTIONS":
-            print("[DEBUG] OPTIONS preflight request received")
             return '', 200  # Preflight request response
 
         data = request.get_json()
-        print(f"[DEBUG] Received login data: {data}")
 
         schema = UserLoginSchema()
         errors = schema.validate(data)
         if errors:
-            print(f"[DEBUG] Validation errors: {errors}")
+            log.debug("Login validation errors: %s", errors)
             return jsonify({"errors": errors}), 400
 
         user = User.query.filter_by(username=data["username"]).first()
-        print(f"[DEBUG] Queried user: {user}")
 
         if not user:
-            print("[DEBUG] User not found")
+            log.info("Login failed: unknown username")
             return jsonify({"error": "Invalid credentials"}), 401
 
-        # Use User model's check_password method
-        if not user.check_password(data["password"]):
-            print("[DEBUG] Password check failed")
+        # Verified in the password hashing pool, off the request thread
+        matches, needs_rehash = verify_password(data["password"], user.password)
+        if not matches:
+            log.info("Login failed: wrong password for user %s", user.id)
             return jsonify({"error": "Invalid credentials"}), 401
 
         if hasattr(user, "is_active") and not user.is_active:
-            print("[DEBUG] Account is inactive")
+            log.info("Login refused: user %s is inactive", user.id)
             return jsonify({"error": "Account is inactive"}), 403
 
-        token = generate_jwt(user.id, user.role)
-        print(f"[DEBUG] JWT generated: {token}")
+        if needs_rehash:
+            _rehash_password(user, data["password"])
+
+        token = generate_jwt(user.id, user.role, user.auth_version)
+        refresh_token = issue_refresh_token(user)
+        db.session.commit()
+        log.debug("Login successful for user %s", user.id)
 
         return jsonify({
             "message": "Login successful",
             "token": token,
+            "refresh_token": refresh_token,
+            "expires_in": access_token_ttl(),
             "user": {"id": user.id, "username": user.username, "role": user.role}
         }), 200
 
+    except PasswordServiceBusy as e:
+        return jsonify({"error": str(e)}), 503
     except Exception as e:
-        print(f"[ERROR] Exception in login route: {e}")
+        log.exception("Exception in login route: %s", e)
         return jsonify({"error": "Internal server error", "details": str(e)}), 500
+
+
+def _rehash_password(user, password):
+    """Upgrade a legacy or outdated-cost hash after a successful login.
+
+    Written with a Core UPDATE: the password did not change, so this must not bump
+    auth_version (and revoke the user's other sessions) the way set_password would.
+    """
+    try:
+        new_hash = hash_password(password)
+        db.session.execute(
+            User.__table__.update().where(User.__table__.c.id == user.id).values(password=new_hash)
+        )
+        db.session.commit()
+        password_hasher.record_rehash()
+        log.info("Rehashed password for user %s", user.id)
+    except Exception as e:
+        # The login itself succeeded; try again next time
+        db.session.rollback()
+        log.warning("Password rehash failed for user %s: %s", user.id, e)
+
+
+# ------------------- Refresh -------------------
+@auth_bp.route("/refresh", methods=["POST", "OPTIONS"])
+@cross_origin(origin="http://localhost:5173", supports_credentials=True)
+def refresh():
+    """Exchange a refresh token for a new access token and a new (rotated) refresh token.
+
+    No password is checked, so keeping a session alive costs one indexed lookup instead
+    of a bcrypt verification.
+    """
+    if request.method == "OPTIONS":
+        return '', 200  # Preflight request response
+
+    data = request.get_json(silent=True) or {}
+    raw_token = data.get("refresh_token")
+    if not raw_token or not isinstance(raw_token, str):
+        return jsonify({"error": "refresh_token is required"}), 400
+
+    try:
+        user, new_refresh_token = rotate_refresh_token(raw_token)
+    except TokenError as e:
+        return jsonify({"error": str(e)}), 401
+    except Exception as e:
+        db.session.rollback()
+        log.exception("Exception in refresh route: %s", e)
+        return jsonify({"error": "Internal server error"}), 500
+
+    return jsonify({
+        "token": generate_jwt(user.id, user.role, user.auth_version),
+        "refresh_token": new_refresh_token,
+        "expires_in": access_token_ttl(),
+        "user": {"id": user.id, "username": user.username, "role": user.role}
+    }), 200
+
+
+# ------------------- Logout -------------------
+@auth_bp.route("/logout", methods=["POST", "OPTIONS"])
+@cross_origin(origin="http://localhost:5173", supports_credentials=True)
+def logout():
+    """Revoke the presented access token and, if given, the refresh token's login"""
+    if request.method == "OPTIONS":
+        return '', 200  # Preflight request response
+
+    token = get_request_token()
+    payload = verify_jwt(token) if token else None
+    if payload:
+        revoke_access_token(payload)
+
+    data = request.get_json(silent=True) or {}
+    raw_token = data.get("refresh_token")
+    if raw_token and isinstance(raw_token, str):
+        revoke_refresh_token(raw_token)
+        db.session.commit()
+
+    return jsonify({"message": "Logged out"}), 200
@@ -2,12 +2,14 @@ from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from app.extensions import db
 from app.models.notifications import Notification
+from app.utils.conditional_get import conditional_get, notifications_stamp
 
 notification_bp = Blueprint("notification", __name__, url_prefix="/notifications")
 
 # ------------------- Get All Notifications for Logged-in User -------------------
 @notification_bp.route("/", methods=["GET"])
 @login_required
+@conditional_get(lambda kwargs: notifications_stamp(current_user.id), private=True)
 def get_notifications():
     notifications = Notification.query.filter_by(user_id=current_user.id).order_by(Notification.created_at.desc()).all()
     result = [notif.to_dict() for notif in notifications]
@@ -11,9 +11,22 @@ from app.models.RentalInputField import RenterInputField
 from app.models.owner_requirement import OwnerRequirement
 from app.utils.security import jwt_required, owner_required
 from app.utils.file_upload import save_image_file
+from app.utils.availability import bookable_filter
+from app.utils.search_index import matching_item_ids_subquery
+from app.utils.pagination import is_cursor_request, keyset_page, optional_total, CursorError
+from app.utils.response_cache import cached_response
+from app.utils.conditional_get import conditional_get, catalog_stamp, notifications_stamp
+from app.utils.item_summary import is_summary_request, with_summaries, summary_fragments, summary_response
+from app.utils import ledger
+from app.utils.owner_stats import owner_stats, owner_totals
+from app.utils.attribute_index import parse_number
+from app.utils.log import get_logger
+import json
 import os
 from datetime import datetime, timedelta
 
+log = get_logger("owner")
+
 owner_bp = Blueprint("owner", __name__, url_prefix="/api/owner")
 
 # Test route to verify the app is working
@@ -373,6 +386,8 @@ def view_own_rental_items():
 
 # Public route for renters to view rental items (no authentication required)
 @owner_bp.route("/rental-items/public", methods=["GET"])
+@conditional_get(lambda kwargs: catalog_stamp())
+@cached_response(lambda kwargs, response: {"items"})
 def get_public_rental_items():
     """Get all available rental items for renters to browse"""
     try:
@@ -382,32 +397,65 @@ def get_public_rental_items():
         category_id = request.args.get('category_id', type=int)
         search = request.args.get('search', '')
 
-        # Build base query - only show available items
-        query = db.session.query(
-            RentalItem,
-            Category.name.label("category_name"),
-            Category.description.label("category_description"),
-            User.username.label("owner_username")
-        ).join(Category, RentalItem.category_id == Category.id) \
-         .join(User, RentalItem.owner_id == User.id) \
-         .filter(RentalItem.is_available == True)
+        summary_view = is_summary_request(request.args)
+
+        # Build base query - only show bookable items (available and without active bookings)
+        if summary_view:
+            # Pre-rendered cards carry the category and owner names, only search needs the category
+            query = db.session.query(RentalItem).filter(bookable_filter())
+            if search:
+                query = query.join(Category, RentalItem.category_id == Category.id)
+        else:
+            query = db.session.query(
+                RentalItem,
+                Category.name.label("category_name"),
+                Category.description.label("category_description"),
+                User.username.label("owner_username")
+            ).join(Category, RentalItem.category_id == Category.id) \
+             .join(User, RentalItem.owner_id == User.id) \
+             .filter(bookable_filter())
 
         # Apply filters
         if category_id:
             query = query.filter(RentalItem.category_id == category_id)
         if search:
-            # Search in dynamic data values
-            search_filter = db.or_(
+            # Search in category names and in dynamic data values (via the token index)
+            search_conditions = [
                 Category.name.ilike(f"%{search}%"),
                 Category.description.ilike(f"%{search}%")
+            ]
+            matching_ids = matching_item_ids_subquery(search)
+            if matching_ids is not None:
+                search_conditions.append(RentalItem.id.in_(matching_ids))
+            query = query.filter(db.or_(*search_conditions))
+
+        # Pagination: keyset on (created_at, id) when a cursor is supplied, offset otherwise
+        next_cursor = prev_cursor = None
+        page_query = with_summaries(query) if summary_view else query
+        row_key = (lambda row: (row[1], row[2])) if summary_view \
+            else (lambda row: (row[0].created_at, row[0].id))
+        if is_cursor_request():
+            rental_items, next_cursor, prev_cursor = keyset_page(
+                page_query, RentalItem.created_at, RentalItem.id,
+                request.args.get('cursor'), per_page, key=row_key
+            )
+            # Bookable filtering always applies, so the table estimate would overcount
+            total = optional_total(query, "rental_items", filtered=True)
+        else:
+            total = query.count()
+            rental_items = page_query.order_by(RentalItem.created_at.desc(), RentalItem.id.desc()) \
+                .offset((page - 1) * per_page).limit(per_page).all()
+
+        if summary_view:
+            return summary_response(
+                "rental_items", summary_fragments(rental_items),
+                total=total,
+                page=page,
+                per_page=per_page,
+                total_pages=(total + per_page - 1) // per_page if total is not None else None,
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor
             )
-            query = query.filter(search_filter)
-
-        # Get total count
-        total = query.count()
-
-        # Apply pagination
-        rental_items = query.offset((page - 1) * per_page).limit(per_page).all()
 
         result = []
         for rental_item, category_name, category_description, owner_username in rental_items:
@@ -432,9 +480,13 @@ def get_public_rental_items():
             "total": total,
             "page": page,
             "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
+            "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor
         }), 200
 
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Error fetching rental items: {str(e)}"}), 500
 
@@ -476,6 +528,7 @@ def view_rental_item(item_id):
 
 # Public route for renters to view individual rental items (no authentication required)
 @owner_bp.route("/rental-items/<int:item_id>/public", methods=["GET"])
+@cached_response(lambda kwargs, response: {f"item:{kwargs['item_id']}", f"category:{response.get_json().get('category_id')}"})
 def view_public_rental_item(item_id):
     """Get a single rental item for renters to view"""
     try:
@@ -926,8 +979,18 @@ def list_owner_bookings():
                 )
             )
 
-        total = query.count()
-        rows = query.order_by(Booking.created_at.desc()).offset((page - 1) * per_page).limit(per_page).all()
+        next_cursor = prev_cursor = None
+        if is_cursor_request():
+            rows, next_cursor, prev_cursor = keyset_page(
+                query, Booking.created_at, Booking.id, request.args.get('cursor'),
+                per_page, key=lambda row: (row[0].created_at, row[0].id)
+            )
+            # Always scoped to the owner's items, so never use the table estimate
+            total = optional_total(query, "bookings", filtered=True)
+        else:
+            total = query.count()
+            rows = query.order_by(Booking.created_at.desc(), Booking.id.desc()) \
+                .offset((page - 1) * per_page).limit(per_page).all()
 
         result = []
         for booking, rental_item, renter in rows:
@@ -975,9 +1038,13 @@ def list_owner_bookings():
                 "current_page": page,
                 "per_page": per_page,
                 "total_items": total,
-                "total_pages": (total + per_page - 1) // per_page
+                "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+                "next_cursor": next_cursor,
+                "prev_cursor": prev_cursor
             }
         }), 200
+    except CursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"[ERROR] list_owner_bookings: {e}")
         return jsonify({"error": f"Error fetching owner bookings: {str(e)}"}), 500
@@ -1347,6 +1414,7 @@ def confirm_delivery(booking_id):
 @owner_bp.route("/notifications", methods=["GET"])
 @jwt_required
 @owner_required
+@conditional_get(lambda kwargs: notifications_stamp(request.current_user.id, f"owner_bookings:{request.current_user.id}"), private=True)
 def get_owner_notifications():
     """Get owner notifications with detailed booking information"""
     try:
@@ -1473,343 +1541,194 @@ def mark_notification_read(notification_id):
         return jsonify({"error": f"Error marking notification as read: {str(e)}"}), 500
 
 # ------------------- Owner Dashboard Endpoint -------------------
+# Panels of the owner dashboard; ?sections= picks a subset (all of them by default)
+DASHBOARD_SECTIONS = ("summary", "revenue", "category_stats", "recent_bookings", "accepted_bookings",
+                      "rental_items", "payments")
+RECENT_BOOKINGS_LIMIT = 10
+
+
+def _dashboard_sections():
+    """(set of requested sections, error response) from the optional sections query argument"""
+    requested = {section.strip() for section in request.args.get("sections", "").split(",") if section.strip()}
+    unknown = requested - set(DASHBOARD_SECTIONS)
+    if unknown:
+        return None, (jsonify({"error": f"Unknown sections: {', '.join(sorted(unknown))}. "
+                                        f"Expected any of {', '.join(DASHBOARD_SECTIONS)}"}), 400)
+    return requested or set(DASHBOARD_SECTIONS), None
+
+
+def _item_fields(dynamic_data):
+    """Parsed dynamic_data of a rental item ({} when missing or invalid)"""
+    if not dynamic_data:
+        return {}
+    try:
+        return json.loads(dynamic_data)
+    except (TypeError, ValueError):
+        return {}
+
+
+def _owner_bookings_query(owner_id, *columns):
+    """Bookings of the owner's items with their item, category and renter, newest first"""
+    from app.models.booking import Booking
+    return db.session.query(Booking, RentalItem.id, RentalItem.dynamic_data, Category.name, User.id, User.username,
+                            User.email, *columns) \
+        .join(RentalItem, Booking.rental_item_id == RentalItem.id) \
+        .outerjoin(Category, RentalItem.category_id == Category.id) \
+        .outerjoin(User, Booking.renter_id == User.id) \
+        .filter(RentalItem.owner_id == owner_id) \
+        .order_by(Booking.created_at.desc(), Booking.id.desc())
+
+
+def _recent_bookings(owner_id):
+    result = []
+    for booking, item_id, dynamic_data, category_name, renter_id, renter_name, renter_email in \
+            _owner_bookings_query(owner_id).limit(RECENT_BOOKINGS_LIMIT):
+        item_data = _item_fields(dynamic_data)
+        category_name = category_name or 'Unknown'
+        result.append({
+            "id": booking.id,
+            "rental_item": {
+                "id": item_id,
+                "name": item_data.get('Item Name', f"{category_name} Item"),
+                "image_url": item_data.get('Image URL', '/placeholder-item.jpg'),
+                "category": {"name": category_name}
+            },
+            "renter": {
+                "id": renter_id,
+                "name": renter_name,
+                "email": renter_email
+            },
+            "status": booking.status or 'Unknown',
+            "payment_status": booking.payment_status or 'Unknown',
+            "total_amount": float(booking.payment_amount or 0),
+            "created_at": booking.created_at.isoformat() if booking.created_at else None
+        })
+    return result
+
+
+def _accepted_bookings(owner_id):
+    from app.models.booking import Booking
+    status = db.func.lower(Booking.status)
+    query = _owner_bookings_query(owner_id).filter(db.or_(status.like('%accepted%'), status.like('%approved%')))
+    return [{
+        "id": booking.id,
+        "rental_item": {
+            "id": item_id,
+            "name": _item_fields(dynamic_data).get('Item Name', 'Unknown Item'),
+            "image_url": _item_fields(dynamic_data).get('Image URL', '/placeholder-item.jpg')
+        },
+        "renter": {
+            "name": renter_name
+        },
+        "created_at": booking.created_at.isoformat() if booking.created_at else None
+    } for booking, item_id, dynamic_data, _, _, renter_name, _ in query]
+
+
+def _payment_history(owner_id):
+    return [{
+        "id": booking.id,
+        "booking_id": booking.id,
+        "amount": float(booking.payment_amount or 0),
+        "status": booking.payment_status or 'Unknown',
+        "rental_item": {
+            "name": _item_fields(dynamic_data).get('Item Name', 'Unknown Item')
+        }
+    } for booking, _, dynamic_data, _, _, _, _ in _owner_bookings_query(owner_id)]
+
+
+def _rental_items(owner_id):
+    rows = db.session.query(RentalItem, Category.name) \
+        .outerjoin(Category, RentalItem.category_id == Category.id) \
+        .filter(RentalItem.owner_id == owner_id)
+    result = []
+    for item, category_name in rows:
+        item_data = _item_fields(item.dynamic_data)
+        category_name = category_name or 'Unknown'
+        result.append({
+            "id": item.id,
+            "name": item_data.get('Item Name', f"{category_name} Item"),
+            "image_url": item_data.get('Image URL', '/placeholder-item.jpg'),
+            "category": {"name": category_name},
+            "availability_status": "Available" if item.is_available else "Unavailable",
+            "price_per_day": float(parse_number(item_data.get('Daily Rate')) or 0)
+        })
+    return result
+
+
+def _category_stats(stats_by_category):
+    names = dict(db.session.query(Category.id, Category.name).filter(Category.id.in_(list(stats_by_category))))
+    return [{
+        "category_id": category_id,
+        "category_name": names.get(category_id, 'Unknown'),
+        "total_items": int(metrics["items.total"]),
+        "total_bookings": int(metrics["bookings.total"]),
+        "total_revenue": float(metrics["bookings.value"])
+    } for category_id, metrics in sorted(stats_by_category.items()) if metrics["items.total"]]
+
+
 @owner_bp.route("/dashboard", methods=["GET"])
 @jwt_required
 @owner_required
 def get_owner_dashboard():
-    """Get comprehensive dashboard data for owner"""
+    """Owner dashboard panels. Counts and totals come from the owner_stats projection and the
+    revenue ledger; ?sections=summary,revenue,... limits the response to the panels rendered."""
     if request.current_user.role != "owner":
         return jsonify({"error": "Only owners can view dashboard."}), 403
+    sections, error = _dashboard_sections()
+    if error:
+        return error
 
     try:
-        from app.models.booking import Booking
-        from app.models.RentalItem import RentalItem
-        from app.models.user import User
-        from app.models.category import Category
-        
-        print(f"[DEBUG] Dashboard endpoint called by user ID: {request.current_user.id}")
-        
-        # Get basic rental item stats
-        total_items = RentalItem.query.filter_by(owner_id=request.current_user.id).count()
-        available_items = RentalItem.query.filter_by(owner_id=request.current_user.id, is_available=True).count()
-        
-        print(f"[DEBUG] Found {total_items} total items, {available_items} available items")
-        
-        # Get all bookings for this owner's items
-        all_bookings = db.session.query(Booking, RentalItem, User).join(
-            RentalItem, Booking.rental_item_id == RentalItem.id
-        ).join(
-            User, Booking.renter_id == User.id
-        ).filter(RentalItem.owner_id == request.current_user.id).all()
-        
-        print(f"[DEBUG] Found {len(all_bookings)} total bookings")
-        
-        # Calculate booking statistics - make status checking more robust
-        total_bookings = len(all_bookings)
-        
-        # Check for different possible status field names and values
-        def get_booking_status(booking):
-            """Get booking status from various possible field names"""
-            if hasattr(booking, 'status') and booking.status:
-                return str(booking.status).strip()
-            elif hasattr(booking, 'booking_status') and booking.booking_status:
-                return str(booking.booking_status).strip()
-            elif hasattr(booking, 'state') and booking.state:
-                return str(booking.state).strip()
-            return None
-        
-        # Count bookings by status (case-insensitive)
-        pending_bookings = 0
-        accepted_bookings = 0
-        completed_bookings = 0
-        
-        for b, _, _ in all_bookings:
-            status = get_booking_status(b)
-            if status:
-                status_lower = status.lower()
-                if 'pending' in status_lower:
-                    pending_bookings += 1
-                elif 'accepted' in status_lower or 'approved' in status_lower:
-                    accepted_bookings += 1
-                elif any(comp in status_lower for comp in ['completed', 'delivered', 'returned', 'finished']):
-                    completed_bookings += 1
-                print(f"[DEBUG] Booking {b.id} has status: '{status}' (counted as: {status_lower})")
-        
-        print(f"[DEBUG] Booking status breakdown:")
-        print(f"[DEBUG] - Pending: {pending_bookings}")
-        print(f"[DEBUG] - Accepted: {accepted_bookings}")
-        print(f"[DEBUG] - Completed: {completed_bookings}")
-        print(f"[DEBUG] - Total: {total_bookings}")
-        
-        # Debug: Show all unique booking statuses
-        unique_booking_statuses = set()
-        for b, _, _ in all_bookings:
-            if hasattr(b, 'status') and b.status:
-                unique_booking_statuses.add(b.status)
-            else:
-                unique_booking_statuses.add('No Status')
-        print(f"[DEBUG] Found booking statuses: {unique_booking_statuses}")
-        
-        # Debug: Show sample booking objects to understand structure
-        if all_bookings:
-            sample_booking = all_bookings[0][0]  # First booking
-            print(f"[DEBUG] Sample booking - ID: {sample_booking.id}, Status: {getattr(sample_booking, 'status', 'No Status')}")
-            print(f"[DEBUG] Sample booking attributes: {[attr for attr in dir(sample_booking) if not attr.startswith('_')]}")
-            
-            # Check if status might be stored in a different field
-            if hasattr(sample_booking, 'booking_status'):
-                print(f"[DEBUG] Found booking_status field: {sample_booking.booking_status}")
-            if hasattr(sample_booking, 'state'):
-                print(f"[DEBUG] Found state field: {sample_booking.state}")
-        
-        print(f"[DEBUG] Booking stats: {total_bookings} total, {pending_bookings} pending, {accepted_bookings} accepted, {completed_bookings} completed")
-        
-        # Calculate revenue statistics
-        # Count ALL revenue from all bookings regardless of payment status
-        total_revenue = sum(float(b.payment_amount or 0) for b, _, _ in all_bookings)
-        # Count held payments specifically
-        held_payments = sum(float(b.payment_amount or 0) for b, _, _ in all_bookings if b.payment_status == 'HELD')
-        
-        # Also calculate revenue by payment status for detailed breakdown
-        completed_payments = sum(float(b.payment_amount or 0) for b, _, _ in all_bookings if b.payment_status == 'Completed')
-        pending_payments = sum(float(b.payment_amount or 0) for b, _, _ in all_bookings if b.payment_status == 'Pending')
-        failed_payments = sum(float(b.payment_amount or 0) for b, _, _ in all_bookings if b.payment_status == 'Failed')
-        
-        print(f"[DEBUG] Revenue stats: ${total_revenue} total revenue, ${held_payments} held payments")
-        print(f"[DEBUG] Detailed revenue: ${completed_payments} completed, ${pending_payments} pending, ${failed_payments} failed")
-        
-        # Debug: Show all unique payment statuses in the system
-        unique_payment_statuses = set()
-        for b, _, _ in all_bookings:
-            if hasattr(b, 'payment_status') and b.payment_status:
-                unique_payment_statuses.add(b.payment_status)
-            else:
-                unique_payment_statuses.add('No Status')
-        print(f"[DEBUG] Found payment statuses: {unique_payment_statuses}")
-        
-        # Debug: Show sample booking data
-        if all_bookings:
-            sample_booking = all_bookings[0][0]  # First booking
-            print(f"[DEBUG] Sample booking - ID: {sample_booking.id}, Amount: {sample_booking.payment_amount}, Status: {getattr(sample_booking, 'payment_status', 'No Status')}")
-            print(f"[DEBUG] Sample booking attributes: {[attr for attr in dir(sample_booking) if not attr.startswith('_')]}")
-        
-        # Get recent bookings (last 10)
-        recent_bookings = []
-        for booking, rental_item, renter in all_bookings[:10]:
-            try:
-                # Parse rental item data
-                item_data = {}
-                if rental_item.dynamic_data:
-                    try:
-                        import json
-                        item_data = json.loads(rental_item.dynamic_data)
-                    except:
-                        item_data = {}
-                
-                # Get category name
-                category = Category.query.get(rental_item.category_id)
-                category_name = category.name if category else 'Unknown'
-                
-                recent_bookings.append({
-                    "id": booking.id,
-                    "rental_item": {
-                        "id": rental_item.id,
-                        "name": item_data.get('Item Name', f"{category_name} Item"),
-                        "image_url": item_data.get('Image URL', '/placeholder-item.jpg'),
-                        "category": {"name": category_name}
-                    },
-                    "renter": {
-                        "id": renter.id,
-                        "name": renter.username,
-                        "email": renter.email
-                    },
-                    "status": get_booking_status(booking) or 'Unknown',
-                    "payment_status": getattr(booking, 'payment_status', 'Unknown'),
-                    "total_amount": float(booking.payment_amount or 0),
-                    "created_at": booking.created_at.isoformat() if booking.created_at else None
-                })
-            except Exception as e:
-                print(f"Error processing recent booking {booking.id}: {e}")
-                continue
-        
-        # Get rental items list
-        rental_items = []
-        owner_items = RentalItem.query.filter_by(owner_id=request.current_user.id).all()
-        print(f"[DEBUG] Processing {len(owner_items)} rental items")
-        
-        for item in owner_items:
-            try:
-                category = Category.query.get(item.category_id)
-                item_data = {}
-                if item.dynamic_data:
-                    try:
-                        import json
-                        item_data = json.loads(item.dynamic_data)
-                    except:
-                        item_data = {}
-                
-                rental_items.append({
-                    "id": item.id,
-                    "name": item_data.get('Item Name', f"{category.name if category else 'Unknown'} Item"),
-                    "image_url": item_data.get('Image URL', '/placeholder-item.jpg'),
-                    "category": {"name": category.name if category else 'Unknown'},
-                    "availability_status": "Available" if item.is_available else "Unavailable",
-                    "price_per_day": float(item_data.get('Daily Rate', 0)) if item_data.get('Daily Rate') else 0
-                })
-            except Exception as e:
-                print(f"Error processing rental item {item.id}: {e}")
-                continue
-        
-        # Get payment history
-        payments = []
-        for booking, rental_item, renter in all_bookings:
-            try:
-                item_data = {}
-                if rental_item.dynamic_data:
-                    try:
-                        import json
-                        item_data = json.loads(rental_item.dynamic_data)
-                    except:
-                        item_data = {}
-                
-                payments.append({
-                    "id": booking.id,
-                    "booking_id": booking.id,
-                    "amount": float(booking.payment_amount or 0),
-                    "status": getattr(booking, 'payment_status', 'Unknown'),
-                    "rental_item": {
-                        "name": item_data.get('Item Name', 'Unknown Item')
-                    }
-                })
-            except Exception as e:
-                print(f"Error processing payment {booking.id}: {e}")
-                continue
-        
-        # Get accepted bookings waiting for delivery confirmation
-        accepted_bookings = []
-        for booking, rental_item, renter in all_bookings:
-            status = get_booking_status(booking)
-            if status and ('accepted' in status.lower() or 'approved' in status.lower()):
-                try:
-                    item_data = {}
-                    if rental_item.dynamic_data:
-                        try:
-                            import json
-                            item_data = json.loads(rental_item.dynamic_data)
-                        except:
-                            item_data = {}
-                    
-                    accepted_bookings.append({
-                        "id": booking.id,
-                        "rental_item": {
-                            "id": rental_item.id,
-                            "name": item_data.get('Item Name', 'Unknown Item'),
-                            "image_url": item_data.get('Image URL', '/placeholder-item.jpg')
-                        },
-                        "renter": {
-                            "name": renter.username
-                        },
-                        "created_at": booking.created_at.isoformat() if booking.created_at else None
-                    })
-                except Exception as e:
-                    print(f"Error processing accepted booking {booking.id}: {e}")
-                    continue
-        
-        print(f"[DEBUG] Accepted bookings found: {len(accepted_bookings)}")
-        if accepted_bookings:
-            print(f"[DEBUG] Sample accepted booking: {accepted_bookings[0]}")
-        
-        # Debug: Show what statuses are being returned in recent bookings
-        print(f"[DEBUG] Recent bookings statuses:")
-        for i, (booking, _, _) in enumerate(all_bookings[:5]):  # Show first 5
-            status = get_booking_status(booking)
-            print(f"[DEBUG] - Recent booking {i+1}: ID={booking.id}, Status='{status}'")
-        
-        # Get category statistics
-        category_stats = []
-        
-        try:
-            # Get all categories that have rental items for this owner
-            owner_categories = db.session.query(Category).join(
-                RentalItem, Category.id == RentalItem.category_id
-            ).filter(
-                RentalItem.owner_id == request.current_user.id
-            ).distinct().all()
-            
-            print(f"[DEBUG] Found {len(owner_categories)} categories for owner")
-            
-            for category in owner_categories:
-                try:
-                    # Count items in this category
-                    item_count = RentalItem.query.filter_by(
-                        owner_id=request.current_user.id,
-                        category_id=category.id
-                    ).count()
-                    
-                    # Count bookings for items in this category
-                    booking_count = db.session.query(Booking).join(
-                        RentalItem, Booking.rental_item_id == RentalItem.id
-                    ).filter(
-                        RentalItem.owner_id == request.current_user.id,
-                        RentalItem.category_id == category.id
-                    ).count()
-                    
-                    # Calculate revenue for this category
-                    cat_revenue = sum(float(b.payment_amount or 0) for b, ri, _ in all_bookings 
-                                    if ri.category_id == category.id)
-                    
-                    category_stats.append({
-                        "category_id": category.id,
-                        "category_name": category.name,
-                        "total_items": item_count,
-                        "total_bookings": booking_count,
-                        "total_revenue": cat_revenue
-                    })
-                    
-                    print(f"[DEBUG] Category {category.name}: {item_count} items, {booking_count} bookings, ${cat_revenue} revenue")
-                    
-                except Exception as cat_error:
-                    print(f"[DEBUG] Error processing category {category.name}: {cat_error}")
-                    continue
-                    
-        except Exception as cat_stats_error:
-            print(f"[DEBUG] Error getting category statistics: {cat_stats_error}")
-            # Continue without category stats if there's an error
-        
-
-        
-        dashboard_data = {
-            "totalBookings": total_bookings,
-            "totalRevenue": total_revenue,
-            "totalItems": total_items,
-            "heldPayments": held_payments,
-            "recentBookings": recent_bookings,
-            "rentalItems": rental_items,
-            "payments": payments,
-            "acceptedBookings": accepted_bookings,
-            "categoryStats": category_stats,
-            "stats": {
-                "pendingBookings": pending_bookings,
-                "acceptedBookings": accepted_bookings,
-                "completedBookings": completed_bookings,
-                "availableItems": available_items,
-                "unavailableItems": total_items - available_items
-            },
-            "revenueBreakdown": {
-                "totalRevenue": total_revenue,
-                "completedPayments": completed_payments,
-                "pendingPayments": pending_payments,
+        owner_id = request.current_user.id
+        dashboard_data = {}
+
+        if sections & {"summary", "revenue", "category_stats"}:
+            stats_by_category = owner_stats(owner_id)
+            totals = owner_totals(stats_by_category)
+        if sections & {"summary", "revenue"}:
+            money = ledger.balances(ledger.held_account(owner_id), ledger.owner_account(owner_id),
+                                    ledger.refund_account(owner_id))
+            held_payments = float(money[ledger.held_account(owner_id)][0])
+
+        if "summary" in sections:
+            total_items = int(totals["items.total"])
+            dashboard_data.update({
+                "totalBookings": int(totals["bookings.total"]),
+                "totalRevenue": float(totals["bookings.value"]),
+                "totalItems": total_items,
                 "heldPayments": held_payments,
-                "failedPayments": failed_payments
+                "stats": {
+                    "pendingBookings": int(totals["bookings.pending"]),
+                    "acceptedBookings": int(totals["bookings.accepted"]),
+                    "completedBookings": int(totals["bookings.completed"]),
+                    "availableItems": int(totals["items.available"]),
+                    "unavailableItems": total_items - int(totals["items.available"])
+                }
+            })
+        if "revenue" in sections:
+            dashboard_data["revenueBreakdown"] = {
+                # Value of every booking regardless of payment status
+                "totalRevenue": float(totals["bookings.value"]),
+                "completedPayments": float(money[ledger.owner_account(owner_id)][0]),
+                "pendingPayments": float(totals["bookings.pending_value"]),
+                "heldPayments": held_payments,
+                "failedPayments": float(money[ledger.refund_account(owner_id)][0])
             }
-        }
-        
-        print(f"[DEBUG] Dashboard data prepared successfully")
-        print(f"[DEBUG] Summary: {total_bookings} bookings, ${total_revenue} revenue, {total_items} items, {len(category_stats)} categories")
+        if "category_stats" in sections:
+            dashboard_data["categoryStats"] = _category_stats(stats_by_category)
+        if "recent_bookings" in sections:
+            dashboard_data["recentBookings"] = _recent_bookings(owner_id)
+        if "accepted_bookings" in sections:
+            dashboard_data["acceptedBookings"] = _accepted_bookings(owner_id)
+        if "rental_items" in sections:
+            dashboard_data["rentalItems"] = _rental_items(owner_id)
+        if "payments" in sections:
+            dashboard_data["payments"] = _payment_history(owner_id)
+
+        log.debug("Dashboard sections %s prepared for owner %s", sorted(sections), owner_id)
         return jsonify(dashboard_data), 200
         
     except Exception as e:
-        print(f"Error fetching dashboard data: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error fetching dashboard data: %s", e)
         return jsonify({"error": f"Error fetching dashboard data: {str(e)}"}), 500
+
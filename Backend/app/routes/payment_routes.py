@@ -4,9 +4,12 @@ from app.extensions import db, mail
 from app.models.booking import Booking
 from app.models.user import User
 from app.models.RentalItem import RentalItem
+from app.models.category import Category
 from flask_mail import Message
 from app.utils.security import jwt_required
 from app.utils.security import admin_required
+from app.utils.streaming import stream_json, stream_rows
+from app.utils.ledger import record_transition
 
 payment_bp = Blueprint("payment", __name__, url_prefix="/payment")
 
@@ -58,6 +61,7 @@ def submit_payment():
         booking.payment_method = payment_method
         booking.payment_account = payment_account
         booking.payment_status = "PENDING"
+        record_transition(booking, "payment_resubmitted")
         
         db.session.commit()
         
@@ -234,6 +238,7 @@ def auto_release_payment_after_confirmation(booking_id):
         booking.payment_status = "COMPLETED"
         booking.status = "Delivered"
         booking.payment_released_at = datetime.utcnow()
+        record_transition(booking, "auto_release")
         
         # Calculate owner's payment (total minus service fee)
         owner_payment = float(booking.payment_amount)
@@ -294,6 +299,7 @@ def manual_payment_release(booking_id):
         else:
             return jsonify({"error": "Invalid action. Use 'release' or 'refund'."}), 400
         
+        record_transition(booking, f"manual_{action}", reason)
         db.session.commit()
         
         return jsonify({
@@ -319,204 +325,205 @@ def get_user_payments():
         method_filter = request.args.get('method', '').strip()
         date_filter = request.args.get('date', '').strip()
         
+        # Category and counterpart usernames are joined in, so rows can be streamed
+        # without a lazy load per payment
+        counterpart = db.aliased(User)
+        payments = db.session.query(Booking, RentalItem, Category.name, counterpart.username).join(
+            RentalItem, Booking.rental_item_id == RentalItem.id
+        ).outerjoin(Category, RentalItem.category_id == Category.id)
         if request.current_user.role == "user":
             # Get payments for bookings made by user
-            payments = db.session.query(Booking, RentalItem).join(
-                RentalItem, Booking.rental_item_id == RentalItem.id
-            ).filter(Booking.renter_id == request.current_user.id).all()
+            payments = payments.outerjoin(counterpart, RentalItem.owner_id == counterpart.id) \
+                .filter(Booking.renter_id == request.current_user.id)
         elif request.current_user.role == "owner":
             # Get payments for rental items owned by owner
-            payments = db.session.query(Booking, RentalItem).join(
-                RentalItem, Booking.rental_item_id == RentalItem.id
-            ).filter(RentalItem.owner_id == request.current_user.id).all()
+            payments = payments.outerjoin(counterpart, Booking.renter_id == counterpart.id) \
+                .filter(RentalItem.owner_id == request.current_user.id)
         else:
             return jsonify({"error": "Invalid user role"}), 400
 
-        result = []
-        for booking, rental_item in payments:
-            try:
-                # Get category information
-                category_name = "Unknown"
-                if hasattr(rental_item, 'category') and rental_item.category:
-                    category_name = rental_item.category.name
-                else:
-                    pass
-                
-                # Get meaningful item name from dynamic data
-                item_name = "Unknown Item"
-                item_data = {}
-                
-                # First try to get category name for better item identification
-                if rental_item and hasattr(rental_item, 'category') and rental_item.category:
-                    category_name = rental_item.category.name
-                    # Use category name as base for item name
-                    item_name = f"{category_name} Item"
-                else:
-                    pass
-                
-                # Then try to extract from dynamic data if available
-                if rental_item and hasattr(rental_item, 'dynamic_data') and rental_item.dynamic_data:
-                    try:
-                        import json
-                        if isinstance(rental_item.dynamic_data, str):
-                            item_data = json.loads(rental_item.dynamic_data)
+        # Status and method filters run in the database
+        if status_filter:
+            payments = payments.filter(Booking.payment_status == status_filter)
+        if method_filter:
+            payments = payments.filter(Booking.payment_method == method_filter)
+        payments = payments.order_by(Booking.id)
+
+        role = request.current_user.role
+        return stream_json("payments", _generate_payments(stream_rows(payments), role, search_term, date_filter))
+        
+    except Exception as e:
+        print(f"Error fetching user payments: {e}")
+        return jsonify({"error": "Could not fetch payments"}), 500
+
+
+def _generate_payments(payments, role, search_term, date_filter):
+    """Yield the payment entries of get_user_payments that pass the search and date filters"""
+    for booking, rental_item, joined_category_name, counterpart_username in payments:
+        try:
+            # Get category information
+            category_name = joined_category_name or "Unknown"
+            
+            # Get meaningful item name from dynamic data
+            item_name = "Unknown Item"
+            item_data = {}
+            
+            # First try to get category name for better item identification
+            if rental_item and joined_category_name:
+                # Use category name as base for item name
+                item_name = f"{category_name} Item"
+            else:
+                pass
+            
+            # Then try to extract from dynamic data if available
+            if rental_item and hasattr(rental_item, 'dynamic_data') and rental_item.dynamic_data:
+                try:
+                    import json
+                    if isinstance(rental_item.dynamic_data, str):
+                        item_data = json.loads(rental_item.dynamic_data)
+                    else:
+                        item_data = rental_item.dynamic_data
+                    
+                    # Try to construct a meaningful name from the actual stored data
+                    if item_data:
+                        # Look for brand/model combinations (common in car rentals)
+                        brand = item_data.get('Brand', '')
+                        model = item_data.get('Model', '')
+                        
+                        if brand and model:
+                            item_name = f"{brand} {model}"
+                        elif brand:
+                            item_name = f"{brand} {category_name}"
+                        elif model:
+                            item_name = f"{model} {category_name}"
                         else:
-                            item_data = rental_item.dynamic_data
+                            pass
                         
-                        # Try to construct a meaningful name from the actual stored data
-                        if item_data:
-                            # Look for brand/model combinations (common in car rentals)
-                            brand = item_data.get('Brand', '')
-                            model = item_data.get('Model', '')
-                            
-                            if brand and model:
-                                item_name = f"{brand} {model}"
-                            elif brand:
-                                item_name = f"{brand} {category_name}"
-                            elif model:
-                                item_name = f"{model} {category_name}"
-                            else:
-                                pass
-                            
-                            # Look for property details (common in house rentals)
-                            bedrooms = item_data.get('Bedrooms', '')
-                            property_type = item_data.get('Property Type', '')
-                            
-                            if bedrooms and property_type:
-                                item_name = f"{bedrooms} Bedroom {property_type}"
-                            elif property_type:
-                                item_name = f"{property_type} {category_name}"
-                            else:
-                                pass
-                            
-                            # Look for device details (common in electronics)
-                            device_type = item_data.get('Device Type', '')
-                            device_brand = item_data.get('Brand', '')
-                            
-                            if device_type and device_brand:
-                                item_name = f"{device_brand} {device_type}"
-                            elif device_type:
-                                item_name = f"{device_type} {category_name}"
-                            else:
-                                pass
-                            
-                            # If still no good name, try to use any descriptive field
-                            if item_name == f"{category_name} Item":
-                                for field_name, field_value in item_data.items():
-                                    if field_value and str(field_value).strip() and field_name not in ['Brand', 'Model', 'Bedrooms', 'Property Type', 'Device Type']:
-                                        item_name = f"{category_name} - {str(field_value)[:30]}"
-                                        break
-                            else:
-                                pass
-                            
-                            # Final fallback: use category + ID
-                            if item_name == f"{category_name} Item":
-                                item_name = f"{category_name} #{rental_item.id}"
-                            else:
-                                pass
-                    except Exception as e:
-                        print(f"Error parsing dynamic data for payment item {rental_item.id}: {str(e)}")
-                        item_data = {}
-                else:
-                    pass
-                
-                # Final fallback if no name was found
-                if item_name == "Unknown Item":
-                    item_name = f"Rental Item #{rental_item.id}"
-                
-                payment_info = {
-                    "booking_id": booking.id,
-                    "rental_item_name": item_name,
-                    "payment_status": getattr(booking, 'payment_status', 'PENDING'),
-                    "payment_amount": float(getattr(booking, 'payment_amount', 0)),
-                    "service_fee": float(getattr(booking, 'service_fee', 0)),
-                    "total_amount": float(getattr(booking, 'payment_amount', 0)) + float(getattr(booking, 'service_fee', 0)),
-                    "payment_method": getattr(booking, 'payment_method', 'Not specified'),
-                    "payment_account": getattr(booking, 'payment_account', 'Not specified'),
-                    "created_at": booking.created_at.isoformat() if booking.created_at else None,
-                    "payment_held_at": getattr(booking, 'payment_held_at', None),
-                    "payment_released_at": getattr(booking, 'payment_released_at', None),
-                    "status": booking.status,
-                    "admin_approved": getattr(booking, 'admin_approved', None)
+                        # Look for property details (common in house rentals)
+                        bedrooms = item_data.get('Bedrooms', '')
+                        property_type = item_data.get('Property Type', '')
+                        
+                        if bedrooms and property_type:
+                            item_name = f"{bedrooms} Bedroom {property_type}"
+                        elif property_type:
+                            item_name = f"{property_type} {category_name}"
+                        else:
+                            pass
+                        
+                        # Look for device details (common in electronics)
+                        device_type = item_data.get('Device Type', '')
+                        device_brand = item_data.get('Brand', '')
+                        
+                        if device_type and device_brand:
+                            item_name = f"{device_brand} {device_type}"
+                        elif device_type:
+                            item_name = f"{device_type} {category_name}"
+                        else:
+                            pass
+                        
+                        # If still no good name, try to use any descriptive field
+                        if item_name == f"{category_name} Item":
+                            for field_name, field_value in item_data.items():
+                                if field_value and str(field_value).strip() and field_name not in ['Brand', 'Model', 'Bedrooms', 'Property Type', 'Device Type']:
+                                    item_name = f"{category_name} - {str(field_value)[:30]}"
+                                    break
+                        else:
+                            pass
+                        
+                        # Final fallback: use category + ID
+                        if item_name == f"{category_name} Item":
+                            item_name = f"{category_name} #{rental_item.id}"
+                        else:
+                            pass
+                except Exception as e:
+                    print(f"Error parsing dynamic data for payment item {rental_item.id}: {str(e)}")
+                    item_data = {}
+            else:
+                pass
+            
+            # Final fallback if no name was found
+            if item_name == "Unknown Item":
+                item_name = f"Rental Item #{rental_item.id}"
+            
+            payment_info = {
+                "booking_id": booking.id,
+                "rental_item_name": item_name,
+                "payment_status": getattr(booking, 'payment_status', 'PENDING'),
+                "payment_amount": float(getattr(booking, 'payment_amount', 0)),
+                "service_fee": float(getattr(booking, 'service_fee', 0)),
+                "total_amount": float(getattr(booking, 'payment_amount', 0)) + float(getattr(booking, 'service_fee', 0)),
+                "payment_method": getattr(booking, 'payment_method', 'Not specified'),
+                "payment_account": getattr(booking, 'payment_account', 'Not specified'),
+                "created_at": booking.created_at.isoformat() if booking.created_at else None,
+                "payment_held_at": getattr(booking, 'payment_held_at', None),
+                "payment_released_at": getattr(booking, 'payment_released_at', None),
+                "status": booking.status,
+                "admin_approved": getattr(booking, 'admin_approved', None)
+            }
+            
+            if role == "user":
+                payment_info["owner"] = {
+                    "username": counterpart_username or "Unknown"
                 }
+            else:
+                payment_info["renter"] = {
+                    "username": counterpart_username or "Unknown"
+                }
+            
+            # Apply filters before adding to result
+            should_include = True
+            
+            # Date filter (check if created_at falls within the specified date)
+            if date_filter and payment_info["created_at"]:
+                try:
+                    from datetime import datetime
+                    filter_date = datetime.fromisoformat(date_filter.replace('Z', '+00:00'))
+                    payment_date = datetime.fromisoformat(payment_info["created_at"].replace('Z', '+00:00'))
+                    
+                    # Check if payment date is on the same day as filter date
+                    if payment_date.date() != filter_date.date():
+                        should_include = False
+                except Exception as e:
+                    print(f"Error parsing date filter: {e}")
+            
+            # Search filter (check multiple fields)
+            if search_term and should_include:
+                search_lower = search_term.lower()
+                searchable_fields = [
+                    str(payment_info["booking_id"]),
+                    payment_info["rental_item_name"],
+                    payment_info["payment_status"],
+                    str(payment_info["payment_amount"]),
+                    str(payment_info["service_fee"]),
+                    str(payment_info["total_amount"]),
+                    payment_info["payment_method"],
+                    payment_info["payment_account"]
+                ]
                 
-                if request.current_user.role == "user":
-                    payment_info["owner"] = {
-                        "username": User.query.get(rental_item.owner_id).username if rental_item.owner_id else "Unknown"
-                    }
-                else:
-                    payment_info["renter"] = {
-                        "username": booking.renter.username if booking.renter else "Unknown"
-                    }
-                
-                # Apply filters before adding to result
-                should_include = True
+                # Check if any field contains the search term
+                field_matches = []
+                for i, field in enumerate(searchable_fields):
+                    if search_lower in field.lower():
+                        field_matches.append(f"Field {i}: '{field}'")
                 
-                # Status filter
-                if status_filter and payment_info["payment_status"] != status_filter:
-                    should_include = False
+                # Also check if search term is a number and matches amounts or IDs exactly
+                if search_term.isdigit():
+                    search_number = int(search_term)
+                    if search_number == payment_info["booking_id"]:
+                        field_matches.append(f"Exact ID match: {search_number}")
+                    if search_number == int(payment_info["payment_amount"]):
+                        field_matches.append(f"Exact amount match: {search_number}")
+                    if search_number == int(payment_info["service_fee"]):
+                        field_matches.append(f"Exact service fee match: {search_number}")
+                    if search_number == int(payment_info["total_amount"]):
+                        field_matches.append(f"Exact total match: {search_number}")
                 
-                # Method filter
-                if method_filter and payment_info["payment_method"] != method_filter:
+                if not field_matches:
                     should_include = False
+            
+            if should_include:
+                yield payment_info
                 
-                # Date filter (check if created_at falls within the specified date)
-                if date_filter and payment_info["created_at"]:
-                    try:
-                        from datetime import datetime
-                        filter_date = datetime.fromisoformat(date_filter.replace('Z', '+00:00'))
-                        payment_date = datetime.fromisoformat(payment_info["created_at"].replace('Z', '+00:00'))
-                        
-                        # Check if payment date is on the same day as filter date
-                        if payment_date.date() != filter_date.date():
-                            should_include = False
-                    except Exception as e:
-                        print(f"Error parsing date filter: {e}")
-                
-                # Search filter (check multiple fields)
-                if search_term and should_include:
-                    search_lower = search_term.lower()
-                    searchable_fields = [
-                        str(payment_info["booking_id"]),
-                        payment_info["rental_item_name"],
-                        payment_info["payment_status"],
-                        str(payment_info["payment_amount"]),
-                        str(payment_info["service_fee"]),
-                        str(payment_info["total_amount"]),
-                        payment_info["payment_method"],
-                        payment_info["payment_account"]
-                    ]
-                    
-                    # Check if any field contains the search term
-                    field_matches = []
-                    for i, field in enumerate(searchable_fields):
-                        if search_lower in field.lower():
-                            field_matches.append(f"Field {i}: '{field}'")
-                    
-                    # Also check if search term is a number and matches amounts or IDs exactly
-                    if search_term.isdigit():
-                        search_number = int(search_term)
-                        if search_number == payment_info["booking_id"]:
-                            field_matches.append(f"Exact ID match: {search_number}")
-                        if search_number == int(payment_info["payment_amount"]):
-                            field_matches.append(f"Exact amount match: {search_number}")
-                        if search_number == int(payment_info["service_fee"]):
-                            field_matches.append(f"Exact service fee match: {search_number}")
-                        if search_number == int(payment_info["total_amount"]):
-                            field_matches.append(f"Exact total match: {search_number}")
-                    
-                    if not field_matches:
-                        should_include = False
-                
-                if should_include:
-                    result.append(payment_info)
-                    
-            except Exception as e:
-                print(f"Error processing payment for booking {booking.id}: {e}")
-                continue
-
-        return jsonify({"payments": result}), 200
-        
-    except Exception as e:
-        print(f"Error fetching user payments: {e}")
-        return jsonify({"error": "Could not fetch payments"}), 500
+        except Exception as e:
+            print(f"Error processing payment for booking {booking.id}: {e}")
+            continue
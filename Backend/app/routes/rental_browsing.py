@@ -2,26 +2,51 @@ from flask import Blueprint, jsonify, request
 from app.extensions import db
 from app.models.category import Category
 from app.models.RentalItem import RentalItem
-from app.models.booking import Booking
+from app.utils.availability import filter_bookable
+from app.utils.search_index import ranked_search_subquery
+from app.utils.attribute_index import (
+    parse_attribute_filters, apply_attribute_filters, text_facet, number_facet, date_facet,
+    NON_INDEXED_FIELD_TYPES
+)
+from app.models.category_requirement import CategoryRequirement
+from app.models.item_attribute import ItemAttribute
+from app.models.category_item_count import CategoryItemCount
+from app.utils.response_cache import cached_response
+from app.utils.conditional_get import conditional_get, catalog_stamp, category_stamp
+from app.utils.item_summary import is_summary_request, with_summaries, summary_fragments, summary_response
+from app.utils.pricing import quote_many, MAX_QUOTES_PER_REQUEST
+from app.utils.log import get_logger
 import json
 
 rental_browsing_bp = Blueprint("rental_browsing", __name__, url_prefix="/rental-browsing")
 
+log = get_logger("rental_browsing")
+
+def _category_or_catalog_tags(kwargs, response):
+    """Cache tags for listings that may be scoped to one category"""
+    category_id = kwargs.get("category_id") or request.args.get("category_id", type=int)
+    return {f"category:{category_id}"} if category_id else {"items"}
+
+def _category_or_catalog_stamp(kwargs):
+    """Version stamp for listings that may be scoped to one category"""
+    category_id = kwargs.get("category_id") or request.args.get("category_id", type=int)
+    return category_stamp(category_id) if category_id else catalog_stamp()
+
 # ------------------- Get All Categories -------------------
 @rental_browsing_bp.route("/categories", methods=["GET"])
+@conditional_get(lambda kwargs: catalog_stamp())
+@cached_response(lambda kwargs, response: {"categories"})
 def get_categories():
     """Public endpoint to get all available categories"""
     try:
-        categories = Category.query.all()
+        # Available item counts come from the materialized counters table (one small join)
+        categories = db.session.query(
+            Category,
+            db.func.coalesce(CategoryItemCount.available_items, 0)
+        ).outerjoin(CategoryItemCount, CategoryItemCount.category_id == Category.id).all()
         result = []
         
-        for cat in categories:
-            # Count only available rental items in this category
-            available_item_count = RentalItem.query.filter_by(
-                category_id=cat.id,
-                is_available=True
-            ).count()
-            
+        for cat, available_item_count in categories:
             result.append({
                 "id": cat.id,
                 "name": cat.name,
@@ -42,8 +67,38 @@ def get_categories():
             "error": "Could not retrieve categories"
         }), 500
 
+# ------------------- Helpers -------------------
+def _get_pagination_args():
+    """Read page/per_page from the query string, clamped to sane bounds"""
+    page = max(request.args.get('page', 1, type=int) or 1, 1)
+    per_page = request.args.get('per_page', 20, type=int) or 20
+    per_page = min(max(per_page, 1), 100)
+    return page, per_page
+
+def _serialize_item(item):
+    """Build the public JSON representation of a rental item"""
+    # Parse dynamic data
+    dynamic_data = {}
+    if item.dynamic_data:
+        try:
+            dynamic_data = json.loads(item.dynamic_data)
+        except:
+            dynamic_data = {}
+    
+    return {
+        "id": item.id,
+        "category_id": item.category_id,
+        "owner_id": item.owner_id,
+        "is_available": item.is_available,
+        "created_at": item.created_at.isoformat() if item.created_at else None,
+        "updated_at": item.updated_at.isoformat() if item.updated_at else None,
+        "dynamic_data": dynamic_data
+    }
+
 # ------------------- Get Rental Items by Category -------------------
 @rental_browsing_bp.route("/categories/<int:category_id>/items", methods=["GET"])
+@conditional_get(_category_or_catalog_stamp)
+@cached_response(_category_or_catalog_tags)
 def get_items_by_category(category_id):
     """Public endpoint to get available rental items for a specific category"""
     try:
@@ -52,50 +107,29 @@ def get_items_by_category(category_id):
         if not category:
             return jsonify({"error": "Category not found"}), 404
         
-        # Get only available rental items for this category
-        rental_items = RentalItem.query.filter_by(
-            category_id=category_id,
-            is_available=True
-        ).all()
-        
-        # Additional filter: exclude items with active bookings
-        available_items = []
-        for item in rental_items:
-            # Check if item has any active bookings
-            active_booking = Booking.query.filter_by(
-                rental_item_id=item.id
-            ).filter(
-                Booking.payment_status.in_(["PENDING", "HELD", "COMPLETED"])
-            ).filter(
-                Booking.status.in_(["Requirements_Submitted", "Payment_Held", "Confirmed", "Active"])
-            ).first()
-            
-            # Only include items without active bookings
-            if not active_booking:
-                available_items.append(item)
+        page, per_page = _get_pagination_args()
         
-        result = []
-        for item in available_items:
-            # Parse dynamic data
-            dynamic_data = {}
-            if item.dynamic_data:
-                try:
-                    dynamic_data = json.loads(item.dynamic_data)
-                except:
-                    dynamic_data = {}
-            
-            # Extract basic item info
-            item_info = {
-                "id": item.id,
-                "category_id": item.category_id,
-                "owner_id": item.owner_id,
-                "is_available": item.is_available,
-                "created_at": item.created_at.isoformat() if item.created_at else None,
-                "updated_at": item.updated_at.isoformat() if item.updated_at else None,
-                "dynamic_data": dynamic_data
-            }
-            
-            result.append(item_info)
+        # Only bookable items: marked available and without active bookings (single anti-join)
+        items_query = filter_bookable(RentalItem.query.filter_by(category_id=category_id))
+        
+        total = items_query.count()
+        items_query = items_query.order_by(RentalItem.created_at.desc(), RentalItem.id.desc())
+        
+        if is_summary_request(request.args):
+            # Pre-rendered cards: no dynamic_data parsing or per-item serialization
+            rows = with_summaries(items_query).offset((page - 1) * per_page).limit(per_page).all()
+            return summary_response(
+                "items", summary_fragments(rows),
+                category={"id": category.id, "name": category.name, "description": category.description},
+                total_items=total,
+                page=page,
+                per_page=per_page,
+                total_pages=(total + per_page - 1) // per_page
+            )
+        
+        rental_items = items_query.offset((page - 1) * per_page).limit(per_page).all()
+        
+        result = [_serialize_item(item) for item in rental_items]
         
         return jsonify({
             "category": {
@@ -104,7 +138,10 @@ def get_items_by_category(category_id):
                 "description": category.description
             },
             "items": result,
-            "total_items": len(result)
+            "total_items": total,
+            "page": page,
+            "per_page": per_page,
+            "total_pages": (total + per_page - 1) // per_page
         }), 200
         
     except Exception as e:
@@ -115,73 +152,75 @@ def get_items_by_category(category_id):
 
 # ------------------- Search Rental Items -------------------
 @rental_browsing_bp.route("/search", methods=["GET"])
+@conditional_get(_category_or_catalog_stamp)
+@cached_response(_category_or_catalog_tags)
 def search_items():
     """Public endpoint to search available rental items across all categories"""
     try:
         query = request.args.get('q', '').strip()
         category_id = request.args.get('category_id', type=int)
         
-        if not query and not category_id:
+        try:
+            attribute_filters = parse_attribute_filters(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        if not query and not category_id and not attribute_filters:
             return jsonify({"error": "Please provide a search query or category ID"}), 400
         
-        # Build query for available items only
-        items_query = RentalItem.query.filter_by(is_available=True)
+        page, per_page = _get_pagination_args()
+        
+        # Build query for bookable items only
+        items_query = filter_bookable(RentalItem.query)
         
         if category_id:
             items_query = items_query.filter_by(category_id=category_id)
         
+        # Typed attribute filters, e.g. attr_12_min=100&attr_12_max=500 or attr_7=Mogadishu
+        items_query = apply_attribute_filters(items_query, attribute_filters)
+        
         if query:
-            # Search in dynamic data (basic text search)
-            items_query = items_query.filter(
-                RentalItem.dynamic_data.ilike(f'%{query}%')
+            # Ranked search against the token index over dynamic data values
+            ranked = ranked_search_subquery(query)
+            if ranked is None:
+                items_query = items_query.filter(db.false())
+                order_by = (RentalItem.id.desc(),)
+            else:
+                items_query = items_query.join(ranked, ranked.c.rental_item_id == RentalItem.id)
+                order_by = (ranked.c.score.desc(), RentalItem.id.desc())
+        else:
+            order_by = (RentalItem.created_at.desc(), RentalItem.id.desc())
+        
+        total = items_query.count()
+        items_query = items_query.order_by(*order_by)
+        
+        if is_summary_request(request.args):
+            # Pre-rendered cards: no dynamic_data parsing or per-item serialization
+            rows = with_summaries(items_query).offset((page - 1) * per_page).limit(per_page).all()
+            return summary_response(
+                "items", summary_fragments(rows),
+                total_items=total,
+                page=page,
+                per_page=per_page,
+                total_pages=(total + per_page - 1) // per_page,
+                query=query,
+                category_id=category_id,
+                filters={str(k): v for k, v in attribute_filters.items()}
             )
         
-        rental_items = items_query.all()
-        
-        # Additional filter: exclude items with active bookings
-        available_items = []
-        for item in rental_items:
-            # Check if item has any active bookings
-            active_booking = Booking.query.filter_by(
-                rental_item_id=item.id
-            ).filter(
-                Booking.payment_status.in_(["PENDING", "HELD", "COMPLETED"])
-            ).filter(
-                Booking.status.in_(["Requirements_Submitted", "Payment_Held", "Confirmed", "Active"])
-            ).first()
-            
-            # Only include items without active bookings
-            if not active_booking:
-                available_items.append(item)
+        rental_items = items_query.offset((page - 1) * per_page).limit(per_page).all()
         
-        result = []
-        for item in available_items:
-            # Parse dynamic data
-            dynamic_data = {}
-            if item.dynamic_data:
-                try:
-                    dynamic_data = json.loads(item.dynamic_data)
-                except:
-                    dynamic_data = {}
-            
-            # Extract basic item info
-            item_info = {
-                "id": item.id,
-                "category_id": item.category_id,
-                "owner_id": item.owner_id,
-                "is_available": item.is_available,
-                "created_at": item.created_at.isoformat() if item.created_at else None,
-                "updated_at": item.updated_at.isoformat() if item.updated_at else None,
-                "dynamic_data": dynamic_data
-            }
-            
-            result.append(item_info)
+        result = [_serialize_item(item) for item in rental_items]
         
         return jsonify({
             "items": result,
-            "total_items": len(result),
+            "total_items": total,
+            "page": page,
+            "per_page": per_page,
+            "total_pages": (total + per_page - 1) // per_page,
             "query": query,
-            "category_id": category_id
+            "category_id": category_id,
+            "filters": {str(k): v for k, v in attribute_filters.items()}
         }), 200
         
     except Exception as e:
@@ -190,3 +229,120 @@ def search_items():
             "error": "Could not search items"
         }), 500
 
+# ------------------- Facets -------------------
+@rental_browsing_bp.route("/facets", methods=["GET"])
+@conditional_get(_category_or_catalog_stamp)
+@cached_response(_category_or_catalog_tags)
+def get_facets():
+    """Public endpoint returning value counts / numeric buckets per category field.
+
+    Accepts the same q and attr_* filters as /search. Each facet is computed with
+    every filter applied except its own, so the client can widen a selection.
+    """
+    try:
+        category_id = request.args.get('category_id', type=int)
+        if not category_id:
+            return jsonify({"error": "category_id is required"}), 400
+        
+        category = Category.query.get(category_id)
+        if not category:
+            return jsonify({"error": "Category not found"}), 404
+        
+        try:
+            attribute_filters = parse_attribute_filters(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        
+        query = request.args.get('q', '').strip()
+        base_query = filter_bookable(RentalItem.query.filter_by(category_id=category_id))
+        if query:
+            ranked = ranked_search_subquery(query)
+            if ranked is None:
+                base_query = base_query.filter(db.false())
+            else:
+                base_query = base_query.join(ranked, ranked.c.rental_item_id == RentalItem.id)
+        
+        # Treat a text field as numeric when every indexed value of it parsed as a number
+        value_counts = {}
+        for requirement_id, total, numeric in db.session.query(
+            ItemAttribute.requirement_id,
+            db.func.count(ItemAttribute.id),
+            db.func.count(ItemAttribute.value_number)
+        ).filter(ItemAttribute.category_id == category_id).group_by(ItemAttribute.requirement_id).all():
+            value_counts[requirement_id] = (total, numeric)
+        
+        facets = []
+        requirements = CategoryRequirement.query.filter_by(category_id=category_id) \
+            .order_by(CategoryRequirement.id).all()
+        for requirement in requirements:
+            if requirement.field_type in NON_INDEXED_FIELD_TYPES:
+                continue
+            total, numeric = value_counts.get(requirement.id, (0, 0))
+            item_ids = apply_attribute_filters(base_query, attribute_filters, exclude_requirement_id=requirement.id) \
+                .with_entities(RentalItem.id)
+            
+            facet = {
+                "requirement_id": requirement.id,
+                "name": requirement.name,
+                "field_type": requirement.field_type
+            }
+            if requirement.field_type == "date":
+                facet["type"] = "date"
+                facet.update(date_facet(item_ids, requirement.id))
+            elif requirement.field_type == "number" or (total and total == numeric):
+                facet["type"] = "range"
+                facet.update(number_facet(item_ids, requirement.id))
+            else:
+                facet["type"] = "values"
+                facet["values"] = text_facet(item_ids, requirement.id)
+            facets.append(facet)
+        
+        return jsonify({
+            "category_id": category_id,
+            "total_items": apply_attribute_filters(base_query, attribute_filters).count(),
+            "facets": facets
+        }), 200
+        
+    except Exception as e:
+        log.exception("Error getting facets: %s", e)
+        return jsonify({
+            "error": "Could not retrieve facets"
+        }), 500
+
+# ------------------- Price Quotes -------------------
+@rental_browsing_bp.route("/quotes", methods=["POST"])
+def get_quotes():
+    """Public endpoint pricing many (item, start_date, end_date) requests in one call.
+
+    Body: {"quotes": [{"item_id": 1, "start_date": "2026-11-01", "end_date": "2026-11-05"}, ...]}
+    Each result carries the total and its month/week/day breakdown, or an "error".
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        requested = data.get("quotes")
+        if not isinstance(requested, list) or not requested:
+            return jsonify({"error": "quotes must be a non-empty list"}), 400
+        if len(requested) > MAX_QUOTES_PER_REQUEST:
+            return jsonify({"error": f"At most {MAX_QUOTES_PER_REQUEST} quotes per request"}), 400
+        
+        tuples = []
+        for entry in requested:
+            if not isinstance(entry, dict):
+                return jsonify({"error": "Each quote must be an object"}), 400
+            try:
+                item_id = int(entry.get("item_id"))
+            except (TypeError, ValueError):
+                return jsonify({"error": "Each quote needs a numeric item_id"}), 400
+            tuples.append((item_id, entry.get("start_date"), entry.get("end_date")))
+        
+        quotes = quote_many(tuples)
+        return jsonify({
+            "quotes": quotes,
+            "count": len(quotes)
+        }), 200
+        
+    except Exception as e:
+        log.exception("Error calculating quotes: %s", e)
+        return jsonify({
+            "error": "Could not calculate quotes"
+        }), 500
@@ -4,12 +4,15 @@ from app.extensions import db
 from app.models.booking import Booking
 from app.models.RentalItem import RentalItem
 from app.models.user import User
+from app.models.category import Category
 from datetime import datetime
 import io
-import csv
 from fpdf import FPDF
 import json
 from app.utils.security import jwt_required, admin_required
+from app.utils.streaming import stream_csv, stream_json, stream_rows, stream_xlsx
+from app.utils.aggregates import DIMENSIONS, booking_breakdown, booking_filters, booking_totals, count_by
+from app.utils import ledger
 
 reports_bp = Blueprint("reports", __name__, url_prefix="/reports")
 
@@ -40,77 +43,158 @@ def generate_pdf_report(data, title="Report"):
     return buffer
 
 
-def generate_csv_report(data):
-    buffer = io.StringIO()
-    if data:
-        writer = csv.DictWriter(buffer, fieldnames=list(data[0].keys()))
-        writer.writeheader()
-        for row in data:
-            writer.writerow(row)
-    buffer.seek(0)
-    return io.BytesIO(buffer.read().encode())
+def _export_columns(rows):
+    """Column names of a list of report rows, in first-seen order (rows may differ in keys)"""
+    columns = []
+    for row in rows:
+        columns.extend(key for key in row if key not in columns)
+    return columns
 
 
-# ------------------- Earnings Summary -------------------
-@reports_bp.route("/earnings", methods=["GET"])
-@jwt_required
-def earnings_summary():
-    start_date = request.args.get("start_date")
-    end_date = request.args.get("end_date")
+def export_response(format_type, title, columns, rows):
+    """Download response for report rows: a streamed CSV or XLSX, or an in-memory PDF"""
+    if format_type == "pdf":
+        buffer = generate_pdf_report(list(rows), title=title)
+        return send_file(buffer, mimetype="application/pdf", as_attachment=True, download_name=f"{title}.pdf")
+    if format_type == "xlsx":
+        return stream_xlsx(f"{title}.xlsx", columns, rows, sheet_name=title)
+    return stream_csv(f"{title}.csv", columns, rows)
 
-    filters = []
 
-    if start_date:
-        start = validate_date(start_date)
+# ------------------- Scopes -------------------
+RECENT_BOOKINGS_LIMIT = 10
+
+EXPORT_FORMATS = ("pdf", "csv", "xlsx")
+EARNINGS_COLUMNS = ["Booking ID", "Renter", "Owner", "Rental Item", "Payment", "Service Fee", "Net Owner",
+                    "Payment Status", "Created At"]
+COMPLETED_COLUMNS = ["Booking ID", "Renter", "Owner", "Rental Item", "Payment", "Status", "Created At"]
+
+
+def _date_range():
+    """(start, end, error response) from the start_date/end_date query arguments"""
+    start = end = None
+    if request.args.get("start_date"):
+        start = validate_date(request.args["start_date"])
         if not start:
-            return jsonify({"error": "Invalid start_date format, must be YYYY-MM-DD"}), 400
-        filters.append(Booking.created_at >= start)
-    if end_date:
-        end = validate_date(end_date)
+            return None, None, (jsonify({"error": "Invalid start_date format, must be YYYY-MM-DD"}), 400)
+    if request.args.get("end_date"):
+        end = validate_date(request.args["end_date"])
         if not end:
-            return jsonify({"error": "Invalid end_date format, must be YYYY-MM-DD"}), 400
-        filters.append(Booking.created_at <= end)
+            return None, None, (jsonify({"error": "Invalid end_date format, must be YYYY-MM-DD"}), 400)
+    return start, end, None
 
-    # Role-based filtering
-    if request.current_user.role == "owner":
-        filters.append(Booking.owner_id == request.current_user.id)
-    elif request.current_user.role == "renter":
-        filters.append(Booking.renter_id == request.current_user.id)
-    # Admin can see all bookings
 
-    bookings = Booking.query.filter(*filters).all()
+def _role_scope():
+    """Owners see bookings of their items, renters their own bookings, admins everything"""
+    user = request.current_user
+    if user.role == "owner":
+        return {"owner_id": user.id}
+    if user.role in ("user", "renter"):
+        return {"renter_id": user.id}
+    return {}
 
-    total_payment = sum([float(b.payment_amount) for b in bookings])
-    total_service_fee = sum([float(b.service_fee) for b in bookings])
-    net_earnings = total_payment - total_service_fee if request.current_user.role != "renter" else total_payment
 
-    data = []
-    for b in bookings:
-        data.append({
-            "Booking ID": b.id,
-            "Renter": b.renter.username if b.renter else "Unknown",
-            "Owner": b.rental_item.owner.username if b.rental_item and b.rental_item.owner else "Unknown",
-            "Rental Item": f"Item #{b.rental_item.id}" if b.rental_item else "Unknown Item",
-            "Payment": float(b.payment_amount) if b.payment_amount else 0,
-            "Service Fee": float(b.service_fee) if b.service_fee else 0,
-            "Net Owner": float(float(b.payment_amount or 0) - float(b.service_fee or 0)),
-            "Payment Status": b.payment_status or "Unknown",
-            "Created At": b.created_at.strftime("%Y-%m-%d %H:%M:%S") if b.created_at else "Unknown"
-        })
+def _group_by_arg():
+    """(dimension or None, error response) from the optional group_by query argument"""
+    group_by = request.args.get("group_by")
+    if group_by and group_by not in DIMENSIONS:
+        return None, (jsonify({"error": f"group_by must be one of {', '.join(DIMENSIONS)}"}), 400)
+    return group_by or None, None
 
-    return jsonify({
-        "total_payment": total_payment,
-        "total_service_fee": total_service_fee,
-        "net_earnings": net_earnings,
-        "total": len(data),
-        "bookings": data
-    }), 200
 
+# ------------------- Earnings Summary -------------------
+def _ledger_accounts():
+    """{label: ledger account} of the money the caller can see; renters have no ledger accounts"""
+    user = request.current_user
+    if user.role == "owner":
+        return {"earned": ledger.owner_account(user.id), "held": ledger.held_account(user.id),
+                "refunded": ledger.refund_account(user.id)}
+    if user.role == "admin":
+        return {"service_fees": ledger.PLATFORM, "owner_payments": "owner", "held": "held", "refunded": "refunds"}
+    return {}
+
+
+def _ledger_summary(start, end):
+    """Money moved per account: running balances (a primary key lookup) when no date range is
+    given, otherwise the net ledger postings within the range"""
+    accounts = _ledger_accounts()
+    if not accounts:
+        return None
+    if start is None and end is None:
+        values = {account: balance for account, (balance, _) in ledger.balances(*accounts.values()).items()}
+    else:
+        values = ledger.flows(accounts.values(), start, end)
+    return {label: float(values[account]) for label, account in accounts.items()}
+
+
+def _earnings_query(filters):
+    """Newest-first (booking columns, renter username, owner username) rows for the earnings report"""
+    renter = db.aliased(User)
+    owner = db.aliased(User)
+    return db.session.query(
+        Booking.id, Booking.rental_item_id, Booking.payment_amount, Booking.service_fee,
+        Booking.payment_status, Booking.created_at, renter.username, owner.username
+    ).outerjoin(renter, Booking.renter_id == renter.id) \
+        .outerjoin(RentalItem, Booking.rental_item_id == RentalItem.id) \
+        .outerjoin(owner, RentalItem.owner_id == owner.id) \
+        .filter(*filters) \
+        .order_by(Booking.created_at.desc(), Booking.id.desc())
+
+
+def _earnings_rows(query):
+    """Report rows for the results of _earnings_query"""
+    for booking_id, rental_item_id, payment_amount, service_fee, payment_status, created_at, \
+            renter_username, owner_username in query:
+        yield {
+            "Booking ID": booking_id,
+            "Renter": renter_username or "Unknown",
+            "Owner": owner_username or "Unknown",
+            "Rental Item": f"Item #{rental_item_id}" if rental_item_id else "Unknown Item",
+            "Payment": float(payment_amount) if payment_amount else 0,
+            "Service Fee": float(service_fee) if service_fee else 0,
+            "Net Owner": float(float(payment_amount or 0) - float(service_fee or 0)),
+            "Payment Status": payment_status or "Unknown",
+            "Created At": created_at.strftime("%Y-%m-%d %H:%M:%S") if created_at else "Unknown"
+        }
 
-# ------------------- Completed Bookings -------------------
-@reports_bp.route("/completed-bookings", methods=["GET"])
+
+@reports_bp.route("/earnings", methods=["GET"])
 @jwt_required
-def completed_bookings():
+def earnings_summary():
+    """Totals for the caller's bookings (SUM/COUNT in the database), the latest bookings and an
+    optional ?group_by=status|payment_status|owner|category|day|week|month breakdown"""
+    start, end, error = _date_range()
+    if error:
+        return error
+    group_by, error = _group_by_arg()
+    if error:
+        return error
+
+    filters = booking_filters(start, end, **_role_scope())
+    totals = booking_totals(filters)
+    is_renter = "renter_id" in _role_scope()
+    net_earnings = totals["total_payment"] if is_renter else totals["total_payment"] - totals["total_service_fee"]
+
+    result = {
+        "total_payment": totals["total_payment"],
+        "total_service_fee": totals["total_service_fee"],
+        "net_earnings": round(net_earnings, 2),
+        "total": totals["count"],
+        # Latest bookings only; the full list is available from /reports/export
+        "bookings": list(_earnings_rows(_earnings_query(filters).limit(RECENT_BOOKINGS_LIMIT)))
+    }
+    ledger_summary = _ledger_summary(start, end)
+    if ledger_summary is not None:
+        result["ledger"] = ledger_summary
+    if group_by:
+        result["breakdown"] = booking_breakdown(group_by, filters)
+    return jsonify(result), 200
+
+
+# ------------------- Completed Bookings -------------------
+def _completed_bookings_query():
+    """Query of (booking, renter username, owner username, item id) rows for the completed
+    bookings report, or (None, error response) for invalid filters"""
     start_date = request.args.get("start_date")
     end_date = request.args.get("end_date")
 
@@ -119,121 +203,138 @@ def completed_bookings():
     if start_date:
         start = validate_date(start_date)
         if not start:
-            return jsonify({"error": "Invalid start_date format"}), 400
+            return None, (jsonify({"error": "Invalid start_date format"}), 400)
         filters.append(Booking.created_at >= start)
     if end_date:
         end = validate_date(end_date)
         if not end:
-            return jsonify({"error": "Invalid end_date format"}), 400
+            return None, (jsonify({"error": "Invalid end_date format"}), 400)
         filters.append(Booking.created_at <= end)
 
     if request.current_user.role == "owner":
         # Owner can only see bookings for their rental items
-        from app.models.RentalItem import RentalItem
-        owner_rental_items = RentalItem.query.filter_by(owner_id=request.current_user.id).all()
-        rental_item_ids = [item.id for item in owner_rental_items]
-        filters.append(Booking.rental_item_id.in_(rental_item_ids))
-    elif request.current_user.role == "renter":
+        filters.append(RentalItem.owner_id == request.current_user.id)
+    elif request.current_user.role in ("user", "renter"):
         filters.append(Booking.renter_id == request.current_user.id)
 
-    bookings = Booking.query.filter(*filters).all()
-
-    result = []
-    for b in bookings:
-        result.append({
+    renter = db.aliased(User)
+    owner = db.aliased(User)
+    query = db.session.query(Booking, renter.username, owner.username, RentalItem.id) \
+        .outerjoin(renter, Booking.renter_id == renter.id) \
+        .outerjoin(RentalItem, Booking.rental_item_id == RentalItem.id) \
+        .outerjoin(owner, RentalItem.owner_id == owner.id) \
+        .filter(*filters) \
+        .order_by(Booking.id)
+    return query, None
+
+
+def _completed_booking_rows(query):
+    """Report rows for the results of _completed_bookings_query"""
+    for b, renter_username, owner_username, rental_item_id in query:
+        yield {
             "Booking ID": b.id,
-            "Renter": b.renter.username if b.renter else "Unknown",
-            "Owner": b.rental_item.owner.username if b.rental_item and b.rental_item.owner else "Unknown",
-            "Rental Item": f"Item #{b.rental_item.id}" if b.rental_item else "Unknown Item",
+            "Renter": renter_username or "Unknown",
+            "Owner": owner_username or "Unknown",
+            "Rental Item": f"Item #{rental_item_id}" if rental_item_id else "Unknown Item",
             "Payment": float(b.payment_amount) if b.payment_amount else 0,
             "Status": b.status or "Unknown",
             "Created At": b.created_at.strftime("%Y-%m-%d %H:%M:%S") if b.created_at else "Unknown"
-        })
+        }
 
-    return jsonify({
-        "total": len(result),
-        "completed_bookings": result
-    }), 200
+
+@reports_bp.route("/completed-bookings", methods=["GET"])
+@jwt_required
+def completed_bookings():
+    query, error = _completed_bookings_query()
+    if error:
+        return error
+
+    # Streamed so memory stays flat however many bookings match
+    return stream_json(
+        "completed_bookings",
+        _completed_booking_rows(stream_rows(query)),
+        trailer=lambda count: {"total": count}
+    )
 
 
 # ------------------- Export Reports -------------------
 @reports_bp.route("/export", methods=["GET"])
 @jwt_required
 def export_report():
+    """Earnings or completed bookings as PDF, or streamed as CSV (or XLSX, for admins) straight
+    from a batched query"""
     report_type = request.args.get("type", "earnings")  # earnings or completed
-    format_type = request.args.get("format", "pdf")  # pdf or csv
+    format_type = request.args.get("format", "pdf")  # pdf, csv or xlsx
 
     if report_type not in ["earnings", "completed"]:
         return jsonify({"error": "Invalid report type"}), 400
-    if format_type not in ["pdf", "csv"]:
+    if format_type not in EXPORT_FORMATS:
         return jsonify({"error": "Invalid format"}), 400
+    if format_type == "xlsx" and request.current_user.role != "admin":
+        return jsonify({"error": "Spreadsheet exports are available to admins only"}), 403
 
-    # Reuse previous endpoints logic
-    if report_type == "earnings":
-        response = earnings_summary()
-    else:
-        response = completed_bookings()
-
-    data = response.get_json()
     if report_type == "earnings":
-        data_rows = data.get("bookings", [])
+        start, end, error = _date_range()
+        if error:
+            return error
+        filters = booking_filters(start, end, **_role_scope())
+        rows = _earnings_rows(stream_rows(_earnings_query(filters)))
+        columns = EARNINGS_COLUMNS
         title = "Earnings Report"
     else:
-        data_rows = data.get("completed_bookings", [])
+        query, error = _completed_bookings_query()
+        if error:
+            return error
+        rows = _completed_booking_rows(stream_rows(query))
+        columns = COMPLETED_COLUMNS
         title = "Completed Bookings Report"
 
-    if format_type == "pdf":
-        buffer = generate_pdf_report(data_rows, title=title)
-        return send_file(buffer, mimetype="application/pdf", as_attachment=True, download_name=f"{title}.pdf")
-    else:
-        buffer = generate_csv_report(data_rows)
-        return send_file(buffer, mimetype="text/csv", as_attachment=True, download_name=f"{title}.csv")
+    return export_response(format_type, title, columns, rows)
 
 # ------------------- Admin Reports -------------------
 
-@reports_bp.route("/admin/system-overview", methods=["GET"])
-@jwt_required
-@admin_required
-def admin_system_overview():
-
-    # Get system statistics
-    total_users = User.query.count()
-    total_owners = User.query.filter_by(role="owner").count()
-    total_renters = User.query.filter_by(role="renter").count()
-    total_bookings = Booking.query.count()
-    total_rental_items = RentalItem.query.count()
-    
-    # Get recent activity
-    recent_bookings = Booking.query.order_by(Booking.created_at.desc()).limit(10).all()
+def _system_overview():
+    """System statistics, each computed with a COUNT/SUM in the database"""
+    users_by_role = count_by(User.role)
+    totals = booking_totals()
+
+    renter = db.aliased(User)
+    owner = db.aliased(User)
+    recent_bookings = db.session.query(
+        Booking.id, Booking.payment_amount, Booking.status, Booking.created_at,
+        renter.username, owner.username, Category.name
+    ).outerjoin(renter, Booking.renter_id == renter.id) \
+        .outerjoin(RentalItem, Booking.rental_item_id == RentalItem.id) \
+        .outerjoin(owner, RentalItem.owner_id == owner.id) \
+        .outerjoin(Category, RentalItem.category_id == Category.id) \
+        .order_by(Booking.created_at.desc(), Booking.id.desc()) \
+        .limit(RECENT_BOOKINGS_LIMIT).all()
     recent_users = User.query.order_by(User.id.desc()).limit(10).all()
-    
-    # Calculate revenue
-    total_revenue = sum([float(b.payment_amount) for b in Booking.query.all()])
-    total_service_fees = sum([float(b.service_fee) for b in Booking.query.all()])
-    platform_revenue = total_service_fees
 
-    return jsonify({
+    total_users = sum(users_by_role.values())
+    return {
         "total": total_users,
         "system_stats": {
             "total_users": total_users,
-            "total_owners": total_owners,
-            "total_renters": total_renters,
-            "total_bookings": total_bookings,
-            "total_rental_items": total_rental_items,
-            "total_revenue": total_revenue,
-            "total_service_fees": total_service_fees,
-            "platform_revenue": platform_revenue
+            "total_owners": users_by_role.get("owner", 0),
+            "total_renters": users_by_role.get("user", 0) + users_by_role.get("renter", 0),
+            "total_bookings": totals["count"],
+            "total_rental_items": db.session.scalar(db.select(db.func.count(RentalItem.id))),
+            "total_revenue": totals["total_payment"],
+            "total_service_fees": totals["total_service_fee"],
+            "platform_revenue": totals["total_service_fee"]
         },
         "recent_bookings": [
             {
-                "id": b.id,
-                "renter": b.renter.username if b.renter else "Unknown",
-                "owner": b.rental_item.owner.username if b.rental_item and b.rental_item.owner else "Unknown",
-                "rental_item": b.rental_item.category.name if b.rental_item and b.rental_item.category else "Unknown Item",
-                "amount": float(b.payment_amount) if b.payment_amount else 0,
-                "status": b.status,
-                "created_at": b.created_at.strftime("%Y-%m-%d %H:%M:%S") if b.created_at else "Unknown"
-            } for b in recent_bookings
+                "id": booking_id,
+                "renter": renter_username or "Unknown",
+                "owner": owner_username or "Unknown",
+                "rental_item": category_name or "Unknown Item",
+                "amount": float(payment_amount) if payment_amount else 0,
+                "status": status,
+                "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S") if created_at else "Unknown"
+            } for booking_id, payment_amount, status, created_at, renter_username, owner_username, category_name
+            in recent_bookings
         ],
         "recent_users": [
             {
@@ -245,27 +346,33 @@ def admin_system_overview():
                 "created_at": u.created_at.strftime("%Y-%m-%d %H:%M:%S") if u.created_at else "Unknown"
             } for u in recent_users
         ]
-    }), 200
+    }
+
+
+@reports_bp.route("/admin/system-overview", methods=["GET"])
+@jwt_required
+@admin_required
+def admin_system_overview():
+    return jsonify(_system_overview()), 200
 
 @reports_bp.route("/admin/user-analytics", methods=["GET"])
 @jwt_required
 @admin_required
 def admin_user_analytics():
 
-    # Get user statistics by role
-    users_by_role = db.session.query(User.role, db.func.count(User.id)).group_by(User.role).all()
-    
-    # Get active vs inactive users
-    active_users = User.query.filter_by(is_active=True).count()
-    inactive_users = User.query.filter_by(is_active=False).count()
-    
-    # Get restricted users
-    restricted_users = User.query.filter_by(is_restricted=True).count()
+    # Users by role, and active/inactive/restricted counts in a single pass
+    users_by_role = count_by(User.role)
+    status = db.session.execute(db.select(
+        db.func.sum(db.case((User.is_active.is_(True), 1), else_=0)),
+        db.func.sum(db.case((User.is_active.is_(False), 1), else_=0)),
+        db.func.sum(db.case((User.is_restricted.is_(True), 1), else_=0))
+    )).one()
+    active_users, inactive_users, restricted_users = (int(value or 0) for value in status)
 
-    total_users = sum(dict(users_by_role).values())
+    total_users = sum(users_by_role.values())
     return jsonify({
         "total": total_users,
-        "users_by_role": dict(users_by_role),
+        "users_by_role": users_by_role,
         "user_status": {
             "active": active_users,
             "inactive": inactive_users,
@@ -277,31 +384,31 @@ def admin_user_analytics():
 @jwt_required
 @admin_required
 def admin_booking_analytics():
-
-    # Get booking statistics by status
-    bookings_by_status = db.session.query(Booking.status, db.func.count(Booking.id)).group_by(Booking.status).all()
-    
-    # Get payment statistics by status
-    payments_by_status = db.session.query(Booking.payment_status, db.func.count(Booking.id)).group_by(Booking.payment_status).all()
-    
-    # Get monthly booking trends
-    monthly_bookings = db.session.query(
-        db.func.date_format(Booking.created_at, '%Y-%m').label('month'),
-        db.func.count(Booking.id)
-    ).group_by('month').order_by('month').all()
-
-    total_bookings = sum(dict(bookings_by_status).values())
-    return jsonify({
-        "total": total_bookings,
-        "bookings_by_status": dict(bookings_by_status),
-        "payments_by_status": dict(payments_by_status),
+    """Bookings by status, payment status and month, plus an optional ?group_by breakdown"""
+    start, end, error = _date_range()
+    if error:
+        return error
+    group_by, error = _group_by_arg()
+    if error:
+        return error
+    filters = booking_filters(start, end)
+
+    bookings_by_status = count_by(Booking.status, filters)
+    result = {
+        "total": sum(bookings_by_status.values()),
+        "bookings_by_status": bookings_by_status,
+        "payments_by_status": count_by(Booking.payment_status, filters),
         "monthly_trends": [
             {
-                "month": month,
-                "count": count
-            } for month, count in monthly_bookings
+                "month": row["key"],
+                "count": row["count"],
+                "total_payment": row["total_payment"]
+            } for row in booking_breakdown("month", filters)
         ]
-    }), 200
+    }
+    if group_by:
+        result["breakdown"] = booking_breakdown(group_by, filters)
+    return jsonify(result), 200
 
 @reports_bp.route("/admin/export-system-report", methods=["GET"])
 @jwt_required
@@ -310,12 +417,11 @@ def admin_export_system_report():
 
     format_type = request.args.get("format", "pdf")
     
-    if format_type not in ["pdf", "csv"]:
+    if format_type not in EXPORT_FORMATS:
         return jsonify({"error": "Invalid format"}), 400
 
     # Get system overview data
-    response = admin_system_overview()
-    data = response.get_json()
+    data = _system_overview()
     
     # Prepare data for export
     export_data = []
@@ -349,10 +455,5 @@ def admin_export_system_report():
         })
 
     title = "System Overview Report"
-    
-    if format_type == "pdf":
-        buffer = generate_pdf_report(export_data, title=title)
-        return send_file(buffer, mimetype="application/pdf", as_attachment=True, download_name=f"{title}.pdf")
-    else:
-        buffer = generate_csv_report(export_data)
-        return send_file(buffer, mimetype="text/csv", as_attachment=True, download_name=f"{title}.csv")
+    # Stats, bookings and users share one table; each row fills the columns it has
+    return export_response(format_type, title, _export_columns(export_data), export_data)
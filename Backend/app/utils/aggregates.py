@@ -0,0 +1,127 @@
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.RentalItem import RentalItem
+from app.models.category import Category
+from app.models.user import User
+
+PERIODS = ("day", "week", "month")
+DIMENSIONS = ("status", "payment_status", "owner", "category") + PERIODS
+
+# Period keys per dialect: "2025-03-14", "2025-W11", "2025-03" (weeks are ISO weeks on MySQL)
+_PERIOD_FORMATS = {
+    "mysql": {"day": "%Y-%m-%d", "week": "%x-W%v", "month": "%Y-%m"},
+    "sqlite": {"day": "%Y-%m-%d", "week": "%Y-W%W", "month": "%Y-%m"},
+    "postgresql": {"day": "YYYY-MM-DD", "week": 'IYYY-"W"IW', "month": "YYYY-MM"},
+}
+
+
+class AggregateError(ValueError):
+    """Raised for an unknown grouping dimension"""
+
+
+# ------------------- Filters -------------------
+def booking_filters(start=None, end=None, owner_id=None, renter_id=None, statuses=None):
+    """WHERE clauses on bookings for the usual report scopes.
+
+    The owner scope is a subquery on rental_items, so callers never need to join for it.
+    """
+    filters = []
+    if start is not None:
+        filters.append(Booking.created_at >= start)
+    if end is not None:
+        filters.append(Booking.created_at <= end)
+    if owner_id is not None:
+        filters.append(Booking.rental_item_id.in_(db.select(RentalItem.id).where(RentalItem.owner_id == owner_id)))
+    if renter_id is not None:
+        filters.append(Booking.renter_id == renter_id)
+    if statuses:
+        filters.append(Booking.status.in_(statuses))
+    return filters
+
+
+# ------------------- Aggregates -------------------
+def _money(value):
+    return round(float(value or 0), 2)
+
+
+def _measures():
+    return (
+        db.func.count(Booking.id).label("booking_count"),
+        db.func.sum(Booking.payment_amount).label("total_payment"),
+        db.func.sum(Booking.service_fee).label("total_service_fee"),
+    )
+
+
+def booking_totals(filters=()):
+    """{"count", "total_payment", "total_service_fee"} over the matching bookings, in one query"""
+    row = db.session.execute(db.select(*_measures()).where(*filters)).one()
+    return {"count": row.booking_count, "total_payment": _money(row.total_payment),
+            "total_service_fee": _money(row.total_service_fee)}
+
+
+def period_expression(column, period):
+    """SQL expression bucketing a datetime column by day, week or month, as a sortable string"""
+    if period not in PERIODS:
+        raise AggregateError(f"Unknown period {period!r}, expected one of {', '.join(PERIODS)}")
+    dialect = db.session.get_bind().dialect.name
+    formats = _PERIOD_FORMATS.get(dialect, _PERIOD_FORMATS["mysql"])
+    if dialect == "sqlite":
+        return db.func.strftime(formats[period], column)
+    if dialect == "postgresql":
+        return db.func.to_char(column, formats[period])
+    return db.func.date_format(column, formats[period])
+
+
+def booking_breakdown(dimension, filters=(), limit=None):
+    """Booking count and sums grouped by dimension (see DIMENSIONS), computed by the database.
+
+    Returns [{"key", "label", "count", "total_payment", "total_service_fee"}]: periods in
+    chronological order, everything else largest first.
+    """
+    if dimension in ("status", "payment_status"):
+        key = getattr(Booking, dimension)
+        statement = db.select(key.label("group_key"), key.label("group_label"), *_measures()).group_by(key)
+    elif dimension == "owner":
+        owner = db.aliased(User)
+        statement = db.select(RentalItem.owner_id.label("group_key"), owner.username.label("group_label"),
+                              *_measures()) \
+            .select_from(Booking) \
+            .join(RentalItem, Booking.rental_item_id == RentalItem.id) \
+            .outerjoin(owner, RentalItem.owner_id == owner.id) \
+            .group_by(RentalItem.owner_id, owner.username)
+    elif dimension == "category":
+        statement = db.select(Category.id.label("group_key"), Category.name.label("group_label"), *_measures()) \
+            .select_from(Booking) \
+            .join(RentalItem, Booking.rental_item_id == RentalItem.id) \
+            .outerjoin(Category, RentalItem.category_id == Category.id) \
+            .group_by(Category.id, Category.name)
+    elif dimension in PERIODS:
+        period = period_expression(Booking.created_at, dimension)
+        statement = db.select(period.label("group_key"), period.label("group_label"), *_measures()).group_by(period)
+    else:
+        raise AggregateError(f"Unknown grouping {dimension!r}, expected one of {', '.join(DIMENSIONS)}")
+
+    statement = statement.where(*filters)
+    if dimension in PERIODS:
+        statement = statement.order_by("group_key")
+    else:
+        statement = statement.order_by(db.desc("booking_count"), "group_key")
+    if limit:
+        statement = statement.limit(limit)
+
+    return [
+        {
+            "key": row.group_key,
+            "label": row.group_label if row.group_label is not None else "Unknown",
+            "count": row.booking_count,
+            "total_payment": _money(row.total_payment),
+            "total_service_fee": _money(row.total_service_fee),
+        }
+        for row in db.session.execute(statement)
+    ]
+
+
+def count_by(column, filters=()):
+    """{value: row count} for one column, e.g. count_by(User.role)"""
+    statement = db.select(column, db.func.count()).where(*filters).group_by(column)
+    return {value: count for value, count in db.session.execute(statement)}
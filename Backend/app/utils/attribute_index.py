@@ -0,0 +1,302 @@
+import json
+import re
+from datetime import date
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, attributes
+from app.extensions import db
+from app.models.RentalItem import RentalItem
+from app.models.category_requirement import CategoryRequirement
+from app.models.item_attribute import ItemAttribute
+
+NON_INDEXED_FIELD_TYPES = {"file", "image"}
+MAX_TEXT_LENGTH = 255
+MAX_FACET_VALUES = 20
+NUMBER_FACET_BUCKETS = 5
+
+_NUMBER_RE = re.compile(r"^-?\d+(\.\d+)?$")
+_FILTER_ARG_RE = re.compile(r"^attr_(\d+)(?:_(min|max))?$")
+_listeners_registered = False
+
+_items = RentalItem.__table__
+_requirements = CategoryRequirement.__table__
+_attributes = ItemAttribute.__table__
+
+
+# ------------------- Value Extraction -------------------
+def parse_number(value):
+    """Parse numbers like 1200, "1,200" or "$ 1200.50"; None if not numeric"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        cleaned = value.strip().replace(",", "").lstrip("$").strip()
+        if _NUMBER_RE.match(cleaned):
+            return float(cleaned)
+    return None
+
+
+def parse_date(value):
+    """Parse an ISO date (optionally with a time part); None if not a date"""
+    if not isinstance(value, str) or len(value) < 10:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def extract_attribute_rows(item_id, category_id, dynamic_data, requirements):
+    """Typed attribute rows for one item. requirements: iterable of (id, name, field_type)."""
+    rows = []
+    for requirement_id, name, field_type in requirements:
+        if field_type in NON_INDEXED_FIELD_TYPES or name not in dynamic_data:
+            continue
+        values = dynamic_data[name]
+        if not isinstance(values, list):
+            values = [values]
+        for value in values:
+            if value is None or isinstance(value, (dict, list)) or value == "":
+                continue
+            row = {
+                "rental_item_id": item_id,
+                "category_id": category_id,
+                "requirement_id": requirement_id,
+                "value_text": None,
+                "value_number": parse_number(value),
+                "value_date": None
+            }
+            if field_type == "date":
+                row["value_date"] = parse_date(value)
+            if field_type != "number":
+                row["value_text"] = str(value).strip()[:MAX_TEXT_LENGTH]
+            if row["value_text"] is None and row["value_number"] is None and row["value_date"] is None:
+                continue
+            rows.append(row)
+    return rows
+
+
+# ------------------- Index Maintenance -------------------
+def _load_dynamic_data(raw):
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _requirements_by_category(connection, category_ids):
+    result = {category_id: [] for category_id in category_ids}
+    if not category_ids:
+        return result
+    rows = connection.execute(
+        select(_requirements.c.id, _requirements.c.category_id, _requirements.c.name, _requirements.c.field_type)
+        .where(_requirements.c.category_id.in_(list(category_ids)))
+    )
+    for requirement_id, category_id, name, field_type in rows:
+        result[category_id].append((requirement_id, name, field_type))
+    return result
+
+
+def reindex_item_rows(connection, item_rows):
+    """Replace the attributes of items given as (id, category_id, dynamic_data JSON) tuples"""
+    item_rows = [row for row in item_rows if row[0] is not None]
+    if not item_rows:
+        return
+    connection.execute(_attributes.delete().where(_attributes.c.rental_item_id.in_([row[0] for row in item_rows])))
+    requirements = _requirements_by_category(connection, {row[1] for row in item_rows})
+    values = []
+    for item_id, category_id, raw_data in item_rows:
+        values.extend(extract_attribute_rows(item_id, category_id, _load_dynamic_data(raw_data), requirements[category_id]))
+    if values:
+        connection.execute(_attributes.insert(), values)
+
+
+def reindex_categories(connection, category_ids, batch_size=500):
+    """Re-extract attributes of every item in the given categories, in id-ordered batches"""
+    if not category_ids:
+        return
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(_items.c.id, _items.c.category_id, _items.c.dynamic_data)
+            .where(_items.c.category_id.in_(list(category_ids)), _items.c.id > last_id)
+            .order_by(_items.c.id)
+            .limit(batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        reindex_item_rows(connection, rows)
+        last_id = rows[-1][0]
+
+
+def rebuild_index(batch_size=500):
+    """Rebuild item_attributes for every rental item. Returns the number of items processed."""
+    connection = db.session.connection()
+    connection.execute(_attributes.delete())
+    category_ids = [row[0] for row in connection.execute(select(_items.c.category_id).distinct())]
+    reindex_categories(connection, category_ids, batch_size)
+    db.session.commit()
+    return db.session.query(RentalItem.id).count()
+
+
+def _before_flush(session, flush_context, instances):
+    connection = None
+    for obj in session.deleted:
+        # Attribute rows must go before the rows they point at
+        if isinstance(obj, RentalItem) and obj.id is not None:
+            connection = connection or session.connection()
+            connection.execute(_attributes.delete().where(_attributes.c.rental_item_id == obj.id))
+        elif isinstance(obj, CategoryRequirement) and obj.id is not None:
+            connection = connection or session.connection()
+            connection.execute(_attributes.delete().where(_attributes.c.requirement_id == obj.id))
+
+
+def _after_flush(session, flush_context):
+    changed_items = []
+    changed_categories = set()
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, RentalItem):
+            if obj in session.new or any(
+                attributes.get_history(obj, key).has_changes() for key in ("dynamic_data", "category_id")
+            ):
+                changed_items.append((obj.id, obj.category_id, obj.dynamic_data))
+        elif isinstance(obj, CategoryRequirement):
+            # A new, renamed or retyped field changes what existing items answer
+            if obj in session.new or any(
+                attributes.get_history(obj, key).has_changes() for key in ("name", "field_type")
+            ):
+                changed_categories.add(obj.category_id)
+    if changed_categories:
+        reindex_categories(session.connection(), changed_categories)
+    changed_items = [row for row in changed_items if row[1] not in changed_categories]
+    if changed_items:
+        reindex_item_rows(session.connection(), changed_items)
+
+
+def register_attribute_index_listeners():
+    """Keep item_attributes in sync with RentalItem and CategoryRequirement writes"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, "before_flush", _before_flush)
+    event.listen(Session, "after_flush", _after_flush)
+    _listeners_registered = True
+
+
+# ------------------- Filtering -------------------
+def parse_attribute_filters(args):
+    """Parse attr_<requirement_id>=value, attr_<requirement_id>_min=n and attr_<requirement_id>_max=n.
+
+    Returns {requirement_id: {"values": [...], "min": float, "max": float}}.
+    Raises ValueError for non-numeric range bounds.
+    """
+    filters = {}
+    for key in args.keys():
+        match = _FILTER_ARG_RE.match(key)
+        if not match:
+            continue
+        requirement_id = int(match.group(1))
+        bound = match.group(2)
+        entry = filters.setdefault(requirement_id, {"values": [], "min": None, "max": None})
+        if bound:
+            number = parse_number(args.get(key))
+            if number is None:
+                raise ValueError(f"'{key}' must be a number")
+            entry[bound] = number
+        else:
+            entry["values"].extend(value for value in args.getlist(key) if value != "")
+    return filters
+
+
+def _attribute_match(requirement_id, entry):
+    conditions = [ItemAttribute.requirement_id == requirement_id]
+    if entry["values"]:
+        conditions.append(ItemAttribute.value_text.in_(entry["values"]))
+    if entry["min"] is not None:
+        conditions.append(ItemAttribute.value_number >= entry["min"])
+    if entry["max"] is not None:
+        conditions.append(ItemAttribute.value_number <= entry["max"])
+    return db.session.query(ItemAttribute.rental_item_id).filter(*conditions)
+
+
+def apply_attribute_filters(query, filters, exclude_requirement_id=None):
+    """Restrict a RentalItem query to items matching every attribute filter"""
+    for requirement_id, entry in filters.items():
+        if requirement_id == exclude_requirement_id:
+            continue
+        query = query.filter(RentalItem.id.in_(_attribute_match(requirement_id, entry)))
+    return query
+
+
+# ------------------- Facets -------------------
+def _nice_bucket_width(span, buckets):
+    """Round span / buckets up to 1, 2 or 5 times a power of ten"""
+    raw = span / buckets
+    magnitude = 10 ** (len(str(int(raw))) - 1) if raw >= 1 else 1
+    for step in (1, 2, 5, 10):
+        if raw <= step * magnitude:
+            return float(step * magnitude)
+    return float(10 * magnitude)
+
+
+def text_facet(item_ids, requirement_id):
+    """Counts per distinct value for items selected by item_ids (a select of ids)"""
+    count = db.func.count(db.distinct(ItemAttribute.rental_item_id))
+    rows = db.session.query(ItemAttribute.value_text, count) \
+        .filter(ItemAttribute.requirement_id == requirement_id,
+                ItemAttribute.value_text.isnot(None),
+                ItemAttribute.rental_item_id.in_(item_ids)) \
+        .group_by(ItemAttribute.value_text) \
+        .order_by(count.desc(), ItemAttribute.value_text) \
+        .limit(MAX_FACET_VALUES) \
+        .all()
+    return [{"value": value, "count": total} for value, total in rows]
+
+
+def number_facet(item_ids, requirement_id):
+    """Min/max plus counts per equal-width bucket for a numeric field"""
+    base_filter = (
+        ItemAttribute.requirement_id == requirement_id,
+        ItemAttribute.value_number.isnot(None),
+        ItemAttribute.rental_item_id.in_(item_ids)
+    )
+    minimum, maximum = db.session.query(
+        db.func.min(ItemAttribute.value_number), db.func.max(ItemAttribute.value_number)
+    ).filter(*base_filter).one()
+    if minimum is None:
+        return {"min": None, "max": None, "buckets": []}
+
+    width = _nice_bucket_width(maximum - minimum, NUMBER_FACET_BUCKETS) if maximum > minimum else 1.0
+    start = (minimum // width) * width
+    # Values are >= start, so integer truncation behaves like floor on every backend
+    bucket = db.cast((ItemAttribute.value_number - start) / width, db.Integer).label("bucket")
+    rows = db.session.query(bucket, db.func.count(db.distinct(ItemAttribute.rental_item_id))) \
+        .filter(*base_filter) \
+        .group_by(bucket) \
+        .order_by(bucket) \
+        .all()
+    return {
+        "min": minimum,
+        "max": maximum,
+        "buckets": [
+            {"from": start + index * width, "to": start + (index + 1) * width, "count": total}
+            for index, total in rows
+        ]
+    }
+
+
+def date_facet(item_ids, requirement_id):
+    """Earliest and latest date for a date field"""
+    minimum, maximum = db.session.query(
+        db.func.min(ItemAttribute.value_date), db.func.max(ItemAttribute.value_date)
+    ).filter(
+        ItemAttribute.requirement_id == requirement_id,
+        ItemAttribute.rental_item_id.in_(item_ids)
+    ).one()
+    return {
+        "min": minimum.isoformat() if minimum else None,
+        "max": maximum.isoformat() if maximum else None
+    }
@@ -0,0 +1,248 @@
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+from app.extensions import db
+from app.models.user import User
+from app.models.user_restriction import UserRestriction
+from app.utils.log import get_logger
+
+log = get_logger("auth_cache")
+
+# Changes to these fields revoke every token issued before them
+REVOKING_USER_FIELDS = ("role", "is_active", "is_restricted", "password")
+REVOKING_RESTRICTION_FIELDS = ("restricted", "blocked_until")
+
+# User ids whose cached principals must be dropped once the transaction commits
+_PENDING_USERS_KEY = "auth_cache_users"
+
+
+class UserPrincipal:
+    """Detached snapshot of the user fields request handlers read from request.current_user"""
+    __slots__ = ("id", "username", "email", "full_name", "role", "is_active", "is_restricted", "auth_version")
+
+    def __init__(self, user):
+        self.id = user.id
+        self.username = user.username
+        self.email = user.email
+        self.full_name = user.full_name
+        self.role = user.role
+        self.is_active = user.is_active
+        self.is_restricted = user.is_restricted
+        self.auth_version = user.auth_version or 0
+
+    def __repr__(self):
+        return f"<User {self.username}>"
+
+
+class PrincipalCache:
+    """Per-worker TTL + LRU cache of UserPrincipal objects keyed by user id.
+
+    Commits in this worker that touch a user drop its entry immediately. Entries are
+    checked against the version store on every hit (see load_principal), so other
+    workers see revocations at once; the TTL only bounds staleness of fields such as
+    the username or email that do not revoke tokens.
+    """
+
+    def __init__(self, max_entries=4096, ttl=30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # user_id -> (expires_at, principal, stamp)
+        self._lock = threading.Lock()
+        self._epoch = 0  # Bumped on every invalidation, guards against storing stale principals
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "stale": 0}
+
+    @property
+    def epoch(self):
+        return self._epoch
+
+    def get(self, user_id):
+        """(principal, stamp) of an unexpired entry, or None"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                return entry[1:]
+            if entry:
+                del self._entries[user_id]
+            return None
+
+    def count(self, result):
+        with self._lock:
+            self.stats[result] += 1
+
+    def set(self, user_id, principal, epoch, stamp=None):
+        with self._lock:
+            if epoch != self._epoch:
+                # A user changed while this one was loaded
+                return
+            self._entries[user_id] = (time.monotonic() + self.ttl, principal, stamp)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, user_ids):
+        with self._lock:
+            self._epoch += 1
+            for user_id in user_ids:
+                if self._entries.pop(user_id, None):
+                    self.stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
+
+
+# ------------------- Version Stores -------------------
+# A cached principal is only used after the store confirms the user has not changed since
+# it was loaded, so revocations made in any worker apply to the next request everywhere.
+
+class DatabaseVersionStore:
+    """Compares the cached auth_version with users.auth_version: a single-column primary key
+    lookup per request instead of loading the whole user"""
+
+    def stamp(self, user_id):
+        return None
+
+    def is_current(self, user_id, principal, stamp):
+        version = db.session.query(User.auth_version).filter(User.id == user_id).scalar()
+        # Deleted users have no row; deactivation and restriction bump auth_version
+        return version is not None and version == principal.auth_version
+
+    def publish(self, user_ids):
+        pass
+
+
+class RedisVersionStore:
+    """Per-user change counters in Redis, bumped after every commit that touches the user, so
+    cache hits skip the database entirely (needs the redis package)"""
+
+    def __init__(self, url):
+        import redis  # Optional dependency, only needed when AUTH_VERSION_STORAGE_URL is redis://
+        self._client = redis.Redis.from_url(url, socket_timeout=0.25)
+        self._fallback = DatabaseVersionStore()
+
+    @staticmethod
+    def _key(user_id):
+        return f"authver:{user_id}"
+
+    def stamp(self, user_id):
+        # Read before the user is loaded: a change committed in between bumps the counter
+        # past this stamp, so the entry is refreshed on its next use
+        try:
+            return self._client.get(self._key(user_id)) or b"0"
+        except Exception as e:
+            log.warning("Auth version store unavailable: %s", e)
+            return None
+
+    def is_current(self, user_id, principal, stamp):
+        try:
+            return stamp is not None and (self._client.get(self._key(user_id)) or b"0") == stamp
+        except Exception as e:
+            # Fail closed onto the database rather than trusting a possibly revoked principal
+            log.warning("Auth version store unavailable, checking the database: %s", e)
+            return self._fallback.is_current(user_id, principal, stamp)
+
+    def publish(self, user_ids):
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            for user_id in user_ids:
+                pipeline.incr(self._key(user_id))
+            pipeline.execute()
+        except Exception as e:
+            log.warning("Could not publish auth changes for users %s: %s", sorted(user_ids), e)
+
+
+def create_version_store(url):
+    """Store for AUTH_VERSION_STORAGE_URL: None (default) reads the database, "redis://host:port/db" uses Redis"""
+    if url and url.startswith(("redis://", "rediss://")):
+        try:
+            return RedisVersionStore(url)
+        except ImportError:
+            log.warning("AUTH_VERSION_STORAGE_URL is %s but redis is not installed; checking the database", url)
+    return DatabaseVersionStore()
+
+
+version_store = DatabaseVersionStore()
+
+
+def load_principal(user_id):
+    """UserPrincipal for user_id from the cache, falling back to the database; None if missing"""
+    entry = principal_cache.get(user_id)
+    if entry is not None:
+        principal, stamp = entry
+        if version_store.is_current(user_id, principal, stamp):
+            principal_cache.count("hits")
+            return principal
+        principal_cache.count("stale")
+    principal_cache.count("misses")
+    epoch = principal_cache.epoch
+    stamp = version_store.stamp(user_id)
+    user = db.session.get(User, user_id)
+    if user is None:
+        return None
+    principal = UserPrincipal(user)
+    principal_cache.set(user_id, principal, epoch, stamp)
+    return principal
+
+
+# ------------------- Version Bumps -------------------
+def _changed(obj, keys):
+    return any(attributes.get_history(obj, key).has_changes() for key in keys)
+
+
+def _bump(user):
+    # SQL expression so concurrent bumps both count
+    user.auth_version = User.auth_version + 1
+
+
+def _before_flush(session, flush_context, instances):
+    bumped = set()
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, User) and obj in session.dirty and _changed(obj, REVOKING_USER_FIELDS):
+            if obj.id not in bumped:
+                _bump(obj)
+                bumped.add(obj.id)
+        elif isinstance(obj, UserRestriction) and obj.user_id is not None:
+            if (obj in session.new and obj.restricted) or (obj in session.dirty and _changed(obj, REVOKING_RESTRICTION_FIELDS)):
+                user = session.get(User, obj.user_id)
+                if user is not None and user.id not in bumped:
+                    _bump(user)
+                    bumped.add(user.id)
+
+
+def _after_flush(session, flush_context):
+    user_ids = session.info.setdefault(_PENDING_USERS_KEY, set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            user_ids.add(obj.id)
+
+
+def _after_commit(session):
+    user_ids = session.info.pop(_PENDING_USERS_KEY, None)
+    if user_ids:
+        principal_cache.invalidate(user_ids)
+        version_store.publish(user_ids)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_USERS_KEY, None)
+
+
+def init_auth_cache(app):
+    """Configure the principal cache and bump auth_version on security-relevant user changes"""
+    global version_store
+    version_store = create_version_store(app.config.get("AUTH_VERSION_STORAGE_URL"))
+    principal_cache.ttl = app.config.get("AUTH_CACHE_TTL", 30)
+    principal_cache.max_entries = app.config.get("AUTH_CACHE_MAX_ENTRIES", 4096)
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
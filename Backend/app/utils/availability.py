@@ -0,0 +1,59 @@
+from app.extensions import db
+from app.models.RentalItem import RentalItem
+from app.models.booking import Booking
+
+# Bookings in these states reserve an item for catalog browsing purposes
+BLOCKING_PAYMENT_STATUSES = ["PENDING", "HELD", "COMPLETED"]
+BLOCKING_BOOKING_STATUSES = ["Requirements_Submitted", "Payment_Held", "Confirmed", "Active"]
+
+# Bookings in these payment states block a new booking from being submitted
+COMMITTED_PAYMENT_STATUSES = ["HELD", "COMPLETED"]
+
+
+def active_booking_exists(include_pending=True):
+    """Correlated EXISTS clause matching an active booking for RentalItem.id.
+
+    With include_pending=True (catalog semantics) an item counts as taken as soon as
+    a renter has submitted requirements. With include_pending=False only bookings
+    with a held or completed payment count (booking submission semantics).
+    """
+    subquery = db.session.query(Booking.id).filter(Booking.rental_item_id == RentalItem.id)
+    if include_pending:
+        subquery = subquery.filter(
+            Booking.payment_status.in_(BLOCKING_PAYMENT_STATUSES),
+            Booking.status.in_(BLOCKING_BOOKING_STATUSES)
+        )
+    else:
+        subquery = subquery.filter(Booking.payment_status.in_(COMMITTED_PAYMENT_STATUSES))
+    return subquery.exists()
+
+
+def bookable_filter(include_pending=True):
+    """Filter expression selecting items that are marked available and not booked"""
+    return db.and_(
+        RentalItem.is_available == True,
+        ~active_booking_exists(include_pending)
+    )
+
+
+def filter_bookable(query, include_pending=True):
+    """Restrict any query that selects from rental_items to bookable items"""
+    return query.filter(bookable_filter(include_pending))
+
+
+def bookable_item_ids(item_ids, include_pending=True):
+    """Return the subset of item_ids that are bookable, in a single query"""
+    item_ids = list(item_ids)
+    if not item_ids:
+        return set()
+    rows = db.session.query(RentalItem.id).filter(
+        RentalItem.id.in_(item_ids),
+        bookable_filter(include_pending)
+    ).all()
+    return {row[0] for row in rows}
+
+
+def is_bookable(item_id, include_pending=True):
+    """Check a single item with one EXISTS query"""
+    return item_id in bookable_item_ids([item_id], include_pending)
+
@@ -0,0 +1,115 @@
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models.RentalItem import RentalItem
+from app.models.booking import Booking
+from app.models.category import Category
+from app.models.category_item_count import CategoryItemCount
+from app.utils.availability import bookable_filter
+from app.utils.upsert import increment
+
+_counts = CategoryItemCount.__table__
+_listeners_registered = False
+
+# Item states captured before a flush, keyed by session
+_SNAPSHOT_KEY = "category_counter_snapshot"
+
+
+def _item_states(connection, item_ids):
+    """{item_id: (category_id, is_bookable)} as currently visible to the transaction"""
+    if not item_ids:
+        return {}
+    bookable = db.case((bookable_filter(), 1), else_=0)
+    rows = connection.execute(
+        select(RentalItem.id, RentalItem.category_id, bookable).where(RentalItem.id.in_(list(item_ids)))
+    )
+    return {item_id: (category_id, bool(is_bookable)) for item_id, category_id, is_bookable in rows}
+
+
+def _affected_item_ids(session):
+    item_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, RentalItem) and obj.id is not None:
+            item_ids.add(obj.id)
+        elif isinstance(obj, Booking):
+            item_id = obj.rental_item_id or (obj.rental_item.id if obj.rental_item else None)
+            if item_id is not None:
+                item_ids.add(item_id)
+    return item_ids
+
+
+def apply_deltas(connection, deltas):
+    """Add per-category deltas to the counters, creating missing rows"""
+    now = datetime.utcnow()
+    for category_id, delta in deltas.items():
+        if delta:
+            increment(connection, _counts, ("category_id",),
+                      {"category_id": category_id, "available_items": delta, "updated_at": now},
+                      {"available_items": delta})
+
+
+def _before_flush(session, flush_context, instances):
+    connection = session.connection()
+    session.info[_SNAPSHOT_KEY] = _item_states(connection, _affected_item_ids(session))
+
+    deleted_categories = [obj.id for obj in session.deleted if isinstance(obj, Category) and obj.id is not None]
+    if deleted_categories:
+        connection.execute(_counts.delete().where(_counts.c.category_id.in_(deleted_categories)))
+
+
+def _after_flush(session, flush_context):
+    before = session.info.pop(_SNAPSHOT_KEY, {})
+    item_ids = set(before) | _affected_item_ids(session)
+    if not item_ids:
+        return
+    after = _item_states(session.connection(), item_ids)
+
+    deltas = Counter()
+    for item_id in item_ids:
+        old_category, was_bookable = before.get(item_id, (None, False))
+        new_category, is_bookable = after.get(item_id, (None, False))
+        if was_bookable:
+            deltas[old_category] -= 1
+        if is_bookable:
+            deltas[new_category] += 1
+    deleted_categories = {obj.id for obj in session.deleted if isinstance(obj, Category)}
+    apply_deltas(session.connection(), {
+        category_id: delta for category_id, delta in deltas.items() if category_id not in deleted_categories
+    })
+
+
+def register_category_counter_listeners():
+    """Keep category_item_counts in step with item and booking writes, inside the same transaction"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, "before_flush", _before_flush)
+    event.listen(Session, "after_flush", _after_flush)
+    _listeners_registered = True
+
+
+def reconcile_counts():
+    """Rebuild every counter from scratch. Returns {category_id: (old, new)} for counters that drifted."""
+    actual = dict(
+        db.session.query(RentalItem.category_id, db.func.count(RentalItem.id))
+        .filter(bookable_filter())
+        .group_by(RentalItem.category_id)
+        .all()
+    )
+    stored = dict(db.session.query(CategoryItemCount.category_id, CategoryItemCount.available_items).all())
+
+    drifted = {}
+    now = datetime.utcnow()
+    for (category_id,) in db.session.query(Category.id).all():
+        expected = actual.get(category_id, 0)
+        if category_id not in stored:
+            db.session.add(CategoryItemCount(category_id=category_id, available_items=expected, updated_at=now))
+            drifted[category_id] = (None, expected)
+        elif stored[category_id] != expected:
+            db.session.query(CategoryItemCount).filter_by(category_id=category_id) \
+                .update({"available_items": expected, "updated_at": now})
+            drifted[category_id] = (stored[category_id], expected)
+    db.session.commit()
+    return drifted
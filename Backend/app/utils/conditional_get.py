@@ -0,0 +1,147 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+from flask import request, current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, attributes
+from app.extensions import db
+from app.models.RentalItem import RentalItem
+from app.models.booking import Booking
+from app.models.category import Category
+from app.models.category_requirement import CategoryRequirement
+from app.models.notifications import Notification
+from app.models.resource_version import ResourceVersion
+from app.models.user import User
+from app.utils.log import get_logger
+from app.utils.upsert import increment
+
+log = get_logger("conditional_get")
+
+_versions = ResourceVersion.__table__
+_listeners_registered = False
+
+
+# ------------------- Version Bumps -------------------
+def bump_versions(connection, scopes):
+    """Increment the version of every scope, creating missing rows (runs in the caller's transaction)"""
+    now = datetime.utcnow()
+    # Fixed order keeps concurrent transactions from locking rows in opposite orders
+    for scope in sorted(scopes):
+        increment(connection, _versions, ("scope",), {"scope": scope, "version": 1, "updated_at": now}, {"version": 1})
+
+
+def _changed(obj, *keys):
+    return any(attributes.get_history(obj, key).has_changes() for key in keys)
+
+
+def _old_values(obj, key):
+    return [value for value in attributes.get_history(obj, key).deleted or () if value is not None]
+
+
+def _scopes_for(obj, session):
+    if isinstance(obj, Category):
+        return {"categories"}
+    if isinstance(obj, CategoryRequirement):
+        # Requirements drive the facets of their category
+        return {f"category:{obj.category_id}"}
+    if isinstance(obj, RentalItem):
+        scopes = {f"category:{obj.category_id}"}
+        scopes.update(f"category:{old_id}" for old_id in _old_values(obj, "category_id"))
+        return scopes
+    if isinstance(obj, Booking):
+        item = obj.rental_item or (session.get(RentalItem, obj.rental_item_id) if obj.rental_item_id else None)
+        if item is None:
+            return set()
+        # Bookings change item availability and the owner's notification details
+        return {f"category:{item.category_id}", f"owner_bookings:{item.owner_id}"}
+    if isinstance(obj, Notification):
+        scopes = {f"notifications:{obj.user_id}"}
+        scopes.update(f"notifications:{old_id}" for old_id in _old_values(obj, "user_id"))
+        return scopes
+    if isinstance(obj, User) and obj in session.dirty and _changed(obj, "username"):
+        # Owner usernames are shown on public listings
+        return {"categories"}
+    return set()
+
+
+def _after_flush(session, flush_context):
+    scopes = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        scopes |= _scopes_for(obj, session)
+    if scopes:
+        bump_versions(session.connection(), scopes)
+
+
+def register_conditional_get_listeners():
+    """Bump resource_versions in the same transaction as every write that changes a listing"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    _listeners_registered = True
+
+
+# ------------------- Version Stamps -------------------
+def scope_stamp(*scopes):
+    """Current versions of the given scopes (missing scopes count as version 0)"""
+    rows = dict(db.session.execute(
+        select(_versions.c.scope, _versions.c.version).where(_versions.c.scope.in_(scopes))
+    ).all())
+    return tuple(rows.get(scope, 0) for scope in scopes)
+
+
+def catalog_stamp():
+    """Stamp covering every category: versions only grow, so their sum changes on any bump"""
+    return tuple(db.session.execute(
+        select(db.func.count(), db.func.coalesce(db.func.sum(_versions.c.version), 0))
+        .where(db.or_(_versions.c.scope == "categories", _versions.c.scope.like("category:%")))
+    ).one())
+
+
+def category_stamp(category_id):
+    return scope_stamp("categories", f"category:{category_id}")
+
+
+def notifications_stamp(user_id, *extra_scopes):
+    """Per-user stamp; the user id is part of it so one user's ETag never matches another's"""
+    return (user_id,) + scope_stamp(f"notifications:{user_id}", *extra_scopes)
+
+
+# ------------------- Request Side -------------------
+def conditional_get(stamp, private=False):
+    """Answer GET requests with 304 Not Modified when the resource version has not changed.
+
+    stamp(kwargs) returns a cheap version value for the resource behind the request; it is
+    hashed together with the full URL into the ETag, so the view and its serialization only
+    run when the client copy is out of date. Per-user resources must include the user in
+    their stamp and pass private=True.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if request.method != "GET":
+                return f(*args, **kwargs)
+
+            try:
+                version = stamp(kwargs)
+            except Exception as e:
+                log.exception("Could not compute version stamp for %s: %s", request.endpoint, e)
+                return f(*args, **kwargs)
+
+            etag = hashlib.sha1(f"{request.full_path}|{version}".encode("utf-8")).hexdigest()[:24]
+            cache_control = "private, no-cache" if private else "no-cache"
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            # Clients may keep the copy but must revalidate it on every use
+            response.headers["Cache-Control"] = cache_control
+            return response
+        return decorated_function
+    return decorator
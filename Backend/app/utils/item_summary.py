@@ -0,0 +1,211 @@
+import json
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, attributes
+from app.extensions import db
+from app.models.RentalItem import RentalItem
+from app.models.category import Category
+from app.models.item_summary import ItemSummary
+from app.models.user import User
+from app.utils.pricing import daily_rate
+
+# Same field conventions the listing pages use to pick a card's name and image
+NAME_FIELDS = ("Item Name", "name", "title", "item_name", "product_name", "rental_name")
+IMAGE_FIELD_HINTS = ("image", "photo", "img", "pic", "car mage")
+MAX_NAME_LENGTH = 255
+
+_items = RentalItem.__table__
+_categories = Category.__table__
+_users = User.__table__
+_summaries = ItemSummary.__table__
+_listeners_registered = False
+
+
+# ------------------- Card Extraction -------------------
+def _is_image_field(field_name):
+    lowered = field_name.lower()
+    return any(hint in lowered for hint in IMAGE_FIELD_HINTS)
+
+
+def _item_name(data, category_name):
+    for field in NAME_FIELDS:
+        value = data.get(field)
+        if isinstance(value, str) and value.strip():
+            return value.strip()[:MAX_NAME_LENGTH]
+    # Otherwise the first short, non-numeric text value
+    for field_name, value in data.items():
+        if _is_image_field(field_name):
+            continue
+        if isinstance(value, str) and value.strip() and len(value) < 100 and not value.strip().isdigit():
+            return value.strip()
+    return f"{category_name} Item" if category_name else "Unnamed Item"
+
+
+def _thumbnail_url(data):
+    for field_name, value in data.items():
+        if not _is_image_field(field_name):
+            continue
+        candidates = value if isinstance(value, list) else [value]
+        for candidate in candidates:
+            if isinstance(candidate, str) and candidate.strip():
+                path = candidate.strip().replace("\\", "/")
+                if path.startswith(("http://", "https://", "/uploads/")):
+                    return path
+                return "/uploads/" + path.lstrip("/")
+    return None
+
+
+def build_summary_row(item_id, category_id, owner_id, is_available, raw_data, created_at, updated_at,
+                      category_name, owner_username):
+    """item_summaries row (including the serialized card) for one rental item"""
+    try:
+        data = json.loads(raw_data) if raw_data else {}
+    except (json.JSONDecodeError, TypeError):
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+
+    card = {
+        "id": item_id,
+        "name": _item_name(data, category_name),
+        "price": daily_rate(data),
+        "thumbnail_url": _thumbnail_url(data),
+        "category_id": category_id,
+        "category_name": category_name,
+        "owner_id": owner_id,
+        "owner_username": owner_username,
+        "is_available": bool(is_available),
+        "created_at": created_at.isoformat() if created_at else None,
+        "updated_at": updated_at.isoformat() if updated_at else None
+    }
+    return {
+        "rental_item_id": item_id,
+        "category_id": category_id,
+        "owner_id": owner_id,
+        "name": card["name"],
+        "price": card["price"],
+        "thumbnail_url": card["thumbnail_url"],
+        "category_name": category_name,
+        "owner_username": owner_username,
+        "summary_json": json.dumps(card, separators=(",", ":")),
+        "updated_at": datetime.utcnow()
+    }
+
+
+# ------------------- Projection Maintenance -------------------
+def _source_rows(condition):
+    """Select of build_summary_row()'s arguments for the rental items matching condition"""
+    return select(
+        _items.c.id, _items.c.category_id, _items.c.owner_id, _items.c.is_available,
+        _items.c.dynamic_data, _items.c.created_at, _items.c.updated_at,
+        _categories.c.name, _users.c.username
+    ).select_from(
+        _items.outerjoin(_categories, _categories.c.id == _items.c.category_id)
+        .outerjoin(_users, _users.c.id == _items.c.owner_id)
+    ).where(condition)
+
+
+def refresh_summaries(connection, condition, batch_size=500):
+    """Rebuild the summaries of every rental item matching condition, in id-ordered batches"""
+    last_id = 0
+    refreshed = 0
+    while True:
+        rows = connection.execute(
+            _source_rows(db.and_(condition, _items.c.id > last_id)).order_by(_items.c.id).limit(batch_size)
+        ).fetchall()
+        if not rows:
+            break
+        item_ids = [row[0] for row in rows]
+        connection.execute(_summaries.delete().where(_summaries.c.rental_item_id.in_(item_ids)))
+        connection.execute(_summaries.insert(), [build_summary_row(*row) for row in rows])
+        refreshed += len(rows)
+        last_id = item_ids[-1]
+    return refreshed
+
+
+def rebuild_summaries(batch_size=500):
+    """Rebuild item_summaries for every rental item. Returns the number of items processed."""
+    connection = db.session.connection()
+    connection.execute(_summaries.delete())
+    refreshed = refresh_summaries(connection, db.true(), batch_size)
+    db.session.commit()
+    return refreshed
+
+
+def _before_flush(session, flush_context, instances):
+    # Summary rows must go before the item rows they point at
+    deleted_ids = [obj.id for obj in session.deleted if isinstance(obj, RentalItem) and obj.id is not None]
+    if deleted_ids:
+        session.connection().execute(_summaries.delete().where(_summaries.c.rental_item_id.in_(deleted_ids)))
+
+
+def _after_flush(session, flush_context):
+    item_ids = set()
+    category_ids = set()
+    owner_ids = set()
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, RentalItem):
+            if obj in session.new or session.is_modified(obj):
+                item_ids.add(obj.id)
+        elif isinstance(obj, Category) and obj in session.dirty:
+            if attributes.get_history(obj, "name").has_changes():
+                category_ids.add(obj.id)
+        elif isinstance(obj, User) and obj in session.dirty:
+            if attributes.get_history(obj, "username").has_changes():
+                owner_ids.add(obj.id)
+
+    conditions = []
+    if item_ids:
+        conditions.append(_items.c.id.in_(list(item_ids)))
+    if category_ids:
+        conditions.append(_items.c.category_id.in_(list(category_ids)))
+    if owner_ids:
+        conditions.append(_items.c.owner_id.in_(list(owner_ids)))
+    if conditions:
+        refresh_summaries(session.connection(), db.or_(*conditions))
+
+
+def register_item_summary_listeners():
+    """Keep item_summaries in sync with RentalItem writes, category renames and owner renames"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, "before_flush", _before_flush)
+    event.listen(Session, "after_flush", _after_flush)
+    _listeners_registered = True
+
+
+# ------------------- Serving -------------------
+def is_summary_request(args):
+    """Listing endpoints return compact cards instead of full items with ?view=summary"""
+    return args.get("view") == "summary"
+
+
+def with_summaries(query):
+    """Turn a RentalItem query into one selecting (summary_json, created_at, id) per item.
+
+    The join is outer, so items without a summary row keep their place (with summary_json
+    None) and the page still matches the totals; summary_fragments() renders their cards.
+    """
+    return query.outerjoin(ItemSummary, ItemSummary.rental_item_id == RentalItem.id) \
+        .with_entities(ItemSummary.summary_json, RentalItem.created_at, RentalItem.id)
+
+
+def summary_fragments(rows):
+    """Card JSON of each with_summaries() row, built on the fly for items missing a summary"""
+    missing = [row[2] for row in rows if row[0] is None]
+    rendered = {}
+    if missing:
+        for source in db.session.connection().execute(_source_rows(_items.c.id.in_(missing))):
+            rendered[source[0]] = build_summary_row(*source)["summary_json"]
+    fragments = (row[0] if row[0] is not None else rendered.get(row[2]) for row in rows)
+    return [fragment for fragment in fragments if fragment is not None]
+
+
+def summary_response(key, fragments, **fields):
+    """JSON response whose key holds the pre-serialized cards verbatim, next to the other fields"""
+    dumps = current_app.json.dumps
+    parts = [f"{dumps(key)}:[{','.join(fragments)}]"]
+    parts.extend(f"{dumps(name)}:{dumps(value)}" for name, value in fields.items())
+    return current_app.response_class("{" + ",".join(parts) + "}", status=200, mimetype="application/json")
@@ -0,0 +1,275 @@
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.extensions import db
+from app.models.ledger_entry import AccountBalance, LedgerEntry
+from app.utils.upsert import increment, money
+
+_balances = AccountBalance.__table__
+_listeners_registered = False
+
+# ------------------- Accounts -------------------
+# Renters pay payment_amount + service_fee. While a booking is HELD both parts sit in escrow;
+# on release the payment amount goes to the item's owner and the fee to the platform, counted
+# as revenue only under revenue_qualifies() (the dashboard's rule); fees released any other way
+# (e.g. auto-release after delivery) wait in RELEASED_FEES. A rejected or refunded payment goes
+# back to the renter in full: the payment amount filed under the owner of the item, the fee in
+# REFUNDED_FEES.
+PLATFORM = "platform"
+HELD_FEES = "held:fees"
+RELEASED_FEES = "released:fees"
+REFUNDED_FEES = "refunds:fees"
+
+
+def held_account(owner_id):
+    return f"held:owner:{owner_id}"
+
+
+def owner_account(owner_id):
+    return f"owner:{owner_id}"
+
+
+def refund_account(owner_id):
+    return f"refunds:owner:{owner_id}"
+
+
+def rollups(account):
+    """The account and every prefix it rolls up into: "held:owner:5" -> held:owner:5, held:owner, held"""
+    parts = account.split(":")
+    return [":".join(parts[:length]) for length in range(len(parts), 0, -1)]
+
+
+class LedgerError(RuntimeError):
+    """Raised when something tries to change or delete a written ledger entry"""
+
+
+# ------------------- Positions -------------------
+def revenue_qualifies(status, payment_status, admin_approved):
+    """Whether a booking's service fee counts as platform revenue: paid, and confirmed or approved by an admin"""
+    return payment_status == "COMPLETED" and (status == "Confirmed" or admin_approved is True)
+
+
+def revenue_qualifies_clause():
+    """revenue_qualifies() as a SQL condition on the bookings table"""
+    from app.models.booking import Booking
+    return db.and_(Booking.payment_status == "COMPLETED",
+                   db.or_(Booking.status == "Confirmed", Booking.admin_approved.is_(True)))
+
+
+def target_positions(status, payment_status, admin_approved, payment_amount, service_fee, payment_held_at, owner_id):
+    """{account: amount} a booking in this state should hold in the ledger"""
+    amount = money(payment_amount)
+    fee = money(service_fee)
+    if payment_status == "HELD":
+        positions = {HELD_FEES: fee, held_account(owner_id): amount}
+    elif payment_status == "COMPLETED":
+        fee_account = PLATFORM if revenue_qualifies(status, payment_status, admin_approved) else RELEASED_FEES
+        positions = {fee_account: fee, owner_account(owner_id): amount}
+    elif payment_status == "FAILED" and payment_held_at is not None:
+        # Only money that was actually taken can be refunded
+        positions = {REFUNDED_FEES: fee, refund_account(owner_id): amount}
+    else:
+        positions = {}
+    return {account: value for account, value in positions.items() if value}
+
+
+def booking_positions(booking_id, for_update=False):
+    """{account: amount} the ledger currently holds for one booking.
+
+    for_update makes it a locking read, which sees the latest committed entries rather than
+    the transaction's snapshot (REPEATABLE READ) and holds them until the commit.
+    """
+    rows = db.session.query(LedgerEntry.account, db.func.sum(LedgerEntry.amount)) \
+        .filter(LedgerEntry.booking_id == booking_id).group_by(LedgerEntry.account)
+    if for_update:
+        rows = rows.with_for_update()
+    return {account: money(total) for account, total in rows if money(total)}
+
+
+def _rolled_up(positions):
+    totals = Counter()
+    for account, value in positions.items():
+        for key in rollups(account):
+            totals[key] += value
+    return totals
+
+
+# ------------------- Writing -------------------
+def record_transition(booking, entry_type, note=None):
+    """Write the entries moving booking's ledger position to what its payment state implies.
+
+    Call after changing the booking's payment fields, before the commit: the entries and the
+    account balance updates join the caller's transaction. Returns the new entries (none when
+    the ledger already matches, so repeated calls are harmless).
+
+    Concurrent transitions of one booking (both parties confirming delivery at once, a
+    double-clicked approve) are serialized on the booking row: the second waits for the
+    first to commit, then sees its entries and posts only what is still missing.
+    """
+    from app.models.booking import Booking
+    db.session.query(Booking.id).filter(Booking.id == booking.id).with_for_update().scalar()
+
+    owner_id = booking.rental_item.owner_id if booking.rental_item else None
+    target = target_positions(booking.status, booking.payment_status, booking.admin_approved, booking.payment_amount,
+                              booking.service_fee, booking.payment_held_at, owner_id)
+    current = booking_positions(booking.id, for_update=True)
+
+    entries = []
+    for account in sorted(set(current) | set(target)):
+        change = target.get(account, Decimal("0.00")) - current.get(account, Decimal("0.00"))
+        if change:
+            entries.append(LedgerEntry(booking_id=booking.id, account=account, entry_type=entry_type,
+                                       amount=change, note=note[:255] if note else None))
+    if not entries:
+        return []
+
+    before, after = _rolled_up(current), _rolled_up(target)
+    changes = {}
+    for key in set(before) | set(after):
+        if after.get(key, 0) != before.get(key, 0):
+            # bookings counts the booking while its position in the account is non-zero
+            changes[key] = (after.get(key, 0) - before.get(key, 0), bool(after.get(key)) - bool(before.get(key)))
+    db.session.add_all(entries)
+    apply_balance_changes(db.session.connection(), changes)
+    return entries
+
+
+def apply_balance_changes(connection, changes):
+    """Add {account: (amount, bookings)} to account_balances, creating missing rows"""
+    now = datetime.utcnow()
+    for account, (amount, bookings) in changes.items():
+        increment(connection, _balances, ("account",),
+                  {"account": account, "balance": amount, "bookings": bookings, "updated_at": now},
+                  {"balance": amount, "bookings": bookings})
+
+
+def _before_flush(session, flush_context, instances):
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, LedgerEntry) and (obj in session.deleted or session.is_modified(obj)):
+            raise LedgerError(f"Ledger entry {obj.id} is append-only; post a correcting entry instead")
+
+
+def register_ledger_listeners():
+    """Refuse flushes that would update or delete ledger entries"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, "before_flush", _before_flush)
+    _listeners_registered = True
+
+
+# ------------------- Reading -------------------
+def balances(*accounts):
+    """{account: (balance, bookings)} for the given accounts or prefixes, one primary key lookup"""
+    rows = db.session.query(AccountBalance.account, AccountBalance.balance, AccountBalance.bookings) \
+        .filter(AccountBalance.account.in_(accounts))
+    found = {account: (money(balance), bookings) for account, balance, bookings in rows}
+    return {account: found.get(account, (Decimal("0.00"), 0)) for account in accounts}
+
+
+def flows(accounts, start=None, end=None):
+    """{account: net amount} posted to each account (leaf or prefix) between start and end"""
+    result = {}
+    for account in accounts:
+        query = db.session.query(db.func.sum(LedgerEntry.amount)).filter(
+            db.or_(LedgerEntry.account == account, LedgerEntry.account.like(f"{account}:%")))
+        if start is not None:
+            query = query.filter(LedgerEntry.created_at >= start)
+        if end is not None:
+            query = query.filter(LedgerEntry.created_at <= end)
+        result[account] = money(query.scalar())
+    return result
+
+
+def period_flows(accounts, period="month"):
+    """{period key: {account: net amount}} for the given accounts (leaf or prefix), oldest first"""
+    from app.utils.aggregates import period_expression
+    key = period_expression(LedgerEntry.created_at, period)
+    series = {}
+    for account in accounts:
+        rows = db.session.query(key, db.func.sum(LedgerEntry.amount), db.func.count(db.distinct(LedgerEntry.booking_id))) \
+            .filter(db.or_(LedgerEntry.account == account, LedgerEntry.account.like(f"{account}:%"))) \
+            .group_by(key)
+        for period_key, total, booking_count in rows:
+            series.setdefault(period_key, {})[account] = (money(total), booking_count)
+    return dict(sorted(series.items()))
+
+
+# ------------------- Reconciliation -------------------
+def reconcile(fix=False, batch_size=1000):
+    """Check the ledger against the bookings table and the balances against the entries.
+
+    Returns {"bookings": [(booking_id, ledger positions, expected positions)],
+    "balances": [(account, stored, expected)]}. With fix=True, drifted bookings get
+    "adjustment" entries (or "opening" entries if they have none yet, e.g. bookings that
+    predate the ledger) and drifted balance rows are rewritten from the entries.
+    """
+    from app.models.booking import Booking
+    from app.models.RentalItem import RentalItem
+
+    ledger = {}
+    for booking_id, account, total in db.session.query(
+            LedgerEntry.booking_id, LedgerEntry.account, db.func.sum(LedgerEntry.amount)) \
+            .filter(LedgerEntry.booking_id.isnot(None)) \
+            .group_by(LedgerEntry.booking_id, LedgerEntry.account):
+        if money(total):
+            ledger.setdefault(booking_id, {})[account] = money(total)
+
+    drifted_bookings = []
+    rows = db.session.query(Booking.id, Booking.status, Booking.payment_status, Booking.admin_approved,
+                            Booking.payment_amount, Booking.service_fee, Booking.payment_held_at, RentalItem.owner_id) \
+        .outerjoin(RentalItem, Booking.rental_item_id == RentalItem.id) \
+        .order_by(Booking.id).yield_per(batch_size)
+    for booking_id, *state in rows:
+        expected = target_positions(*state)
+        positions = ledger.get(booking_id, {})
+        if positions != expected:
+            drifted_bookings.append((booking_id, positions, expected))
+
+    if fix and drifted_bookings:
+        for booking_id, positions, _ in drifted_bookings:
+            booking = db.session.get(Booking, booking_id)
+            record_transition(booking, "adjustment" if positions else "opening", note="reconciliation")
+        db.session.commit()
+
+    drifted_balances = _check_balances(fix)
+    return {"bookings": drifted_bookings, "balances": drifted_balances}
+
+
+def _check_balances(fix):
+    positions = {}
+    for booking_id, account, total in db.session.query(
+            LedgerEntry.booking_id, LedgerEntry.account, db.func.sum(LedgerEntry.amount)) \
+            .group_by(LedgerEntry.booking_id, LedgerEntry.account):
+        positions.setdefault(booking_id, Counter())[account] += money(total)
+
+    expected_balances, expected_bookings = Counter(), Counter()
+    for booking_id, accounts in positions.items():
+        for key, value in _rolled_up(accounts).items():
+            expected_balances[key] += value
+            # Entries whose booking was deleted still count towards balances, but not bookings
+            if value and booking_id is not None:
+                expected_bookings[key] += 1
+
+    stored = {account: (money(balance), bookings) for account, balance, bookings in
+              db.session.query(AccountBalance.account, AccountBalance.balance, AccountBalance.bookings)}
+    drifted = []
+    now = datetime.utcnow()
+    for account in sorted(set(stored) | set(expected_balances)):
+        expected = (money(expected_balances.get(account)), expected_bookings.get(account, 0))
+        actual = stored.get(account, (Decimal("0.00"), 0))
+        if actual == expected:
+            continue
+        drifted.append((account, actual, expected))
+        if fix:
+            if account in stored:
+                db.session.query(AccountBalance).filter_by(account=account).update(
+                    {"balance": expected[0], "bookings": expected[1], "updated_at": now})
+            else:
+                db.session.add(AccountBalance(account=account, balance=expected[0], bookings=expected[1],
+                                              updated_at=now))
+    if fix and drifted:
+        db.session.commit()
+    return drifted
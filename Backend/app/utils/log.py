@@ -0,0 +1,88 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+ROOT_LOGGER = "rentals"
+LOG_QUEUE_SIZE = 10000  # Records buffered before new ones are dropped
+
+# Attributes every LogRecord has; anything else came in through extra={...}
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener = None
+
+
+def get_logger(subsystem):
+    """Logger for one subsystem, e.g. get_logger("auth") -> "rentals.auth".
+
+    Pass arguments instead of pre-formatting so disabled levels cost only a level check:
+    log.debug("Processing booking %s", booking.id), never log.debug(f"...").
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{subsystem}")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, plus any extra={...} fields"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the request thread: a full queue drops the record"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+    def prepare(self, record):
+        # Format the message (and traceback) on the request thread, while args are still valid
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def init_logging(app):
+    """Route the "rentals" loggers through a background queue to stdout.
+
+    LOG_LEVEL gates records at the call site; LOG_FORMAT is "json" or "text".
+    """
+    global _listener
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(app.config.get("LOG_LEVEL", "INFO"))
+    root.propagate = False
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if app.config.get("LOG_FORMAT", "json") == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    root.addHandler(_DroppingQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,281 @@
+import glob
+import json
+import math
+import os
+import threading
+import time
+from flask import Response, current_app, g, request
+from app.extensions import db
+from app.utils.auth_cache import principal_cache
+from app.utils.log import get_logger
+from app.utils.passwords import password_hasher
+from app.utils.rate_limit import rate_limiter
+from app.utils.response_cache import response_cache
+
+log = get_logger("metrics")
+
+# Request duration buckets in seconds (upper bounds; +Inf is implied)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_HELP = {
+    "http_request_duration_seconds": ("histogram", "Request duration by blueprint, endpoint and status"),
+    "http_requests_in_flight": ("gauge", "Requests currently being handled"),
+    "db_pool_connections": ("gauge", "SQLAlchemy connection pool connections by state"),
+    "cache_requests_total": ("counter", "Cache lookups by cache and result"),
+    "cache_hit_ratio": ("gauge", "Cache hits / lookups since the workers started"),
+    "password_hash_operations_total": ("counter", "Password hash and verify operations"),
+    "rate_limited_requests_total": ("counter", "Requests rejected by the rate limiter"),
+}
+
+
+# ------------------- In-Process Collection -------------------
+class _Shard:
+    """One thread's observations; only that thread writes to it, so recording takes no lock"""
+    __slots__ = ("histograms", "in_flight")
+
+    def __init__(self):
+        self.histograms = {}  # labels tuple -> [count per bucket..., +Inf count, sum]
+        self.in_flight = 0
+
+
+class MetricsRegistry:
+    """Request metrics for this process, merged across threads (and workers) when scraped"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()  # Only taken when a thread registers its shard
+        self.multiprocess_dir = None
+        self.flush_interval = 5.0
+        self._last_flush = 0.0
+
+    def _shard(self):
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def request_started(self):
+        self._shard().in_flight += 1
+
+    def request_finished(self):
+        self._shard().in_flight -= 1
+
+    def observe_request(self, blueprint, endpoint, status, duration):
+        histograms = self._shard().histograms
+        labels = (blueprint, endpoint, status)
+        values = histograms.get(labels)
+        if values is None:
+            values = histograms[labels] = [0] * (len(DURATION_BUCKETS) + 2)
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                break
+        else:
+            index = len(DURATION_BUCKETS)
+        values[index] += 1
+        values[-1] += duration
+
+    # Snapshots
+    def snapshot(self):
+        """This process's metrics as plain data (the unit that is merged across workers)"""
+        histograms = {}
+        in_flight = 0
+        for shard in list(self._shards):
+            in_flight += shard.in_flight
+            for labels, values in list(shard.histograms.items()):
+                merged = histograms.get(labels)
+                if merged is None:
+                    histograms[labels] = list(values)
+                else:
+                    for index, value in enumerate(values):
+                        merged[index] += value
+        return {
+            "pid": os.getpid(),
+            "histograms": [[list(labels), values] for labels, values in histograms.items()],
+            "counters": _collect_counters(),
+            "gauges": [["http_requests_in_flight", [], in_flight]] + _collect_pool_gauges()
+        }
+
+    def maybe_flush(self):
+        """Write this worker's snapshot for the other workers' /metrics, at most every flush_interval"""
+        if not self.multiprocess_dir:
+            return
+        now = time.monotonic()
+        if now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        self.flush()
+
+    def flush(self):
+        try:
+            os.makedirs(self.multiprocess_dir, exist_ok=True)
+            path = os.path.join(self.multiprocess_dir, f"metrics-{os.getpid()}.json")
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(self.snapshot(), handle)
+            os.replace(temp_path, path)
+        except OSError as e:
+            log.warning("Could not write metrics snapshot: %s", e)
+
+    def collect(self):
+        """Snapshots of every worker: this one live, the others from METRICS_MULTIPROC_DIR"""
+        if not self.multiprocess_dir:
+            return [self.snapshot()]
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "metrics-*.json")):
+            try:
+                with open(path, encoding="utf-8") as handle:
+                    snapshot = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            if not _pid_alive(snapshot.get("pid")):
+                # A restarted worker's totals still count, its gauges no longer do
+                snapshot["gauges"] = []
+            snapshots.append(snapshot)
+        return snapshots
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(int(pid), 0)
+    except (TypeError, ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _collect_counters():
+    counters = []
+    for cache, stats in (("response", response_cache.stats), ("auth_principal", principal_cache.stats)):
+        counters.append(["cache_requests_total", [["cache", cache], ["result", "hit"]], stats["hits"]])
+        counters.append(["cache_requests_total", [["cache", cache], ["result", "miss"]], stats["misses"]])
+    password_counts = password_hasher.stats()["counts"]
+    for operation in ("hash", "verify", "rehash", "rejected"):
+        counters.append(["password_hash_operations_total", [["operation", operation]], password_counts[operation]])
+    counters.append(["rate_limited_requests_total", [], rate_limiter.stats["limited"]])
+    return counters
+
+
+def _collect_pool_gauges():
+    try:
+        pool = db.engine.pool
+        states = {"size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow(),
+                  "checked_in": pool.checkedin()}
+    except Exception:
+        # Pools without these counters (e.g. sqlite's StaticPool)
+        return []
+    return [["db_pool_connections", [["state", state]], value] for state, value in states.items()]
+
+
+# ------------------- Exposition -------------------
+def _label_text(pairs):
+    if not pairs:
+        return ""
+    escaped = (
+        name + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _number(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf"
+        return repr(round(value, 6))
+    return str(value)
+
+
+def render(snapshots):
+    """Prometheus text exposition (format 0.0.4) of merged worker snapshots"""
+    histograms = {}
+    scalars = {}
+    for snapshot in snapshots:
+        for labels, values in snapshot.get("histograms", []):
+            key = tuple(labels)
+            merged = histograms.get(key)
+            if merged is None:
+                histograms[key] = list(values)
+            else:
+                for index, value in enumerate(values):
+                    merged[index] += value
+        for kind in ("counters", "gauges"):
+            for name, labels, value in snapshot.get(kind, []):
+                key = (name, tuple(tuple(pair) for pair in labels))
+                scalars[key] = scalars.get(key, 0) + value
+
+    # Hit ratios from the merged counters, so they are correct across workers
+    lookups = {}
+    for (name, labels), value in scalars.items():
+        if name == "cache_requests_total":
+            label_map = dict(labels)
+            hits, total = lookups.get(label_map["cache"], (0, 0))
+            lookups[label_map["cache"]] = (hits + (value if label_map["result"] == "hit" else 0), total + value)
+    for cache, (hits, total) in lookups.items():
+        if total:
+            scalars[("cache_hit_ratio", (("cache", cache),))] = round(hits / total, 4)
+
+    lines = []
+    name = "http_request_duration_seconds"
+    lines += [f"# HELP {name} {_HELP[name][1]}", f"# TYPE {name} histogram"]
+    for (blueprint, endpoint, status), values in sorted(histograms.items()):
+        base = [("blueprint", blueprint), ("endpoint", endpoint), ("status", status)]
+        cumulative = 0
+        for bound, count in zip(DURATION_BUCKETS + (math.inf,), values):
+            cumulative += count
+            lines.append(f"{name}_bucket{_label_text(base + [('le', _number(float(bound)))])} {cumulative}")
+        lines.append(f"{name}_sum{_label_text(base)} {_number(float(values[-1]))}")
+        lines.append(f"{name}_count{_label_text(base)} {cumulative}")
+
+    by_name = {}
+    for (metric, labels), value in scalars.items():
+        by_name.setdefault(metric, []).append((labels, value))
+    for metric in sorted(by_name):
+        kind, help_text = _HELP.get(metric, ("untyped", metric))
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+        for labels, value in sorted(by_name[metric]):
+            lines.append(f"{metric}{_label_text(labels)} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+# ------------------- Request Hooks -------------------
+def init_metrics(app):
+    """Time every request and serve GET /metrics (optionally behind METRICS_TOKEN)"""
+    if not app.config.get("METRICS_ENABLED", True):
+        return
+    metrics_registry.multiprocess_dir = app.config.get("METRICS_MULTIPROC_DIR") or None
+    metrics_registry.flush_interval = app.config.get("METRICS_FLUSH_INTERVAL", 5)
+
+    @app.before_request
+    def _start_request_timer():
+        g.metrics_started = time.perf_counter()
+        metrics_registry.request_started()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop("metrics_started", None)
+        if started is not None:
+            metrics_registry.observe_request(
+                request.blueprint or "", request.endpoint or "unmatched", str(response.status_code),
+                time.perf_counter() - started
+            )
+        return response
+
+    @app.teardown_request
+    def _finish_request(exc):
+        metrics_registry.request_finished()
+        metrics_registry.maybe_flush()
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        token = current_app.config.get("METRICS_TOKEN")
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            return Response("Unauthorized\n", status=401, mimetype="text/plain")
+        return Response(render(metrics_registry.collect()), mimetype="text/plain; version=0.0.4; charset=utf-8")
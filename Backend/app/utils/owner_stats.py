@@ -0,0 +1,205 @@
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import select
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.owner_stat import OwnerStat
+from app.models.RentalItem import RentalItem
+from app.utils.upsert import increment, money, track_flushes
+
+_stats = OwnerStat.__table__
+_listeners_registered = False
+
+# Item and booking states captured before a flush, keyed by session
+_SNAPSHOT_KEY = "owner_stats_snapshot"
+
+def status_bucket(status):
+    """Dashboard bucket of a booking status: "pending", "accepted", "completed" or None"""
+    status = (status or "").strip().lower()
+    if "pending" in status:
+        return "pending"
+    if "accepted" in status or "approved" in status:
+        return "accepted"
+    if any(word in status for word in ("completed", "delivered", "returned", "finished")):
+        return "completed"
+    return None
+
+
+# ------------------- Metric Contributions -------------------
+# Every row contributes to the (owner_id, category_id) of its item; a write's effect is
+# contributions(after) - contributions(before), summed per key and metric.
+
+def _item_metrics(is_available, count=1):
+    return {"items.total": count, "items.available": count if is_available else 0}
+
+
+def _booking_metrics(status, payment_status, amount, count=1):
+    """Metrics of `count` bookings sharing a status and payment status, `amount` their payment total"""
+    metrics = {"bookings.total": count, "bookings.value": money(amount)}
+    bucket = status_bucket(status)
+    if bucket:
+        metrics[f"bookings.{bucket}"] = count
+    if payment_status == "PENDING":
+        metrics["bookings.pending_value"] = money(amount)
+    return metrics
+
+
+def _item_states(connection, ids):
+    """{item_id: (owner_id, category_id, is_available)} as currently visible to the transaction"""
+    if not ids:
+        return {}
+    rows = connection.execute(
+        select(RentalItem.id, RentalItem.owner_id, RentalItem.category_id, RentalItem.is_available)
+        .where(RentalItem.id.in_(list(ids)))
+    )
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def _booking_states(connection, ids):
+    """{booking_id: (owner_id, category_id, status, payment_status, payment_amount)}"""
+    if not ids:
+        return {}
+    rows = connection.execute(
+        select(Booking.id, RentalItem.owner_id, RentalItem.category_id, Booking.status, Booking.payment_status,
+               Booking.payment_amount)
+        .join(RentalItem, Booking.rental_item_id == RentalItem.id)
+        .where(Booking.id.in_(list(ids)))
+    )
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def _states(connection, model, ids):
+    return _item_states(connection, ids) if model is RentalItem else _booking_states(connection, ids)
+
+
+def _contributions(item_states, booking_states):
+    totals = Counter()
+    for owner_id, category_id, is_available in item_states.values():
+        for metric, value in _item_metrics(is_available).items():
+            totals[(owner_id, category_id, metric)] += value
+    for owner_id, category_id, status, payment_status, amount in booking_states.values():
+        for metric, value in _booking_metrics(status, payment_status, amount).items():
+            totals[(owner_id, category_id, metric)] += value
+    return totals
+
+
+def _moved_bookings(connection, moves, skip_booking_ids):
+    """Deltas for the untouched bookings of items whose owner or category changed"""
+    deltas = Counter()
+    rows = connection.execute(
+        select(Booking.rental_item_id, Booking.status, Booking.payment_status, db.func.count(Booking.id),
+               db.func.sum(Booking.payment_amount))
+        .where(Booking.rental_item_id.in_(list(moves)), Booking.id.notin_(list(skip_booking_ids) or [0]))
+        .group_by(Booking.rental_item_id, Booking.status, Booking.payment_status)
+    )
+    for item_id, status, payment_status, count, amount in rows:
+        old_key, new_key = moves[item_id]
+        for metric, value in _booking_metrics(status, payment_status, amount, count).items():
+            deltas[old_key + (metric,)] -= value
+            deltas[new_key + (metric,)] += value
+    return deltas
+
+
+def apply_deltas(connection, deltas):
+    """Add {(owner_id, category_id, metric): delta} to owner_stats, creating missing rows"""
+    now = datetime.utcnow()
+    for (owner_id, category_id, metric), delta in deltas.items():
+        if delta:
+            increment(connection, _stats, ("owner_id", "category_id", "metric"),
+                      {"owner_id": owner_id, "category_id": category_id, "metric": metric, "value": delta,
+                       "updated_at": now}, {"value": delta})
+
+
+def _apply_changes(connection, before, after):
+    items_before, bookings_before = before.get(RentalItem, {}), before.get(Booking, {})
+    items_after, bookings_after = after.get(RentalItem, {}), after.get(Booking, {})
+    deltas = _contributions(items_after, bookings_after)
+    deltas.subtract(_contributions(items_before, bookings_before))
+
+    moves = {}
+    for item_id, (owner_id, category_id, _) in items_after.items():
+        if item_id in items_before and items_before[item_id][:2] != (owner_id, category_id):
+            moves[item_id] = (items_before[item_id][:2], (owner_id, category_id))
+    if moves:
+        deltas.update(_moved_bookings(connection, moves, set(bookings_before) | set(bookings_after)))
+    apply_deltas(connection, deltas)
+
+
+def register_owner_stats_listeners():
+    """Keep owner_stats in step with booking and rental item writes, inside the same transaction"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    track_flushes(_SNAPSHOT_KEY, (RentalItem, Booking), _states, _apply_changes)
+    _listeners_registered = True
+
+
+# ------------------- Reading -------------------
+def owner_stats(owner_id):
+    """{category_id: Counter(metric -> value)} for one owner (a primary key range read)"""
+    by_category = {}
+    for category_id, metric, value in db.session.query(OwnerStat.category_id, OwnerStat.metric, OwnerStat.value) \
+            .filter(OwnerStat.owner_id == owner_id):
+        by_category.setdefault(category_id, Counter())[metric] += money(value)
+    return by_category
+
+
+def owner_totals(by_category):
+    """Counter of every metric summed over an owner_stats() result"""
+    totals = Counter()
+    for metrics in by_category.values():
+        totals.update(metrics)
+    return totals
+
+
+# ------------------- Reconciliation -------------------
+def compute_owner_stats(owner_id=None):
+    """{(owner_id, category_id, metric): value} counted from rental_items and bookings"""
+    totals = Counter()
+    items = db.session.query(RentalItem.owner_id, RentalItem.category_id, RentalItem.is_available,
+                             db.func.count(RentalItem.id)) \
+        .group_by(RentalItem.owner_id, RentalItem.category_id, RentalItem.is_available)
+    bookings = db.session.query(RentalItem.owner_id, RentalItem.category_id, Booking.status, Booking.payment_status,
+                                db.func.count(Booking.id), db.func.sum(Booking.payment_amount)) \
+        .join(RentalItem, Booking.rental_item_id == RentalItem.id) \
+        .group_by(RentalItem.owner_id, RentalItem.category_id, Booking.status, Booking.payment_status)
+    if owner_id is not None:
+        items = items.filter(RentalItem.owner_id == owner_id)
+        bookings = bookings.filter(RentalItem.owner_id == owner_id)
+
+    for item_owner, category_id, is_available, count in items:
+        for metric, value in _item_metrics(is_available, count).items():
+            totals[(item_owner, category_id, metric)] += value
+    for item_owner, category_id, status, payment_status, count, amount in bookings:
+        for metric, value in _booking_metrics(status, payment_status, amount, count).items():
+            totals[(item_owner, category_id, metric)] += value
+    return totals
+
+
+def reconcile_owner_stats(owner_id=None):
+    """Rebuild owner_stats (for one owner or everyone) from the source tables.
+
+    Returns {(owner_id, category_id, metric): (old, new)} for values that drifted.
+    """
+    actual = compute_owner_stats(owner_id)
+    query = db.session.query(OwnerStat)
+    if owner_id is not None:
+        query = query.filter(OwnerStat.owner_id == owner_id)
+    stored = {(row.owner_id, row.category_id, row.metric): row for row in query}
+
+    drifted = {}
+    now = datetime.utcnow()
+    for key in set(actual) | set(stored):
+        expected = money(actual.get(key, 0))
+        row = stored.get(key)
+        if row is None:
+            if expected:
+                db.session.add(OwnerStat(owner_id=key[0], category_id=key[1], metric=key[2], value=expected,
+                                         updated_at=now))
+                drifted[key] = (None, float(expected))
+        elif money(row.value) != expected:
+            drifted[key] = (float(row.value), float(expected))
+            row.value = expected
+            row.updated_at = now
+    db.session.commit()
+    return drifted
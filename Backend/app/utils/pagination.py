@@ -0,0 +1,150 @@
+import base64
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from flask import request
+from app.extensions import db
+
+TOTAL_CACHE_TTL = 60  # Seconds a cached total count stays valid
+TOTAL_CACHE_SIZE = 256
+
+_total_cache = OrderedDict()
+
+
+class CursorError(ValueError):
+    """Raised for cursors that cannot be decoded"""
+
+
+# ------------------- Cursor Encoding -------------------
+def encode_cursor(created_at, row_id, direction):
+    """Opaque cursor for the (created_at, id) position of a row"""
+    payload = {
+        "c": created_at.isoformat() if created_at else None,
+        "i": row_id,
+        "d": direction
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id, direction) for a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        created_at = datetime.fromisoformat(payload["c"]) if payload["c"] else None
+        row_id = int(payload["i"])
+        direction = payload["d"]
+    except (ValueError, KeyError, TypeError):
+        raise CursorError("Invalid cursor")
+    if direction not in ("next", "prev"):
+        raise CursorError("Invalid cursor")
+    return created_at, row_id, direction
+
+
+# ------------------- Keyset Pagination -------------------
+def is_cursor_request():
+    """Cursor mode is opt-in: any request carrying a cursor parameter (even empty) uses it"""
+    return "cursor" in request.args
+
+
+def keyset_page(query, sort_column, id_column, cursor, per_page, key=None):
+    """Fetch one page of query ordered newest first by (sort_column, id_column).
+
+    key(row) must return the (created_at, id) of a result row; by default the row is
+    expected to be the model instance itself. Returns (rows, next_cursor, prev_cursor).
+    Raises CursorError for malformed cursors.
+    """
+    key = key or (lambda row: (getattr(row, sort_column.key), getattr(row, id_column.key)))
+    direction = "next"
+    if cursor:
+        created_at, row_id, direction = decode_cursor(cursor)
+        if direction == "next":
+            query = query.filter(db.or_(
+                sort_column < created_at,
+                db.and_(sort_column == created_at, id_column < row_id)
+            ))
+        else:
+            query = query.filter(db.or_(
+                sort_column > created_at,
+                db.and_(sort_column == created_at, id_column > row_id)
+            ))
+
+    if direction == "next":
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    # One extra row tells us whether another page exists in this direction
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == "prev":
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        first_key, last_key = key(rows[0]), key(rows[-1])
+        if direction == "next":
+            if has_more:
+                next_cursor = encode_cursor(*last_key, "next")
+            if cursor:
+                prev_cursor = encode_cursor(*first_key, "prev")
+        else:
+            next_cursor = encode_cursor(*last_key, "next")
+            if has_more:
+                prev_cursor = encode_cursor(*first_key, "prev")
+    return rows, next_cursor, prev_cursor
+
+
+# ------------------- Optional Totals -------------------
+def _estimated_table_rows(table_name):
+    """Row estimate from the database statistics (MySQL only); None elsewhere"""
+    if db.engine.dialect.name != "mysql":
+        return None
+    try:
+        return db.session.execute(
+            db.text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+            ),
+            {"table_name": table_name}
+        ).scalar()
+    except Exception:
+        return None
+
+
+def _cached_count(query, cache_key):
+    now = time.monotonic()
+    cached = _total_cache.get(cache_key)
+    if cached and cached[0] > now:
+        return cached[1]
+    total = query.order_by(None).count()
+    _total_cache[cache_key] = (now + TOTAL_CACHE_TTL, total)
+    _total_cache.move_to_end(cache_key)
+    while len(_total_cache) > TOTAL_CACHE_SIZE:
+        _total_cache.popitem(last=False)
+    return total
+
+
+def optional_total(query, table_name, filtered):
+    """Total for cursor mode, chosen by the total= query parameter.
+
+    total=exact     count(*) on every request
+    total=cached    exact count, reused for TOTAL_CACHE_TTL seconds per endpoint and filter set
+    total=estimate  table statistics when unfiltered, otherwise the cached count
+    anything else   no total (None), the cheapest option and the default
+    """
+    mode = request.args.get("total", "none")
+    if mode == "exact":
+        return query.order_by(None).count()
+    if mode == "estimate" and not filtered:
+        estimate = _estimated_table_rows(table_name)
+        if estimate is not None:
+            return int(estimate)
+    if mode in ("cached", "estimate"):
+        filters = sorted((k, v) for k, v in request.args.items(multi=True) if k not in ("cursor", "total", "page", "per_page"))
+        user_id = getattr(getattr(request, "current_user", None), "id", None)
+        return _cached_count(query, (request.endpoint, user_id, tuple(filters)))
+    return None
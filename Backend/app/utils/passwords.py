@@ -0,0 +1,184 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from werkzeug.security import check_password_hash
+from app.utils.log import get_logger
+
+log = get_logger("passwords")
+
+BCRYPT_PREFIXES = ("$2b$", "$2a$", "$2y$")
+WERKZEUG_PREFIXES = ("pbkdf2:", "scrypt:")  # Legacy security.hash_password hashes
+LATENCY_SAMPLES = 512  # Recent durations kept per operation for percentiles
+
+# Pool processes must not be forked from a threaded worker: a lock held by another thread at
+# fork time (log queue, profiler, EXPLAIN capture) stays locked forever in the child.
+# Pool processes re-import the __main__ module, so scripts that hash need a __main__ guard.
+POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class PasswordServiceBusy(RuntimeError):
+    """Raised when the hashing pool is saturated; callers should answer 503"""
+
+
+# ------------------- Pool Work (must be picklable) -------------------
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(password, stored):
+    if stored.startswith(BCRYPT_PREFIXES):
+        try:
+            return bcrypt.checkpw(password.encode("utf-8"), stored.encode("utf-8"))
+        except ValueError:
+            return False
+    if stored.startswith(WERKZEUG_PREFIXES):
+        return check_password_hash(stored, password)
+    return False
+
+
+# ------------------- Service -------------------
+class PasswordHasher:
+    """bcrypt hashing and verification in a bounded process pool.
+
+    Each call burns 100-300ms of CPU at cost 12. Capping them at `workers` processes
+    leaves CPU for the other endpoints during a login burst; callers beyond max_pending
+    wait up to `timeout` and then get PasswordServiceBusy. The pool is created lazily
+    so every gunicorn worker starts its own after fork.
+    """
+
+    def __init__(self, rounds=12, workers=2, max_pending=16, timeout=10.0):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._latency = {"hash": deque(maxlen=LATENCY_SAMPLES), "verify": deque(maxlen=LATENCY_SAMPLES)}
+        self._counts = {"hash": 0, "verify": 0, "rehash": 0, "rejected": 0, "inline": 0}
+
+    def configure(self, rounds, workers, max_pending, timeout):
+        with self._lock:
+            self.rounds = rounds
+            self.workers = workers
+            self.max_pending = max_pending
+            self.timeout = timeout
+            self._slots = threading.BoundedSemaphore(max_pending)
+            self._shutdown_pool()
+
+    def _shutdown_pool(self):
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._pool_pid = None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None or self._pool_pid != os.getpid():
+                # A pool inherited through fork belongs to the parent; start a fresh one
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(POOL_START_METHOD)
+                ) if self.workers > 0 else None
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def _run(self, operation, fn, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            self._counts["rejected"] += 1
+            log.warning("Password %s rejected: %s operations already pending", operation, self.max_pending)
+            raise PasswordServiceBusy("Too many password operations in progress, please retry")
+        started = time.perf_counter()
+        try:
+            pool = self._get_pool()
+            if pool is None:
+                self._counts["inline"] += 1
+                return fn(*args)
+            try:
+                return pool.submit(fn, *args).result(timeout=self.timeout)
+            except BrokenProcessPool:
+                log.exception("Password hashing pool broke; restarting it")
+                with self._lock:
+                    self._shutdown_pool()
+                self._counts["inline"] += 1
+                return fn(*args)
+            except FutureTimeoutError:
+                raise PasswordServiceBusy("Password operation timed out, please retry")
+        finally:
+            self._slots.release()
+            self._latency[operation].append(time.perf_counter() - started)
+            self._counts[operation] += 1
+
+    def hash(self, password):
+        """bcrypt hash of password at the configured cost"""
+        return self._run("hash", _hash, password, self.rounds)
+
+    def verify(self, password, stored):
+        """(matches, needs_rehash) for a plaintext password against a stored hash"""
+        if not password or not stored:
+            return False, False
+        matches = self._run("verify", _verify, password, stored)
+        return matches, matches and self.needs_rehash(stored)
+
+    def needs_rehash(self, stored):
+        """True for legacy (werkzeug) hashes and bcrypt hashes at a different cost"""
+        if not stored.startswith(BCRYPT_PREFIXES):
+            return True
+        try:
+            return int(stored.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def record_rehash(self):
+        self._counts["rehash"] += 1
+
+    def stats(self):
+        """Counters plus latency percentiles (ms) over the most recent operations"""
+        latency = {}
+        for operation, samples in self._latency.items():
+            ordered = sorted(samples)
+            if not ordered:
+                latency[operation] = {"samples": 0}
+                continue
+            pick = lambda q: round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 2)
+            latency[operation] = {
+                "samples": len(ordered),
+                "avg_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+                "p50_ms": pick(0.50),
+                "p95_ms": pick(0.95),
+                "max_ms": round(ordered[-1] * 1000, 2)
+            }
+        return {
+            "rounds": self.rounds,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "counts": dict(self._counts),
+            "latency": latency
+        }
+
+
+password_hasher = PasswordHasher()
+
+
+def hash_password(password):
+    return password_hasher.hash(password)
+
+
+def verify_password(password, stored):
+    """(matches, needs_rehash); see PasswordHasher.verify"""
+    return password_hasher.verify(password, stored)
+
+
+def init_password_hasher(app):
+    """Configure the hashing service from PASSWORD_HASH_* settings"""
+    password_hasher.configure(
+        rounds=app.config.get("PASSWORD_HASH_ROUNDS", 12),
+        workers=app.config.get("PASSWORD_HASH_WORKERS", 2),
+        max_pending=app.config.get("PASSWORD_HASH_MAX_PENDING", 16),
+        timeout=app.config.get("PASSWORD_HASH_TIMEOUT", 10.0)
+    )
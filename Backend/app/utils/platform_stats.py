@@ -0,0 +1,239 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from app.extensions import db
+from app.models.booking import Booking
+from app.models.category import Category
+from app.models.complaint import Complaint
+from app.models.daily_platform_stat import DailyPlatformStat
+from app.models.RentalItem import RentalItem
+from app.models.user import User
+from app.utils.ledger import revenue_qualifies, revenue_qualifies_clause
+from app.utils.upsert import increment, money, track_flushes
+
+_stats = DailyPlatformStat.__table__
+_listeners_registered = False
+
+# Row states of tracked objects captured before a flush, keyed by session
+_SNAPSHOT_KEY = "platform_stats_snapshot"
+
+# Default series for the dashboard trend charts
+DASHBOARD_TREND_METRICS = ("users.total", "bookings.total", "revenue.service_fees", "payments.held",
+                           "complaints.status.Pending")
+
+
+# ------------------- Metric Contributions -------------------
+# Each tracked model maps the columns it is read with to the metrics one row contributes.
+# A write's effect is contributions(after) - contributions(before), summed per metric.
+
+def _user_metrics(role):
+    return {"users.total": 1, f"users.role.{role or 'user'}": 1}
+
+
+def _booking_metrics(status, payment_status, admin_approved, payment_amount, service_fee):
+    metrics = {"bookings.total": 1, f"bookings.status.{status}": 1}
+    if payment_status == "HELD":
+        metrics["payments.held"] = 1
+        metrics["payments.held_amount"] = money(payment_amount)
+    if revenue_qualifies(status, payment_status, admin_approved):
+        metrics["revenue.service_fees"] = money(service_fee)
+        metrics["revenue.payments"] = money(payment_amount)
+    return metrics
+
+
+def _complaint_metrics(status):
+    return {"complaints.total": 1, f"complaints.status.{status}": 1}
+
+
+_TRACKED = {
+    User: ((User.role,), _user_metrics),
+    Booking: ((Booking.status, Booking.payment_status, Booking.admin_approved, Booking.payment_amount,
+               Booking.service_fee), _booking_metrics),
+    Complaint: ((Complaint.status,), _complaint_metrics),
+    RentalItem: ((), lambda: {"rental_items.total": 1}),
+    Category: ((), lambda: {"categories.total": 1}),
+}
+
+
+def _row_states(connection, model, ids):
+    """{id: column values} for rows of a tracked model, as currently visible to the transaction"""
+    if not ids:
+        return {}
+    columns, _ = _TRACKED[model]
+    rows = connection.execute(select(model.id, *columns).where(model.id.in_(list(ids))))
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def _contributions(model, states):
+    _, metrics_for = _TRACKED[model]
+    totals = Counter()
+    for values in states.values():
+        for metric, value in metrics_for(*values).items():
+            totals[metric] += value
+    return totals
+
+
+def apply_deltas(connection, day, deltas):
+    """Add per-metric deltas to the day's rows, creating missing rows"""
+    now = datetime.utcnow()
+    for metric, delta in deltas.items():
+        if delta:
+            increment(connection, _stats, ("day", "metric"),
+                      {"day": day, "metric": metric, "delta": delta, "updated_at": now}, {"delta": delta})
+
+
+def _apply_changes(connection, before, after):
+    deltas = Counter()
+    for model, states in after.items():
+        deltas.update(_contributions(model, states))
+        deltas.subtract(_contributions(model, before.get(model, {})))
+    apply_deltas(connection, datetime.utcnow().date(), deltas)
+
+
+def register_platform_stats_listeners():
+    """Keep today's daily_platform_stats deltas in step with writes, inside the same transaction"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    track_flushes(_SNAPSHOT_KEY, _TRACKED, _row_states, _apply_changes)
+    _listeners_registered = True
+
+
+# ------------------- Reading -------------------
+def compute_totals():
+    """Every metric's current value, counted from the source tables (a handful of grouped queries)"""
+    totals = Counter()
+    for role, count in db.session.query(User.role, db.func.count(User.id)).group_by(User.role):
+        totals.update(_scaled(_user_metrics(role), count))
+
+    held = db.case((Booking.payment_status == "HELD", 1), else_=0)
+    held_amount = db.case((Booking.payment_status == "HELD", Booking.payment_amount), else_=0)
+    qualifying = revenue_qualifies_clause()
+    rows = db.session.query(
+        Booking.status, db.func.count(Booking.id), db.func.sum(held), db.func.sum(held_amount),
+        db.func.sum(db.case((qualifying, Booking.service_fee), else_=0)),
+        db.func.sum(db.case((qualifying, Booking.payment_amount), else_=0))
+    ).group_by(Booking.status)
+    for status, count, held_count, held_sum, fees, payments in rows:
+        totals["bookings.total"] += count
+        totals[f"bookings.status.{status}"] += count
+        totals["payments.held"] += int(held_count or 0)
+        totals["payments.held_amount"] += money(held_sum)
+        totals["revenue.service_fees"] += money(fees)
+        totals["revenue.payments"] += money(payments)
+
+    for status, count in db.session.query(Complaint.status, db.func.count(Complaint.id)).group_by(Complaint.status):
+        totals.update(_scaled(_complaint_metrics(status), count))
+    totals["rental_items.total"] = db.session.query(db.func.count(RentalItem.id)).scalar()
+    totals["categories.total"] = db.session.query(db.func.count(Category.id)).scalar()
+    return totals
+
+
+def _scaled(metrics, count):
+    return {metric: value * count for metric, value in metrics.items()}
+
+
+def _last_closed_day():
+    return db.session.query(db.func.max(DailyPlatformStat.day)).filter(DailyPlatformStat.total.isnot(None)).scalar()
+
+
+def current_totals():
+    """Current value of every metric: the last closing totals plus the deltas written since.
+
+    Falls back to compute_totals() until the close job has run once.
+    """
+    closed_day = _last_closed_day()
+    if closed_day is None:
+        return compute_totals()
+    totals = Counter()
+    for metric, total in db.session.query(DailyPlatformStat.metric, DailyPlatformStat.total) \
+            .filter(DailyPlatformStat.day == closed_day, DailyPlatformStat.total.isnot(None)):
+        totals[metric] += money(total)
+    for metric, delta in db.session.query(DailyPlatformStat.metric, db.func.sum(DailyPlatformStat.delta)) \
+            .filter(DailyPlatformStat.day > closed_day).group_by(DailyPlatformStat.metric):
+        totals[metric] += money(delta)
+    return totals
+
+
+def daily_series(metrics, days=30):
+    """[{"day", metric: value, ...}] for the last `days` days, today included (live).
+
+    Days with a stored closing total use it; others carry the previous value forward plus
+    that day's delta.
+    """
+    today = datetime.utcnow().date()
+    first_day = today - timedelta(days=days - 1)
+    rows = db.session.query(DailyPlatformStat.day, DailyPlatformStat.metric, DailyPlatformStat.delta,
+                            DailyPlatformStat.total) \
+        .filter(DailyPlatformStat.day >= first_day, DailyPlatformStat.metric.in_(metrics)).all()
+    by_day = {}
+    for day, metric, delta, total in rows:
+        by_day.setdefault(day, {})[metric] = (delta, total)
+
+    # Opening values: the latest closing total before the window plus any deltas after it
+    opening = Counter()
+    for metric in metrics:
+        last = db.session.query(DailyPlatformStat.day, DailyPlatformStat.total) \
+            .filter(DailyPlatformStat.metric == metric, DailyPlatformStat.day < first_day,
+                    DailyPlatformStat.total.isnot(None)) \
+            .order_by(DailyPlatformStat.day.desc()).first()
+        since = last[0] if last else None
+        delta_query = db.session.query(db.func.sum(DailyPlatformStat.delta)) \
+            .filter(DailyPlatformStat.metric == metric, DailyPlatformStat.day < first_day)
+        if since is not None:
+            delta_query = delta_query.filter(DailyPlatformStat.day > since)
+        opening[metric] = money(last[1] if last else 0) + money(delta_query.scalar())
+
+    series = []
+    values = dict(opening)
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        point = {"day": day.isoformat()}
+        for metric in metrics:
+            delta, total = by_day.get(day, {}).get(metric, (0, None))
+            values[metric] = money(total) if total is not None else values[metric] + money(delta)
+            point[metric] = float(values[metric])
+        series.append(point)
+    return series
+
+
+# ------------------- Nightly Close -------------------
+def close_day(day=None):
+    """Store closing totals for `day` (default: yesterday, UTC) from a fresh count of the source tables.
+
+    Returns {metric: (expected, actual)} for metrics whose rolled-up value had drifted from the
+    recount; the recount always wins.
+    """
+    day = day or datetime.utcnow().date() - timedelta(days=1)
+    actual_now = compute_totals()
+    # Writes made after `day` are not part of its closing value
+    later = dict(db.session.query(DailyPlatformStat.metric, db.func.sum(DailyPlatformStat.delta))
+                 .filter(DailyPlatformStat.day > day).group_by(DailyPlatformStat.metric).all())
+
+    previous_day = db.session.query(db.func.max(DailyPlatformStat.day)) \
+        .filter(DailyPlatformStat.day < day, DailyPlatformStat.total.isnot(None)).scalar()
+    expected = Counter()
+    if previous_day is not None:
+        for metric, total in db.session.query(DailyPlatformStat.metric, DailyPlatformStat.total) \
+                .filter(DailyPlatformStat.day == previous_day, DailyPlatformStat.total.isnot(None)):
+            expected[metric] += money(total)
+        for metric, delta in db.session.query(DailyPlatformStat.metric, db.func.sum(DailyPlatformStat.delta)) \
+                .filter(DailyPlatformStat.day > previous_day, DailyPlatformStat.day <= day) \
+                .group_by(DailyPlatformStat.metric):
+            expected[metric] += money(delta)
+
+    stored = {metric for (metric,) in db.session.query(DailyPlatformStat.metric)
+              .filter(DailyPlatformStat.day == day)}
+    drifted = {}
+    now = datetime.utcnow()
+    for metric in set(actual_now) | set(expected) | set(later):
+        closing = money(actual_now.get(metric, 0)) - money(later.get(metric, 0))
+        if previous_day is not None and money(expected.get(metric, 0)) != closing:
+            drifted[metric] = (float(expected.get(metric, 0)), float(closing))
+        if metric in stored:
+            db.session.query(DailyPlatformStat).filter_by(day=day, metric=metric) \
+                .update({"total": closing, "updated_at": now})
+        else:
+            db.session.add(DailyPlatformStat(day=day, metric=metric, delta=0, total=closing, updated_at=now))
+    db.session.commit()
+    return drifted
@@ -0,0 +1,184 @@
+import json
+from datetime import date
+from app.extensions import db
+from app.models.RentalItem import RentalItem
+from app.utils.attribute_index import parse_number, parse_date
+
+# Field conventions for rates in dynamic_data; the daily rate uses the same fields as the listing pages
+DAILY_RATE_FIELDS = ("Price", "price", "Daily Rate", "daily_rate", "Hourly Rate", "hourly_rate", "Cost", "cost")
+WEEKLY_RATE_FIELDS = ("Weekly Rate", "weekly_rate", "Weekly Price", "weekly_price")
+MONTHLY_RATE_FIELDS = ("Monthly Rate", "monthly_rate", "Monthly Price", "monthly_price")
+_RATE_HINTS = ("price", "cost", "rate")
+_SKIPPED_FIELD_HINTS = ("image", "photo")
+
+MAX_QUOTES_PER_REQUEST = 200
+MAX_RENTAL_DAYS = 730
+
+START_DATE_HINTS = ("start", "begin")
+END_DATE_HINTS = ("end", "finish", "return")
+
+
+class PricingError(ValueError):
+    """Raised when a quote cannot be produced for the requested dates"""
+
+
+# ------------------- Price Rules -------------------
+def daily_rate(data):
+    """Daily rate of an item from its dynamic_data, or None if it has none"""
+    for field in DAILY_RATE_FIELDS:
+        rate = parse_number(data.get(field))
+        if rate is not None:
+            return rate
+    for field_name, value in data.items():
+        lowered = field_name.lower()
+        if any(hint in lowered for hint in _SKIPPED_FIELD_HINTS) or not any(hint in lowered for hint in _RATE_HINTS):
+            continue
+        if "week" in lowered or "month" in lowered:
+            continue
+        rate = parse_number(value)
+        if rate is not None and rate > 0:
+            return rate
+    return None
+
+
+def _first_rate(data, fields):
+    for field in fields:
+        rate = parse_number(data.get(field))
+        if rate is not None and rate > 0:
+            return rate
+    return None
+
+
+class PriceRules:
+    """Rates of one rental item: a daily rate plus optional weekly and monthly (30 day) rates"""
+
+    def __init__(self, daily, weekly=None, monthly=None):
+        self.daily = daily
+        self.weekly = weekly
+        self.monthly = monthly
+
+    @classmethod
+    def from_dynamic_data(cls, data):
+        """PriceRules for an item, or None if it has no usable daily rate"""
+        rate = daily_rate(data)
+        if rate is None or rate <= 0:
+            return None
+        return cls(rate, _first_rate(data, WEEKLY_RATE_FIELDS), _first_rate(data, MONTHLY_RATE_FIELDS))
+
+    def price(self, days):
+        """Cheapest total for a number of days; (total, breakdown)"""
+        best = None
+        month_options = range(-(-days // 30) + 1) if self.monthly else (0,)
+        for months in month_options:
+            remaining = max(days - 30 * months, 0)
+            week_options = {remaining // 7, -(-remaining // 7)} if self.weekly else {0}
+            for weeks in week_options:
+                extra_days = max(remaining - 7 * weeks, 0)
+                total = months * (self.monthly or 0) + weeks * (self.weekly or 0) + extra_days * self.daily
+                if best is None or total < best[0]:
+                    best = (total, {"months": months, "weeks": weeks, "days": extra_days})
+        return round(best[0], 2), best[1]
+
+    def to_dict(self):
+        return {"daily_rate": self.daily, "weekly_rate": self.weekly, "monthly_rate": self.monthly}
+
+
+def load_price_rules(item_ids):
+    """{item_id: PriceRules or None} for the given items, in a single query"""
+    rules = {}
+    if not item_ids:
+        return rules
+    rows = db.session.query(RentalItem.id, RentalItem.dynamic_data) \
+        .filter(RentalItem.id.in_(list(item_ids))).all()
+    for item_id, raw_data in rows:
+        try:
+            data = json.loads(raw_data) if raw_data else {}
+        except (json.JSONDecodeError, TypeError):
+            data = {}
+        rules[item_id] = PriceRules.from_dynamic_data(data) if isinstance(data, dict) else None
+    return rules
+
+
+# ------------------- Quoting -------------------
+def rental_days(start, end, today=None):
+    """Number of billed days between two dates, validated like the booking form"""
+    today = today or date.today()
+    if start < today:
+        raise PricingError("Start date must be today or later")
+    days = end.toordinal() - start.toordinal()
+    if days < 1:
+        raise PricingError("End date must be at least 1 day after start date")
+    if days > MAX_RENTAL_DAYS:
+        raise PricingError(f"Rentals are limited to {MAX_RENTAL_DAYS} days")
+    return days
+
+
+def quote_many(requests, today=None):
+    """Price many (item_id, start, end) tuples; dates may be date objects or ISO strings.
+
+    Rules are loaded once per distinct item and each distinct day count is priced once
+    per item, so large batches cost one query plus integer arithmetic. Returns one dict
+    per request, in order, with either the quote or an "error".
+    """
+    today = today or date.today()
+    rules_by_item = load_price_rules({item_id for item_id, _, _ in requests if item_id is not None})
+    priced = {}
+    quotes = []
+    for item_id, start, end in requests:
+        quote = {"item_id": item_id, "start_date": str(start) if start else None, "end_date": str(end) if end else None}
+        rules = rules_by_item.get(item_id)
+        start_date = start if isinstance(start, date) else parse_date(start)
+        end_date = end if isinstance(end, date) else parse_date(end)
+        try:
+            if item_id not in rules_by_item:
+                raise PricingError("Rental item not found")
+            if rules is None:
+                raise PricingError("Rental item has no price")
+            if not start_date or not end_date:
+                raise PricingError("start_date and end_date must be YYYY-MM-DD dates")
+            days = rental_days(start_date, end_date, today)
+        except PricingError as e:
+            quote["error"] = str(e)
+            quotes.append(quote)
+            continue
+
+        key = (item_id, days)
+        if key not in priced:
+            priced[key] = rules.price(days)
+        total, breakdown = priced[key]
+        quote.update({
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "rental_days": days,
+            "total_price": total,
+            "breakdown": breakdown,
+            **rules.to_dict()
+        })
+        quotes.append(quote)
+    return quotes
+
+
+def extract_rental_dates(requirements_data):
+    """(start, end) dates from booking requirements, matching field names like the booking form"""
+    start = end = None
+    for field_name, value in requirements_data.items():
+        lowered = str(field_name).lower()
+        parsed = parse_date(value) if isinstance(value, str) else None
+        if not parsed:
+            continue
+        if start is None and any(hint in lowered for hint in START_DATE_HINTS):
+            start = parsed
+        elif end is None and any(hint in lowered for hint in END_DATE_HINTS):
+            end = parsed
+    return start, end
+
+
+def quote_booking(rental_item_id, requirements_data, today=None):
+    """Server-side price of a booking request; raises PricingError if it cannot be priced"""
+    start, end = extract_rental_dates(requirements_data)
+    if not start or not end:
+        raise PricingError("Rental start and end dates are required to calculate the price")
+    quote = quote_many([(rental_item_id, start, end)], today)[0]
+    if "error" in quote:
+        raise PricingError(quote["error"])
+    return quote
@@ -0,0 +1,219 @@
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from flask import Response, g, request
+from app.utils.auth_cache import load_principal
+from app.utils.log import get_logger
+from app.utils.security import get_request_token, verify_jwt
+from app.utils.tokens import is_access_token_revoked
+
+log = get_logger("profiling")
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ARG = "_profile"
+_PROFILE_ID = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack every interval seconds from a helper thread.
+
+    The profiled code is not instrumented at all; the cost is the helper thread walking
+    the target's frames, roughly 1-3% at the default 5ms interval. Stacks are kept in the
+    "folded" format (root;...;leaf count) read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _short_path(filename):
+    # Keep paths short and host-independent: "app/routes/owner.py", "sqlalchemy/orm/query.py"
+    index = filename.rfind(f"{os.sep}app{os.sep}")
+    if index != -1:
+        return filename[index + 1:]
+    for marker in (f"site-packages{os.sep}", f"dist-packages{os.sep}"):
+        index = filename.rfind(marker)
+        if index != -1:
+            return filename[index + len(marker):]
+    return os.path.basename(filename)
+
+
+class ProfileStore:
+    """Profiles written as .folded files to PROFILING_DIR, keeping only the newest PROFILING_KEEP"""
+
+    def __init__(self):
+        self.directory = None
+        self.keep = 50
+
+    def save(self, endpoint, profiler):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        profile_id = f"{stamp}-{(endpoint or 'unmatched').replace('.', '_')}-{uuid.uuid4().hex[:8]}"
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(profile_id), "w", encoding="utf-8") as handle:
+            handle.write(profiler.folded())
+        self._prune()
+        return profile_id
+
+    def _path(self, profile_id):
+        return os.path.join(self.directory, profile_id + ".folded")
+
+    def _prune(self):
+        for profile in self.list()[self.keep:]:
+            try:
+                os.remove(self._path(profile["id"]))
+            except OSError:
+                pass
+
+    def list(self):
+        """Stored profiles, newest first"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".folded"):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            profiles.append({
+                "id": name[:-len(".folded")],
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(timespec="seconds")
+            })
+        return sorted(profiles, key=lambda profile: profile["id"], reverse=True)
+
+    def read(self, profile_id):
+        """Folded stacks of a stored profile, or None"""
+        if not self.directory or not _PROFILE_ID.match(profile_id or ""):
+            return None
+        try:
+            with open(self._path(profile_id), encoding="utf-8") as handle:
+                return handle.read()
+        except OSError:
+            return None
+
+
+profile_store = ProfileStore()
+
+
+# ------------------- Request Hooks -------------------
+def _profiling_mode():
+    """"store" or "folded" when the request asks to be profiled, else None (the common, cheap path)"""
+    value = request.headers.get(PROFILE_HEADER)
+    if value is None and PROFILE_ARG in request.args:
+        value = request.args.get(PROFILE_ARG)
+    if value is None:
+        return None
+    return "folded" if value.strip().lower() == "folded" else "store"
+
+
+def _is_admin_token(token):
+    payload = verify_jwt(token) if token else None
+    if not payload or is_access_token_revoked(payload):
+        return False
+    user = load_principal(payload.get("user_id"))
+    return bool(user and user.is_active and user.role == "admin" and payload.get("ver", 0) == user.auth_version)
+
+
+def _requested_by_admin():
+    # X-Profile-Token lets an admin profile an endpoint of another role (e.g. the owner
+    # dashboard) while Authorization carries that user's own token
+    token = request.headers.get(PROFILE_TOKEN_HEADER)
+    return _is_admin_token(token) or (token is None and _is_admin_token(get_request_token()))
+
+
+def init_profiling(app):
+    """Profile single requests on demand: admins send "X-Profile: 1" (stored) or "X-Profile: folded" (returned)"""
+    if not app.config.get("PROFILING_ENABLED", True):
+        return
+    interval = app.config.get("PROFILING_INTERVAL_MS", 5) / 1000.0
+    profile_store.directory = app.config.get("PROFILING_DIR", os.path.join(os.getcwd(), "logs", "profiles"))
+    profile_store.keep = app.config.get("PROFILING_KEEP", 50)
+    # One profiled request at a time per worker keeps the sampling cost bounded
+    slot = threading.Lock()
+
+    @app.before_request
+    def _start_profiler():
+        mode = _profiling_mode()
+        if mode is None or request.method == "OPTIONS":
+            return
+        if not _requested_by_admin():
+            log.info("Ignored profiling request on %s without an admin token", request.path)
+            return
+        if not slot.acquire(blocking=False):
+            g.profile_busy = True
+            return
+        profiler = SamplingProfiler(threading.get_ident(), interval)
+        g.profiler = (profiler, mode)
+        profiler.start()
+
+    @app.after_request
+    def _finish_profiler(response):
+        if g.pop("profile_busy", False):
+            response.headers[PROFILE_HEADER] = "busy"
+            return response
+        profiling = g.pop("profiler", None)
+        if profiling is None:
+            return response
+        profiler, mode = profiling
+        try:
+            profiler.stop()
+        finally:
+            slot.release()
+        log.info("Profiled %s: %.1fms, %s samples", request.endpoint, profiler.duration * 1000, profiler.samples,
+                 extra={"endpoint": request.endpoint, "samples": profiler.samples})
+        if mode == "folded":
+            folded = Response(profiler.folded(), mimetype="text/plain")
+            folded.headers["X-Profile-Status"] = str(response.status_code)
+            folded.headers["X-Profile-Duration"] = f"{profiler.duration * 1000:.1f}ms"
+            return folded
+        try:
+            response.headers["X-Profile-Id"] = profile_store.save(request.endpoint, profiler)
+        except OSError as e:
+            log.warning("Could not store profile: %s", e)
+        return response
+
+    @app.teardown_request
+    def _drop_profiler(exc):
+        # after_request is skipped when the view raised; never leave the sampler running
+        profiling = g.pop("profiler", None)
+        if profiling is not None:
+            profiling[0].stop()
+            slot.release()
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.log import get_logger
+
+log = get_logger("query_stats")
+
+_local = threading.local()
+_START_KEY = "query_stats_start"
+
+
+class QueryStats:
+    """Statements run (and time spent in the database) while a recorder was active"""
+
+    def __init__(self, label=None):
+        self.label = label
+        self.count = 0
+        self.total_time = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold):
+        """[(statement, times)] run at least threshold times: probable N+1 queries"""
+        return [(statement, times) for statement, times in self.statements.most_common() if times >= threshold]
+
+    def report(self, limit=10):
+        lines = [f"{self.count} queries, {self.total_time * 1000:.1f}ms in the database"]
+        for statement, times in self.statements.most_common(limit):
+            lines.append(f"  {times}x {_shorten(statement)}")
+        return "\n".join(lines)
+
+
+def _shorten(statement, length=200):
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+def _recorders():
+    recorders = getattr(_local, "recorders", None)
+    if recorders is None:
+        recorders = _local.recorders = []
+    return recorders
+
+
+@contextmanager
+def record_queries(label=None):
+    """Count the statements this thread runs inside the block: `with record_queries() as stats:`"""
+    stats = QueryStats(label)
+    recorders = _recorders()
+    recorders.append(stats)
+    try:
+        yield stats
+    finally:
+        recorders.remove(stats)
+
+
+@contextmanager
+def assert_max_queries(limit):
+    """Fail unless the block runs at most limit statements, e.g. around test_client().get(...).
+
+    Requests made through the Flask test client run on the calling thread, so they are counted.
+    """
+    with record_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.report()}")
+
+
+# ------------------- Engine Events -------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_local, "recorders", None):
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    for stats in getattr(_local, "recorders", ()):
+        stats.record(statement, elapsed)
+
+
+# ------------------- Request Hooks -------------------
+def init_query_stats(app):
+    """Count statements per request; add X-DB-Queries / X-DB-Time headers and flag N+1 patterns"""
+    if not app.config.get("QUERY_STATS_ENABLED", True):
+        return
+    headers = app.config.get("QUERY_STATS_HEADERS", False)
+    threshold = app.config.get("QUERY_STATS_N_PLUS_ONE_THRESHOLD", 10)
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def _start_query_stats():
+        stats = QueryStats(request.endpoint)
+        _recorders().append(stats)
+        g.query_stats = stats
+
+    @app.after_request
+    def _finish_query_stats(response):
+        stats = g.pop("query_stats", None)
+        if stats is None:
+            return response
+        _stop(stats)
+        if headers:
+            response.headers["X-DB-Queries"] = str(stats.count)
+            response.headers["X-DB-Time"] = f"{stats.total_time * 1000:.1f}ms"
+        for statement, times in stats.repeated(threshold):
+            log.warning("Probable N+1 on %s: %s runs of %s", stats.label, times, _shorten(statement),
+                        extra={"endpoint": stats.label, "repeats": times})
+        return response
+
+    @app.teardown_request
+    def _drop_query_stats(exc):
+        stats = g.pop("query_stats", None)
+        if stats is not None:
+            _stop(stats)
+
+
+def _stop(stats):
+    recorders = _recorders()
+    if stats in recorders:
+        recorders.remove(stats)
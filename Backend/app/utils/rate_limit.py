@@ -0,0 +1,175 @@
+import math
+import re
+import threading
+import time
+from flask import request, jsonify
+from app.utils.log import get_logger
+
+log = get_logger("rate_limit")
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_SPEC = re.compile(r"^\s*(\d+)\s*/\s*(second|minute|hour|day)s?\s*$")
+
+
+class RateLimit:
+    """A parsed "<count>/<period>" rule: at most count requests per period, bursting up to count"""
+
+    def __init__(self, name, spec):
+        match = _SPEC.match(spec or "")
+        if not match or int(match.group(1)) < 1:
+            raise ValueError(f"Invalid rate limit for {name}: {spec!r} (expected e.g. '10/minute')")
+        self.name = name
+        self.spec = spec
+        self.count = int(match.group(1))
+        self.period = _PERIODS[match.group(2)]
+        self.interval = self.period / self.count  # Seconds for one token to refill
+
+
+# ------------------- Backends -------------------
+# Buckets are kept as GCRA state: a token bucket of capacity `count` refilling one token per
+# `interval` is equivalent to remembering a single "theoretical arrival time" (TAT) per key.
+# A request is allowed when TAT - now <= (count - 1) * interval, and then moves TAT forward
+# by one interval; once TAT is in the past the bucket is full and the key can be forgotten.
+
+class MemoryBackend:
+    """Per-worker buckets: one float per active key, swept every evict_interval seconds"""
+
+    shared = False
+
+    def __init__(self, evict_interval=60):
+        self._tat = {}
+        self._lock = threading.Lock()
+        self._evict_interval = evict_interval
+        self._next_evict = time.monotonic() + evict_interval
+
+    def hit(self, key, limit):
+        """(allowed, retry_after_seconds) for one request against key"""
+        now = time.monotonic()
+        with self._lock:
+            tat = max(self._tat.get(key, now), now)
+            allow_at = tat - (limit.count - 1) * limit.interval
+            if allow_at > now:
+                return False, allow_at - now
+            self._tat[key] = tat + limit.interval
+            if now >= self._next_evict:
+                self._tat = {k: t for k, t in self._tat.items() if t > now}
+                self._next_evict = now + self._evict_interval
+            return True, 0.0
+
+    def __len__(self):
+        return len(self._tat)
+
+
+class RedisBackend:
+    """Buckets shared by every worker and host, one Redis key per bucket (needs the redis package)"""
+
+    shared = True
+
+    _SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local interval = tonumber(ARGV[2])
+    local burst = tonumber(ARGV[3])
+    local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+    if tat < now then tat = now end
+    local allow_at = tat - (burst - 1) * interval
+    if allow_at > now then return tostring(allow_at - now) end
+    redis.call('SET', KEYS[1], tostring(tat + interval), 'PX', math.ceil((tat + interval - now) * 1000))
+    return '0'
+    """
+
+    def __init__(self, url):
+        import redis  # Optional dependency, only needed when RATE_LIMIT_STORAGE_URL is redis://
+        self._client = redis.Redis.from_url(url, socket_timeout=0.25)
+        self._script = self._client.register_script(self._SCRIPT)
+
+    def hit(self, key, limit):
+        try:
+            retry_after = float(self._script(keys=[f"ratelimit:{key}"],
+                                             args=[time.time(), limit.interval, limit.count]))
+        except Exception as e:
+            # Fail open: an unreachable limiter must not take the API down with it
+            log.warning("Rate limit backend unavailable, allowing request: %s", e)
+            return True, 0.0
+        return retry_after <= 0, retry_after
+
+
+def create_backend(url):
+    """Backend for RATE_LIMIT_STORAGE_URL: "memory://" (default) or "redis://host:port/db" """
+    if url and url.startswith(("redis://", "rediss://")):
+        try:
+            return RedisBackend(url)
+        except ImportError:
+            log.warning("RATE_LIMIT_STORAGE_URL is %s but redis is not installed; using per-worker buckets", url)
+    return MemoryBackend()
+
+
+# ------------------- Limiter -------------------
+class RateLimiter:
+    """Applies RATE_LIMITS rules (by endpoint, else by blueprint) before each request"""
+
+    def __init__(self):
+        self.enabled = False
+        self.backend = MemoryBackend()
+        self.rules = {}
+        self.proxy_count = 0
+        self.stats = {"allowed": 0, "limited": 0}
+
+    def configure(self, rules, backend, proxy_count=0, enabled=True):
+        self.rules = {name: RateLimit(name, spec) for name, spec in rules.items()}
+        self.backend = backend
+        self.proxy_count = proxy_count
+        self.enabled = enabled
+
+    def rule_for(self, endpoint, blueprint):
+        return self.rules.get(endpoint) or self.rules.get(blueprint)
+
+    def client_ip(self):
+        """Client address, taken from X-Forwarded-For as seen by the last trusted proxy"""
+        if self.proxy_count:
+            forwarded = [part.strip() for part in request.headers.get("X-Forwarded-For", "").split(",") if part.strip()]
+            if len(forwarded) >= self.proxy_count:
+                return forwarded[-self.proxy_count]
+        return request.remote_addr or "unknown"
+
+    def identity(self):
+        """Bucket identity: the user for a valid access token, otherwise the client IP"""
+        from app.utils.security import get_request_token, verify_jwt
+        token = get_request_token()
+        payload = verify_jwt(token) if token else None
+        if payload and payload.get("user_id") is not None:
+            return f"user:{payload['user_id']}"
+        return f"ip:{self.client_ip()}"
+
+    def check_request(self):
+        if not self.enabled or request.method == "OPTIONS":
+            return None
+        limit = self.rule_for(request.endpoint, request.blueprint)
+        if limit is None:
+            return None
+        identity = self.identity()
+        allowed, retry_after = self.backend.hit(f"{limit.name}:{identity}", limit)
+        if allowed:
+            self.stats["allowed"] += 1
+            return None
+
+        self.stats["limited"] += 1
+        retry_after = max(1, math.ceil(retry_after))
+        log.info("Rate limited %s on %s (%s), retry in %ss", identity, request.path, limit.spec, retry_after)
+        response = jsonify({"error": "Too many requests, please slow down", "retry_after": retry_after})
+        response.status_code = 429
+        response.headers["Retry-After"] = str(retry_after)
+        return response
+
+
+rate_limiter = RateLimiter()
+
+
+def init_rate_limiter(app):
+    """Configure limits from RATE_LIMIT_* settings and check them before every request"""
+    rate_limiter.configure(
+        rules=app.config.get("RATE_LIMITS", {}),
+        backend=create_backend(app.config.get("RATE_LIMIT_STORAGE_URL", "memory://")),
+        proxy_count=app.config.get("RATE_LIMIT_PROXY_COUNT", 0),
+        enabled=app.config.get("RATE_LIMIT_ENABLED", True)
+    )
+    app.before_request(rate_limiter.check_request)
@@ -0,0 +1,193 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+from app.models.RentalItem import RentalItem
+from app.models.booking import Booking
+from app.models.category import Category
+
+# Pending invalidation tags collected during flushes, applied on commit
+_PENDING_TAGS_KEY = "response_cache_tags"
+
+
+class ResponseCache:
+    """In-process TTL + LRU cache of serialized responses with tag-based invalidation.
+
+    Each gunicorn worker holds its own cache. Commits in this worker invalidate
+    precisely; writes made by other workers are picked up once the TTL expires.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, data, status, mimetype, tags)
+        self._keys_by_tag = {}
+        self._lock = threading.Lock()
+        self._epoch = 0  # Bumped on every invalidation, guards against storing stale results
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+        self.endpoint_stats = {}
+
+    def _count(self, endpoint, outcome):
+        self.stats[outcome] += 1
+        per_endpoint = self.endpoint_stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+        per_endpoint[outcome] += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            for tag in entry[4]:
+                keys = self._keys_by_tag.get(tag)
+                if keys:
+                    keys.discard(key)
+                    if not keys:
+                        del self._keys_by_tag[tag]
+
+    def get(self, key, endpoint):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count(endpoint, "hits")
+                return entry
+            if entry:
+                self._remove(key)
+            self._count(endpoint, "misses")
+            return None
+
+    @property
+    def epoch(self):
+        return self._epoch
+
+    def set(self, key, data, status, mimetype, tags, epoch):
+        with self._lock:
+            if epoch != self._epoch:
+                # Something was invalidated while the response was computed
+                return
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, data, status, mimetype, frozenset(tags))
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, tags):
+        with self._lock:
+            self._epoch += 1
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+                    self.stats["invalidations"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else None,
+                "endpoints": {endpoint: dict(counts) for endpoint, counts in self.endpoint_stats.items()}
+            }
+
+
+response_cache = ResponseCache()
+
+
+# ------------------- Request Side -------------------
+def _cache_key():
+    """Route plus normalized (sorted) query string"""
+    args = sorted(request.args.items(multi=True))
+    return request.path + "?" + "&".join(f"{k}={v}" for k, v in args)
+
+
+def cached_response(tags):
+    """Cache successful anonymous GET responses of a view.
+
+    tags(kwargs, response) returns the invalidation tags for the cached entry,
+    e.g. {"categories"} or {"item:12", "category:3"}.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if (request.method != "GET" or not current_app.config.get("RESPONSE_CACHE_ENABLED", True)
+                    or request.headers.get("Authorization")):
+                return f(*args, **kwargs)
+
+            key = _cache_key()
+            entry = response_cache.get(key, request.endpoint)
+            if entry:
+                _, data, status, mimetype, _ = entry
+                response = current_app.response_class(data, status=status, mimetype=mimetype)
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            epoch = response_cache.epoch
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response_cache.set(key, response.get_data(), response.status_code, response.mimetype,
+                                   tags(kwargs, response), epoch)
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return decorated_function
+    return decorator
+
+
+# ------------------- Invalidation Side -------------------
+def _tags_for(obj, session):
+    if isinstance(obj, Category):
+        return {"categories", "items", f"category:{obj.id}"}
+    if isinstance(obj, RentalItem):
+        tags = {"categories", "items", f"item:{obj.id}", f"category:{obj.category_id}"}
+        for old_category_id in _deleted_history(obj, "category_id"):
+            tags.add(f"category:{old_category_id}")
+        return tags
+    if isinstance(obj, Booking):
+        tags = {"categories", "items", f"item:{obj.rental_item_id}"}
+        item = session.get(RentalItem, obj.rental_item_id) if obj.rental_item_id else None
+        if item is not None:
+            tags.add(f"category:{item.category_id}")
+        return tags
+    return set()
+
+
+def _deleted_history(obj, key):
+    return [value for value in attributes.get_history(obj, key).deleted or () if value is not None]
+
+
+def _after_flush(session, flush_context):
+    tags = session.info.setdefault(_PENDING_TAGS_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tags |= _tags_for(obj, session)
+
+
+def _after_commit(session):
+    tags = session.info.pop(_PENDING_TAGS_KEY, None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_TAGS_KEY, None)
+
+
+def init_response_cache(app):
+    """Configure the cache from app config and hook invalidation into session commits"""
+    response_cache.ttl = app.config.get("RESPONSE_CACHE_TTL", 60)
+    response_cache.max_entries = app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024)
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,247 @@
+import math
+import re
+import time
+from collections import Counter
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+from app.extensions import db
+from app.models.RentalItem import RentalItem
+from app.models.search_token import SearchToken
+
+# BM25 tuning parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+MAX_TOKEN_LENGTH = 64
+MAX_QUERY_TERMS = 10
+MAX_PREFIX_EXPANSIONS = 50  # Most frequent index tokens considered per query prefix
+CORPUS_STATS_TTL = 300  # Seconds between recomputations of N / average document length
+
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+_FILE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".pdf")
+
+_corpus_stats = {"computed_at": 0.0, "doc_count": 0, "avg_doc_length": 1.0}
+_listeners_registered = False
+
+
+# ------------------- Tokenization -------------------
+def tokenize(text):
+    """Split text into lowercase alphanumeric tokens"""
+    tokens = []
+    for token in _TOKEN_RE.findall(str(text).lower()):
+        # Single letters carry no meaning for search, single digits do (e.g. bedrooms)
+        if len(token) == 1 and not token.isdigit():
+            continue
+        tokens.append(token[:MAX_TOKEN_LENGTH])
+    return tokens
+
+
+def _is_file_reference(value):
+    """Uploaded image paths and URLs should not be searchable"""
+    lowered = value.strip().lower()
+    return lowered.startswith(("http://", "https://", "uploads/", "/uploads/")) or lowered.endswith(_FILE_EXTENSIONS)
+
+
+def _iter_values(value):
+    """Yield the searchable scalar values of a dynamic_data structure (values only, never keys)"""
+    if isinstance(value, dict):
+        for nested in value.values():
+            yield from _iter_values(nested)
+    elif isinstance(value, (list, tuple)):
+        for nested in value:
+            yield from _iter_values(nested)
+    elif isinstance(value, bool) or value is None:
+        return
+    elif isinstance(value, str):
+        if value and not _is_file_reference(value):
+            yield value
+    else:
+        yield str(value)
+
+
+def tokenize_dynamic_data(data):
+    """Token frequencies for an item's dynamic_data dict"""
+    counts = Counter()
+    for value in _iter_values(data or {}):
+        counts.update(tokenize(value))
+    return counts
+
+
+# ------------------- Index Maintenance -------------------
+def _delete_postings(connection, item_ids):
+    connection.execute(
+        SearchToken.__table__.delete().where(SearchToken.__table__.c.rental_item_id.in_(item_ids))
+    )
+
+
+def _postings_for_item(item):
+    counts = tokenize_dynamic_data(item.get_dynamic_data())
+    doc_length = sum(counts.values())
+    return [
+        {
+            "token": token,
+            "rental_item_id": item.id,
+            "term_frequency": frequency,
+            "doc_length": doc_length
+        }
+        for token, frequency in counts.items()
+    ]
+
+
+def reindex_items(connection, items):
+    """Replace the postings of the given items (runs in the caller's transaction)"""
+    items = [item for item in items if item.id is not None]
+    if not items:
+        return
+    _delete_postings(connection, [item.id for item in items])
+    rows = []
+    for item in items:
+        rows.extend(_postings_for_item(item))
+    if rows:
+        connection.execute(SearchToken.__table__.insert(), rows)
+
+
+def rebuild_index(batch_size=500):
+    """Rebuild the whole index from rental_items.dynamic_data. Returns the number of items indexed."""
+    connection = db.session.connection()
+    connection.execute(SearchToken.__table__.delete())
+    indexed = 0
+    last_id = 0
+    while True:
+        # Whole batches, not yield_per: a streamed result cannot stay open while the inserts
+        # run on the same connection (MySQL drops the rest of the stream)
+        items = RentalItem.query.filter(RentalItem.id > last_id).order_by(RentalItem.id).limit(batch_size).all()
+        if not items:
+            break
+        rows = []
+        for item in items:
+            rows.extend(_postings_for_item(item))
+        if rows:
+            connection.execute(SearchToken.__table__.insert(), rows)
+        indexed += len(items)
+        last_id = items[-1].id
+    db.session.commit()
+    invalidate_corpus_stats()
+    return indexed
+
+
+def _before_flush(session, flush_context, instances):
+    # Postings must go before the item row, otherwise the foreign key blocks the delete
+    deleted_ids = [obj.id for obj in session.deleted if isinstance(obj, RentalItem) and obj.id is not None]
+    if deleted_ids:
+        _delete_postings(session.connection(), deleted_ids)
+
+
+def _after_flush(session, flush_context):
+    changed = [obj for obj in session.new if isinstance(obj, RentalItem)]
+    changed.extend(
+        obj for obj in session.dirty
+        if isinstance(obj, RentalItem) and attributes.get_history(obj, "dynamic_data").has_changes()
+    )
+    if changed:
+        reindex_items(session.connection(), changed)
+
+
+def register_search_index_listeners():
+    """Keep search_tokens in sync with every flush that touches RentalItem.dynamic_data"""
+    global _listeners_registered
+    if _listeners_registered:
+        return
+    event.listen(Session, "before_flush", _before_flush)
+    event.listen(Session, "after_flush", _after_flush)
+    _listeners_registered = True
+
+
+# ------------------- Ranked Search -------------------
+def invalidate_corpus_stats():
+    _corpus_stats["computed_at"] = 0.0
+
+
+def get_corpus_stats():
+    """Number of indexed items and average item length, cached for CORPUS_STATS_TTL seconds.
+
+    An empty corpus is not cached, so a fresh index is searchable as soon as items arrive.
+    """
+    now = time.monotonic()
+    if _corpus_stats["computed_at"] and now - _corpus_stats["computed_at"] < CORPUS_STATS_TTL:
+        return _corpus_stats["doc_count"], _corpus_stats["avg_doc_length"]
+
+    doc_count, total_length = db.session.query(
+        db.func.count(db.distinct(SearchToken.rental_item_id)),
+        db.func.sum(SearchToken.term_frequency)
+    ).one()
+    doc_count = doc_count or 0
+    _corpus_stats["doc_count"] = doc_count
+    _corpus_stats["avg_doc_length"] = (float(total_length) / doc_count) if doc_count else 1.0
+    _corpus_stats["computed_at"] = now if doc_count else 0.0
+    return _corpus_stats["doc_count"], _corpus_stats["avg_doc_length"]
+
+
+def parse_query(text):
+    """Distinct query terms, dropping any term that is a prefix of another term"""
+    terms = []
+    for token in tokenize(text):
+        if token not in terms:
+            terms.append(token)
+    terms = terms[:MAX_QUERY_TERMS]
+    return [term for term in terms if not any(other != term and other.startswith(term) for other in terms)]
+
+
+def _expand_prefix(term):
+    """Index tokens starting with term, with their document frequency"""
+    document_frequency = db.func.count(SearchToken.rental_item_id)
+    return db.session.query(SearchToken.token, document_frequency) \
+        .filter(SearchToken.token.like(f"{term}%")) \
+        .group_by(SearchToken.token) \
+        .order_by(document_frequency.desc()) \
+        .limit(MAX_PREFIX_EXPANSIONS) \
+        .all()
+
+
+def ranked_search_subquery(text):
+    """Subquery of (rental_item_id, score) for items matching every query term by prefix.
+
+    Scores are BM25 computed in the database; idf values are resolved in Python from the
+    prefix expansions so the SQL only needs arithmetic. Returns None if nothing can match.
+    """
+    terms = parse_query(text)
+    if not terms:
+        return None
+
+    doc_count, avg_doc_length = get_corpus_stats()
+    if not doc_count:
+        return None
+
+    idf_by_token = {}
+    term_index_by_token = {}
+    for index, term in enumerate(terms):
+        expansions = _expand_prefix(term)
+        if not expansions:
+            # Every term must match, so one unknown term means no results
+            return None
+        for token, document_frequency in expansions:
+            if token in term_index_by_token:
+                continue
+            term_index_by_token[token] = index
+            idf_by_token[token] = math.log(1 + (doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    tf = SearchToken.term_frequency
+    idf = db.case(idf_by_token, value=SearchToken.token, else_=0.0)
+    length_norm = BM25_K1 * (1 - BM25_B) + (BM25_K1 * BM25_B / avg_doc_length) * SearchToken.doc_length
+    score = db.func.sum(idf * tf * (BM25_K1 + 1) / (tf + length_norm)).label("score")
+
+    query = db.session.query(SearchToken.rental_item_id.label("rental_item_id"), score) \
+        .filter(SearchToken.token.in_(list(idf_by_token))) \
+        .group_by(SearchToken.rental_item_id)
+    if len(terms) > 1:
+        matched_term = db.case(term_index_by_token, value=SearchToken.token)
+        query = query.having(db.func.count(db.distinct(matched_term)) == len(terms))
+    return query.subquery()
+
+
+def matching_item_ids_subquery(text):
+    """Select of rental item ids matching text, usable inside IN (...) filters"""
+    ranked = ranked_search_subquery(text)
+    if ranked is None:
+        return None
+    return db.session.query(ranked.c.rental_item_id)
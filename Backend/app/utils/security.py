@@ -1,12 +1,17 @@
-from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
 from functools import wraps
 from flask import request, jsonify, current_app
 from app.models.user import User
 from app.extensions import db
+from app.utils.auth_cache import load_principal
+from app.utils.log import get_logger
+from app.utils import passwords
+from app.utils.tokens import new_jti, access_token_ttl, is_access_token_revoked
 from datetime import datetime, timedelta
 import os
 
+log = get_logger("auth")
+
 def _get_secret_key():
     # Resolve from Flask app config; fallback for safety
     try:
@@ -15,17 +20,20 @@ def _get_secret_key():
         return 'supersecretkey'
 
 def hash_password(password):
-    return generate_password_hash(password)
+    return passwords.hash_password(password)
 
 def verify_password(password, hashed):
-    return check_password_hash(hashed, password)
+    matches, _ = passwords.verify_password(password, hashed)
+    return matches
 
-def generate_jwt(user_id, role):
-    """Generate JWT token for user"""
+def generate_jwt(user_id, role, auth_version=0):
+    """Generate a short-lived access token for user; 'ver' ties it to the user's current auth_version"""
     payload = {
         'user_id': user_id,
         'role': role,
-        'exp': datetime.utcnow() + timedelta(hours=24)
+        'ver': auth_version or 0,
+        'jti': new_jti(),
+        'exp': datetime.utcnow() + timedelta(seconds=access_token_ttl())
     }
     token = jwt.encode(payload, _get_secret_key(), algorithm='HS256')
     # PyJWT <2 returns bytes, >=2 returns str. Normalize to str.
@@ -46,76 +54,76 @@ def verify_jwt(token):
     except jwt.InvalidTokenError:
         return None
 
+def get_request_token():
+    """Access token of the current request, or None"""
+    token = None
+
+    # Prefer Authorization header (case-insensitive)
+    auth_header = request.headers.get('Authorization') or request.headers.get('authorization')
+
+    if auth_header:
+        parts = auth_header.split()
+        if len(parts) == 2 and parts[0].lower() == 'bearer':
+            token = parts[1]
+        elif len(parts) == 1:
+            # Some clients may send raw token without Bearer prefix
+            token = parts[0]
+        else:
+            log.debug("Invalid Authorization header format on %s", request.path)
+    
+    # Fallbacks: common custom headers or cookie
+    if not token:
+        token = request.headers.get('X-Access-Token') or request.headers.get('x-access-token')
+    if not token:
+        token = request.cookies.get('token')
+    return token
+
 def jwt_required(f):
     """JWT authentication decorator"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        token = None
-
-        # Prefer Authorization header (case-insensitive)
-        auth_header = request.headers.get('Authorization') or request.headers.get('authorization')
-        print(f"[DEBUG] JWT Required - Auth header: {auth_header}")
+        token = get_request_token()
 
-        if auth_header:
-            parts = auth_header.split()
-            if len(parts) == 2 and parts[0].lower() == 'bearer':
-                token = parts[1]
-            elif len(parts) == 1:
-                # Some clients may send raw token without Bearer prefix
-                token = parts[0]
-            else:
-                print(f"[DEBUG] JWT Required - Invalid token format: {auth_header}")
-        
-        # Fallbacks: common custom headers or cookie
-        if not token:
-            token = request.headers.get('X-Access-Token') or request.headers.get('x-access-token')
         if not token:
-            token = request.cookies.get('token')
-
-        if token:
-            try:
-                print(f"[DEBUG] JWT Required - Extracted token (first 20): {str(token)[:20]}...")
-            except Exception:
-                pass
-        else:
-            print(f"[DEBUG] JWT Required - No token found in headers or cookies")
+            log.debug("No token on %s", request.path)
             return jsonify({"error": "Token is missing"}), 401
         
         try:
             payload = verify_jwt(token)
-            print(f"[DEBUG] JWT Required - Token payload: {payload}")
             
             if not payload:
-                print(f"[DEBUG] JWT Required - Invalid or expired token")
+                log.debug("Invalid or expired token on %s", request.path)
                 return jsonify({"error": "Invalid or expired token"}), 401
+
+            if is_access_token_revoked(payload):
+                log.info("Logged out token for user %s on %s", payload.get('user_id'), request.path)
+                return jsonify({"error": "Token has been revoked, please log in again"}), 401
             
-            # Get user from database
-            user = User.query.get(payload['user_id'])
-            print(f"[DEBUG] JWT Required - User from DB: {user}")
-            print(f"[DEBUG] JWT Required - User ID: {payload.get('user_id')}")
-            print(f"[DEBUG] JWT Required - User role from payload: {payload.get('role')}")
+            # Get user from the per-worker cache, falling back to the database
+            user = load_principal(payload['user_id'])
             
             if not user:
-                print(f"[DEBUG] JWT Required - User not found in DB for ID: {payload.get('user_id')}")
+                log.info("Token for unknown user %s", payload.get('user_id'))
                 return jsonify({"error": "User not found"}), 401
-            
-            print(f"[DEBUG] JWT Required - User details: ID={user.id}, username={user.username}, role={user.role}, active={user.is_active}")
+
+            # Tokens issued before a role, status or password change are revoked
+            if payload.get('ver', 0) != user.auth_version:
+                log.info("Revoked token for user %s (version %s, current %s)",
+                         user.id, payload.get('ver', 0), user.auth_version)
+                return jsonify({"error": "Token has been revoked, please log in again"}), 401
             
             # Check if user is active
             if hasattr(user, 'is_active') and not user.is_active:
-                print(f"[DEBUG] JWT Required - User is inactive")
+                log.info("Inactive user %s rejected", user.id)
                 return jsonify({"error": "User account is inactive"}), 401
             
             # Add user to request context
             request.current_user = user
-            print(f"[DEBUG] JWT Required - User added to request context: {user.username} (role: {user.role})")
-            print(f"[DEBUG] JWT Required - Successfully authenticated user: {user.username}")
+            log.debug("Authenticated user %s (role: %s) for %s", user.id, user.role, request.path)
             return f(*args, **kwargs)
             
-        except Exception as e:
-            print(f"[DEBUG] JWT Required - Exception: {e}")
-            print(f"[DEBUG] JWT Required - Exception type: {type(e)}")
-            print(f"[DEBUG] JWT Required - Exception details: {str(e)}")
+        except Exception:
+            log.exception("Token authentication failed on %s", request.path)
             return jsonify({"error": "Invalid token"}), 401
     
     return decorated_function
@@ -124,20 +132,15 @@ def admin_required(f):
     """Admin role required decorator"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        print(f"[DEBUG] Admin Required - Checking admin privileges")
-        print(f"[DEBUG] Admin Required - Request current_user: {getattr(request, 'current_user', 'None')}")
-        
         if not hasattr(request, 'current_user'):
-            print(f"[DEBUG] Admin Required - No current_user found")
+            log.debug("Admin route %s without current_user", request.path)
             return jsonify({"error": "Authentication required"}), 401
         
-        print(f"[DEBUG] Admin Required - User role: {request.current_user.role}")
-        
         if request.current_user.role != 'admin':
-            print(f"[DEBUG] Admin Required - User is not admin")
+            log.info("User %s (role: %s) denied admin route %s",
+                     request.current_user.id, request.current_user.role, request.path)
             return jsonify({"error": "Admin privileges required"}), 403
         
-        print(f"[DEBUG] Admin Required - Admin access granted")
         return f(*args, **kwargs)
     
     return decorated_function
@@ -146,20 +149,15 @@ def owner_required(f):
     """Owner role required decorator"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        print(f"[DEBUG] Owner Required - Checking owner privileges")
-        print(f"[DEBUG] Owner Required - Request current_user: {getattr(request, 'current_user', 'None')}")
-        
         if not hasattr(request, 'current_user'):
-            print(f"[DEBUG] Owner Required - No current_user found")
+            log.debug("Owner route %s without current_user", request.path)
             return jsonify({"error": "Authentication required"}), 401
         
-        print(f"[DEBUG] Owner Required - User role: {request.current_user.role}")
-        
         if request.current_user.role != 'owner':
-            print(f"[DEBUG] Owner Required - User role is not owner: {request.current_user.role}")
+            log.info("User %s (role: %s) denied owner route %s",
+                     request.current_user.id, request.current_user.role, request.path)
             return jsonify({"error": "Owner privileges required"}), 403
         
-        print(f"[DEBUG] Owner Required - Owner access granted")
         return f(*args, **kwargs)
     
     return decorated_function
@@ -0,0 +1,226 @@
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import WatchedFileHandler
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.utils.log import get_logger
+
+log = get_logger("slow_queries")
+
+_START_KEY = "slow_query_start"
+_PARAM_LENGTH = 100  # Longer bound parameters are truncated in the log (when values are logged)
+_EXPLAIN_COOLDOWN = 600  # Seconds before the same statement is EXPLAINed again
+_QUEUE_SIZE = 1000
+
+
+class SlowQueryRecorder:
+    """Writes statements slower than a threshold to a JSON-lines file.
+
+    Every gunicorn worker appends to the same file, so rotation is left to an external tool
+    (logrotate or similar): the handler reopens the file when it is moved away, where a
+    per-process rollover would race the other workers and lose lines.
+
+    The request thread only measures and enqueues. A background thread runs EXPLAIN on a
+    separate pooled connection (never the caller's, which may be mid-way through a streamed
+    result) and appends the record, so a slow query costs no extra latency on top of itself.
+    """
+
+    def __init__(self):
+        self.threshold = 0.2
+        self.path = None
+        self.log_values = False
+        self._queue = queue.Queue(_QUEUE_SIZE)
+        self._thread = None
+        self._thread_pid = None
+        self._lock = threading.Lock()
+        self._explained = {}  # statement -> (monotonic time, plan)
+        self._file_logger = None
+
+    def configure(self, threshold_ms, path, log_values=False):
+        self.threshold = threshold_ms / 1000.0
+        self.path = path
+        self.log_values = log_values
+
+    # Request thread
+    def submit(self, engine, statement, parameters, elapsed, executemany):
+        record = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "duration_ms": round(elapsed * 1000, 2),
+            "statement": " ".join(statement.split()),
+            "parameters": _format_parameters(parameters, self.log_values),
+            "route": request.endpoint if has_request_context() else None,
+            "path": request.path if has_request_context() else None,
+            "pid": os.getpid()
+        }
+        log.warning("Slow query (%sms) on %s: %s", record["duration_ms"], record["route"], record["statement"][:200])
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((engine, statement, parameters, executemany, record))
+        except queue.Full:
+            pass
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or self._thread_pid != os.getpid():
+                # Threads do not survive fork; each gunicorn worker starts its own
+                self._thread = threading.Thread(target=self._run, name="slow-query-writer", daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+
+    # Background thread
+    def _run(self):
+        while True:
+            engine, statement, parameters, executemany, record = self._queue.get()
+            try:
+                if not executemany:
+                    record["explain"] = self._explain(engine, statement, parameters)
+                self._write(record)
+            except Exception as e:
+                log.warning("Could not record slow query: %s", e)
+
+    def _explain(self, engine, statement, parameters):
+        if not statement.lstrip()[:6].upper() == "SELECT":
+            return None
+        cached = self._explained.get(statement)
+        if cached and time.monotonic() - cached[0] < _EXPLAIN_COOLDOWN:
+            return cached[1]
+        prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            with engine.connect() as connection:
+                result = connection.exec_driver_sql(prefix + statement, parameters or ())
+                columns = list(result.keys())
+                plan = [dict(zip(columns, [_jsonable(value) for value in row])) for row in result]
+        except Exception as e:
+            plan = {"error": str(e)[:200]}
+        if len(self._explained) > 1000:
+            self._explained.clear()
+        self._explained[statement] = (time.monotonic(), plan)
+        return plan
+
+    def _write(self, record):
+        if self._file_logger is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            handler = WatchedFileHandler(self.path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            file_logger = logging.getLogger("slow_query_file")
+            file_logger.propagate = False
+            file_logger.setLevel(logging.INFO)
+            file_logger.handlers = [handler]
+            self._file_logger = file_logger
+        self._file_logger.info(json.dumps(record, default=str))
+
+    def flush(self, timeout=5.0):
+        """Wait until queued records are written (used by tests and scripts)"""
+        deadline = time.monotonic() + timeout
+        while not self._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+    # Reporting
+    def read_records(self):
+        """Records from the current log file and its uncompressed rotations (path.1, path.2, ...), oldest first"""
+        if not self.path:
+            return
+        backups = [path for path in glob.glob(self.path + ".*") if path.rpartition(".")[2].isdigit()]
+        for path in sorted(backups, key=lambda path: int(path.rpartition(".")[2]), reverse=True) + [self.path]:
+            try:
+                with open(path, encoding="utf-8", errors="replace") as handle:
+                    for line in handle:
+                        try:
+                            yield json.loads(line)
+                        except ValueError:
+                            continue
+            except OSError:
+                continue
+
+    def summary(self, limit=20, sort="total"):
+        """Slow statements grouped by SQL text, worst first by total, count or max duration"""
+        groups = {}
+        for record in self.read_records():
+            group = groups.get(record.get("statement"))
+            if group is None:
+                group = groups[record.get("statement")] = {
+                    "statement": record.get("statement"), "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "routes": {}, "last_seen": None, "last_parameters": None, "explain": None
+                }
+            duration = record.get("duration_ms") or 0
+            group["count"] += 1
+            group["total_ms"] += duration
+            group["max_ms"] = max(group["max_ms"], duration)
+            route = record.get("route") or "(no request)"
+            group["routes"][route] = group["routes"].get(route, 0) + 1
+            group["last_seen"] = record.get("ts")
+            group["last_parameters"] = record.get("parameters")
+            if record.get("explain") is not None:
+                group["explain"] = record["explain"]
+
+        key = {"count": "count", "max": "max_ms"}.get(sort, "total_ms")
+        offenders = sorted(groups.values(), key=lambda group: group[key], reverse=True)[:limit]
+        for group in offenders:
+            group["total_ms"] = round(group["total_ms"], 2)
+            group["avg_ms"] = round(group["total_ms"] / group["count"], 2)
+        return {"threshold_ms": round(self.threshold * 1000), "statements": len(groups), "offenders": offenders}
+
+
+def _jsonable(value):
+    return value if isinstance(value, (int, float, str, type(None))) else str(value)
+
+
+def _redacted(value):
+    # Parameters carry password and token hashes, emails and the like: keep only type and length
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    return type(value).__name__
+
+
+def _format_parameters(parameters, log_values=False):
+    def short(value):
+        if not log_values:
+            return _redacted(value)
+        text = repr(value)
+        return text if len(text) <= _PARAM_LENGTH else text[:_PARAM_LENGTH] + "..."
+    if isinstance(parameters, dict):
+        return {key: short(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [short(value) for value in parameters[:50]]
+    return short(parameters)
+
+
+slow_query_recorder = SlowQueryRecorder()
+
+
+# ------------------- Engine Events -------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if elapsed >= slow_query_recorder.threshold:
+        slow_query_recorder.submit(conn.engine, statement, parameters, elapsed, executemany)
+
+
+def init_slow_query_log(app):
+    """Record statements slower than SLOW_QUERY_THRESHOLD_MS, with EXPLAIN, to SLOW_QUERY_LOG_PATH"""
+    slow_query_recorder.configure(
+        threshold_ms=app.config.get("SLOW_QUERY_THRESHOLD_MS", 200),
+        path=app.config.get("SLOW_QUERY_LOG_PATH", os.path.join(os.getcwd(), "logs", "slow_queries.log")),
+        log_values=app.config.get("SLOW_QUERY_LOG_PARAMETER_VALUES", False)
+    )
+    if not app.config.get("SLOW_QUERY_LOG_ENABLED", True):
+        return
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,103 @@
+import csv
+import io
+from flask import Response, current_app, stream_with_context
+from app.utils.log import get_logger
+from app.utils.xlsx import iter_xlsx
+
+log = get_logger("streaming")
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+STREAM_BATCH_SIZE = 200  # Rows fetched per round trip (yield_per)
+STREAM_CHUNK_SIZE = 64 * 1024  # Bytes buffered before a chunk is written to the client
+
+
+def stream_rows(query, batch_size=STREAM_BATCH_SIZE):
+    """Iterate a query in batches instead of loading every row up front.
+
+    On MySQL this uses a server-side cursor, so the connection cannot run other
+    queries until iteration ends: load related data with joins, not lazy loads.
+    """
+    return query.yield_per(batch_size)
+
+
+def stream_json(key, items, trailer=None, status=200):
+    """Stream {"<key>": [item, ...], **trailer(count)} as a chunked JSON response.
+
+    items is any iterable of JSON-serializable dicts (typically a generator over
+    stream_rows); only one chunk is held in memory at a time. trailer receives the
+    number of items written and returns extra top-level fields, e.g. {"total": n}.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        count = 0
+        buffer = ["{", dumps(key), ":["]
+        size = 0
+        try:
+            for item in items:
+                encoded = dumps(item)
+                if count:
+                    buffer.append(",")
+                buffer.append(encoded)
+                size += len(encoded)
+                count += 1
+                if size >= STREAM_CHUNK_SIZE:
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+        except Exception:
+            # Headers are already sent, so the status cannot change; end with broken JSON
+            # rather than a well-formed but truncated list
+            log.exception("Error while streaming %r", key)
+            raise
+        buffer.append("]")
+        for field, value in (trailer(count) if trailer else {}).items():
+            buffer.append(f",{dumps(field)}:{dumps(value)}")
+        buffer.append("}")
+        yield "".join(buffer)
+
+    return Response(stream_with_context(generate()), status=status, mimetype="application/json")
+
+
+def _attachment(filename):
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+def stream_csv(filename, columns, rows, status=200):
+    """Stream rows (dicts keyed by the columns; missing keys are left blank) as a CSV download.
+
+    Rows are written straight into a small buffer that is flushed every STREAM_CHUNK_SIZE
+    bytes, so the file is never held in memory.
+    """
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, restval="", extrasaction="ignore")
+        writer.writeheader()
+        try:
+            for row in rows:
+                writer.writerow(row)
+                if buffer.tell() >= STREAM_CHUNK_SIZE:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+        except Exception:
+            # Headers are already sent; the client sees a truncated download
+            log.exception("Error while streaming %r", filename)
+            raise
+        yield buffer.getvalue()
+
+    return Response(stream_with_context(generate()), status=status, mimetype="text/csv",
+                    headers=_attachment(filename))
+
+
+def stream_xlsx(filename, columns, rows, sheet_name="Report", status=200):
+    """Stream rows (dicts keyed by the columns) as a single-sheet .xlsx download"""
+    def generate():
+        try:
+            yield from iter_xlsx(columns, rows, sheet_name)
+        except Exception:
+            log.exception("Error while streaming %r", filename)
+            raise
+
+    return Response(stream_with_context(generate()), status=status, mimetype=XLSX_MIMETYPE,
+                    headers=_attachment(filename))
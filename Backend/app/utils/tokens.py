@@ -0,0 +1,174 @@
+import hashlib
+import secrets
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from app.extensions import db
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.utils.log import get_logger
+
+log = get_logger("tokens")
+
+_refresh_tokens = RefreshToken.__table__
+
+
+class TokenError(ValueError):
+    """Raised when a refresh token cannot be exchanged for a new token pair"""
+
+
+# ------------------- Access Token Denylist -------------------
+class AccessTokenDenylist:
+    """Per-worker set of revoked access token ids (jti), kept only until the tokens expire.
+
+    Access tokens live ACCESS_TOKEN_TTL seconds, so the set holds at most the logouts of
+    that window; jtis are stored as 16 raw bytes and expired entries are pruned as it grows.
+    """
+
+    def __init__(self):
+        self._entries = {}  # jti bytes -> exp (unix seconds)
+        self._lock = threading.Lock()
+        self._next_prune = 1024
+
+    def add(self, jti, exp):
+        key = _jti_key(jti)
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = int(exp)
+            if len(self._entries) >= self._next_prune:
+                now = time.time()
+                self._entries = {k: e for k, e in self._entries.items() if e > now}
+                self._next_prune = max(1024, 2 * len(self._entries))
+
+    def __contains__(self, jti):
+        key = _jti_key(jti)
+        return key is not None and key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _jti_key(jti):
+    try:
+        return bytes.fromhex(jti)
+    except (TypeError, ValueError):
+        return None
+
+
+access_denylist = AccessTokenDenylist()
+
+
+def new_jti():
+    return uuid.uuid4().hex
+
+
+def access_token_ttl():
+    return current_app.config.get("ACCESS_TOKEN_TTL", 900)
+
+
+def revoke_access_token(payload):
+    """Reject this access token for the rest of its lifetime (in this worker)"""
+    if payload.get("jti") and payload.get("exp"):
+        access_denylist.add(payload["jti"], payload["exp"])
+
+
+def is_access_token_revoked(payload):
+    return payload.get("jti") in access_denylist
+
+
+# ------------------- Refresh Tokens -------------------
+def _token_hash(raw_token):
+    return hashlib.sha256(raw_token.encode("utf-8")).hexdigest()
+
+
+def issue_refresh_token(user, family_id=None):
+    """Create a refresh token for user and return the raw value (only its hash is stored).
+
+    Does not commit; family_id links the token to the login it was rotated from.
+    """
+    raw_token = secrets.token_urlsafe(32)
+    db.session.add(RefreshToken(
+        user_id=user.id,
+        token_hash=_token_hash(raw_token),
+        family_id=family_id or uuid.uuid4().hex,
+        auth_version=user.auth_version or 0,
+        expires_at=datetime.utcnow() + timedelta(seconds=current_app.config.get("REFRESH_TOKEN_TTL", 30 * 24 * 3600))
+    ))
+    return raw_token
+
+
+def _revoke_family(family_id):
+    db.session.execute(
+        _refresh_tokens.update()
+        .where(_refresh_tokens.c.family_id == family_id, _refresh_tokens.c.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+
+
+def rotate_refresh_token(raw_token):
+    """Exchange a refresh token for (user, new raw refresh token); the old one stops working.
+
+    Presenting an already-rotated token means it leaked (or the client raced itself), so the
+    whole family is revoked and the user has to log in again. Commits on success and failure.
+    """
+    token = RefreshToken.query.filter_by(token_hash=_token_hash(raw_token or "")).first()
+    if not token:
+        raise TokenError("Invalid refresh token")
+
+    now = datetime.utcnow()
+    if token.revoked_at is not None:
+        log.warning("Reused refresh token for user %s; revoking family %s", token.user_id, token.family_id)
+        _revoke_family(token.family_id)
+        db.session.commit()
+        raise TokenError("Refresh token has already been used, please log in again")
+    if token.expires_at <= now:
+        raise TokenError("Refresh token has expired, please log in again")
+
+    user = db.session.get(User, token.user_id)
+    if not user or not user.is_active or (user.auth_version or 0) != token.auth_version:
+        # Deactivated, or role/status/password changed since this login
+        _revoke_family(token.family_id)
+        db.session.commit()
+        raise TokenError("Refresh token has been revoked, please log in again")
+
+    # Conditional update so two concurrent refreshes with the same token cannot both win
+    claimed = db.session.execute(
+        _refresh_tokens.update()
+        .where(_refresh_tokens.c.id == token.id, _refresh_tokens.c.revoked_at.is_(None))
+        .values(revoked_at=now)
+    ).rowcount
+    if claimed != 1:
+        _revoke_family(token.family_id)
+        db.session.commit()
+        raise TokenError("Refresh token has already been used, please log in again")
+
+    new_token = issue_refresh_token(user, token.family_id)
+    db.session.commit()
+    return user, new_token
+
+
+def revoke_refresh_token(raw_token):
+    """Revoke the login (token family) a refresh token belongs to. Does not commit."""
+    token = RefreshToken.query.filter_by(token_hash=_token_hash(raw_token or "")).first()
+    if token:
+        _revoke_family(token.family_id)
+    return token is not None
+
+
+def purge_refresh_tokens(batch_size=1000):
+    """Delete expired refresh tokens. Returns the number of rows removed."""
+    removed = 0
+    now = datetime.utcnow()
+    while True:
+        ids = [row[0] for row in db.session.execute(
+            db.select(_refresh_tokens.c.id).where(_refresh_tokens.c.expires_at <= now).limit(batch_size)
+        )]
+        if not ids:
+            break
+        db.session.execute(_refresh_tokens.delete().where(_refresh_tokens.c.id.in_(ids)))
+        db.session.commit()
+        removed += len(ids)
+    return removed
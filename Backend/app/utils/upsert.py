@@ -0,0 +1,76 @@
+from decimal import Decimal
+from sqlalchemy import event
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+CENT = Decimal("0.01")
+
+
+def money(value):
+    """value as a Decimal rounded to cents (None counts as 0)"""
+    return Decimal(str(value or 0)).quantize(CENT)
+
+
+def increment(connection, table, key_columns, values, increments):
+    """Insert values as a new row, or add increments to the row already holding its key.
+
+    key_columns name the primary key columns; increments maps column -> amount added on a
+    conflict, and every other non-key column in values is overwritten. A single atomic
+    upsert on MySQL and SQLite; other dialects fall back to UPDATE, then INSERT if no row matched.
+    """
+    updates = {column: value for column, value in values.items() if column not in key_columns}
+    updates.update({column: table.c[column] + delta for column, delta in increments.items()})
+    dialect = connection.dialect.name
+    if dialect == "mysql":
+        connection.execute(mysql.insert(table).values(**values).on_duplicate_key_update(**updates))
+    elif dialect == "sqlite":
+        connection.execute(sqlite.insert(table).values(**values).on_conflict_do_update(
+            index_elements=[table.c[column] for column in key_columns], set_=updates
+        ))
+    else:
+        key = [table.c[column] == values[column] for column in key_columns]
+        result = connection.execute(table.update().where(*key).values(**updates))
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(**values))
+
+
+# ------------------- Flush Snapshots -------------------
+def affected_ids(session, models):
+    """{model: ids} of already-persisted rows of the given models that the session is writing"""
+    affected = {}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        model = type(obj)
+        if model in models and obj.id is not None and (obj not in session.dirty or session.is_modified(obj)):
+            affected.setdefault(model, set()).add(obj.id)
+    return affected
+
+
+def track_flushes(snapshot_key, models, read_states, apply_changes):
+    """Listen for flushes writing rows of models and pass their states before and after to apply_changes.
+
+    read_states(connection, model, ids) returns {id: state} as visible to the transaction; it
+    runs before the flush for the rows being changed and after it for those plus the new rows.
+    apply_changes(connection, before, after) receives {model: {id: state}} for both sides and
+    runs inside the flush's transaction. The before side is kept in session.info[snapshot_key].
+    """
+    def before_flush(session, flush_context, instances):
+        affected = affected_ids(session, models)
+        if not affected:
+            session.info[snapshot_key] = {}
+            return
+        connection = session.connection()
+        session.info[snapshot_key] = {model: read_states(connection, model, ids) for model, ids in affected.items()}
+
+    def after_flush(session, flush_context):
+        before = session.info.pop(snapshot_key, {})
+        affected = affected_ids(session, models)
+        for model, states in before.items():
+            affected.setdefault(model, set()).update(states)
+        if not affected:
+            return
+        connection = session.connection()
+        after = {model: read_states(connection, model, ids) for model, ids in affected.items()}
+        apply_changes(connection, before, after)
+
+    event.listen(Session, "before_flush", before_flush)
+    event.listen(Session, "after_flush", after_flush)
@@ -0,0 +1 @@
+"""Endpoint benchmark suite: seeded datasets and p50/p95 timings per endpoint (python -m benchmarks)"""
@@ -0,0 +1,102 @@
+"""
+Endpoint Benchmarks
+===================
+
+Seeds a scratch database at the chosen scale, then times each major endpoint through the
+Flask test client and writes p50/p95 latency and query counts to JSON.
+
+Usage (from Backend/):
+    python -m benchmarks --scale small
+    python -m benchmarks --scale medium --database-url mysql+pymysql://root@localhost/RentBench
+    python -m benchmarks --scale small --compare benchmarks/results/small.json
+
+benchmarks/results/small.json is the committed baseline (SQLite). Re-run and commit the results
+file next to a change to make its performance impact visible in the diff.
+The database must be empty; by default a temporary SQLite file is used and removed afterwards.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.dataset import SCALES
+from benchmarks.runner import build_report, compare_reports, create_benchmark_app, run_scenarios, write_report
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Time the main API endpoints")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for key in ("users", "owners", "categories", "items", "bookings"):
+        parser.add_argument(f"--{key}", type=int, help=f"Override the scale's number of {key}")
+    parser.add_argument("--database-url", help="Empty scratch database (default: a temporary SQLite file)")
+    parser.add_argument("--iterations", type=int, default=20, help="Timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per endpoint")
+    parser.add_argument("--only", nargs="+", metavar="SCENARIO", help="Run only these scenarios")
+    parser.add_argument("--response-cache", action="store_true", help="Keep the public response cache on")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<scale>.json)")
+    parser.add_argument("--compare", help="Baseline results file; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown vs. the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    counts = dict(SCALES[args.scale])
+    for key in counts:
+        if getattr(args, key) is not None:
+            counts[key] = getattr(args, key)
+
+    temporary_db = None
+    database_url = args.database_url
+    if not database_url:
+        handle, temporary_db = tempfile.mkstemp(prefix="rentals-bench-", suffix=".db")
+        os.close(handle)
+        database_url = f"sqlite:///{temporary_db}"
+
+    print("Endpoint Benchmarks")
+    print("===================")
+    print(f"Scale {args.scale}: {counts}")
+
+    try:
+        app = create_benchmark_app(database_url, response_cache=args.response_cache)
+        from benchmarks.dataset import seed
+        with app.app_context():
+            ids = seed(counts, progress=print)
+        print(f"✓ Seeded database ({database_url.split('@')[-1]})")
+
+        results = run_scenarios(app, ids, iterations=args.iterations, warmup=args.warmup, names=args.only,
+                                progress=print)
+        report = build_report(app, args.scale, counts, results, args.iterations, args.warmup, args.response_cache)
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ Benchmark failed: {e}")
+        sys.exit(1)
+    finally:
+        if temporary_db and os.path.exists(temporary_db):
+            os.remove(temporary_db)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{args.scale}.json")
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    write_report(report, output)
+    print(f"✓ Results written to {output}")
+
+    if baseline is not None:
+        regressions = compare_reports(baseline, report, args.tolerance)
+        for line in regressions:
+            print(f"❌ {line}")
+        if regressions:
+            sys.exit(1)
+        print("✓ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
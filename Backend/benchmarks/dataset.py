@@ -0,0 +1,199 @@
+"""Deterministic benchmark dataset: users, categories with requirements, items and bookings.
+
+Rows are added through the ORM session (not bulk inserts) so the search index, attribute
+index, category counters and item summaries are maintained by their listeners exactly as
+they are in production.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from sqlalchemy.dialects.mysql import LONGTEXT
+from sqlalchemy.ext.compiler import compiles
+from app.extensions import db
+from app.models import Booking, Category, CategoryRequirement, RentalItem, User
+from app.utils.ledger import reconcile
+from app.utils.passwords import hash_password
+
+PASSWORD = "bench-password"
+
+SCALES = {
+    "small": {"users": 50, "owners": 10, "categories": 4, "items": 300, "bookings": 600},
+    "medium": {"users": 500, "owners": 50, "categories": 6, "items": 3000, "bookings": 8000},
+    "large": {"users": 2000, "owners": 200, "categories": 8, "items": 15000, "bookings": 40000},
+}
+
+# (status, payment_status, owner_confirmation_status) for every stage of the booking flow
+BOOKING_STATES = [
+    ("Pending", "PENDING", "PENDING"),
+    ("Requirements_Submitted", "PENDING", "PENDING"),
+    ("Payment_Held", "HELD", "PENDING"),
+    ("Owner_Accepted", "HELD", "ACCEPTED"),
+    ("Owner_Rejected", "FAILED", "REJECTED"),
+    ("Delivered", "HELD", "ACCEPTED"),
+    ("Confirmed", "COMPLETED", "ACCEPTED"),
+    ("Completed", "COMPLETED", "ACCEPTED"),
+    ("Rejected", "FAILED", "REJECTED"),
+]
+
+LOCATIONS = ["Mogadishu", "Hargeisa", "Kismayo", "Bosaso", "Baidoa", "Garowe", "Beledweyne", "Berbera"]
+
+# Category templates: requirement (name, field_type, placeholder) and a value generator per field
+CATEGORY_TEMPLATES = [
+    ("Car Rental", "Automobile and vehicle rentals", [
+        ("Brand", "string", "e.g., Toyota", lambda r: r.choice(["Toyota", "Honda", "Nissan", "Suzuki", "Hyundai"])),
+        ("Model", "string", "e.g., Camry", lambda r: r.choice(["Corolla", "Civic", "Sunny", "Swift", "Tucson"])),
+        ("Year", "number", "e.g., 2020", lambda r: str(r.randint(2005, 2024))),
+        ("Transmission", "select", '["Automatic", "Manual"]', lambda r: r.choice(["Automatic", "Manual"])),
+        ("Daily Rate", "number", "USD per day", lambda r: str(r.randint(25, 150))),
+        ("Car Images", "image", None, lambda r: [f"uploads/bench/car_{r.randint(1, 500)}.jpg"]),
+    ]),
+    ("House Rental", "Residential property rentals", [
+        ("Item Name", "string", "e.g., Family villa", lambda r: f"{r.choice(['Family', 'Modern', 'Quiet', 'Spacious'])} "
+                                                            f"{r.choice(['villa', 'apartment', 'house', 'studio'])}"),
+        ("Bedrooms", "number", "e.g., 3", lambda r: str(r.randint(1, 6))),
+        ("Furnished", "select", '["Yes", "No"]', lambda r: r.choice(["Yes", "No"])),
+        ("Price", "number", "USD per day", lambda r: str(r.randint(20, 300))),
+        ("Images", "image", None, lambda r: [f"uploads/bench/house_{r.randint(1, 500)}.jpg"]),
+    ]),
+    ("Electronics", "Electronic devices and equipment", [
+        ("Item Name", "string", "e.g., Projector", lambda r: r.choice(["Projector", "Camera", "Laptop", "Speaker set",
+                                                                        "Generator", "Drone"])),
+        ("Condition", "select", '["New", "Good", "Fair"]', lambda r: r.choice(["New", "Good", "Fair"])),
+        ("Price", "number", "USD per day", lambda r: str(r.randint(5, 80))),
+        ("Photo", "image", None, lambda r: [f"uploads/bench/electronics_{r.randint(1, 500)}.jpg"]),
+    ]),
+    ("Event Venues", "Halls and outdoor spaces", [
+        ("Item Name", "string", "e.g., Wedding hall", lambda r: f"{r.choice(['Grand', 'Garden', 'Beach', 'City'])} hall"),
+        ("Capacity", "number", "Guests", lambda r: str(r.choice([50, 100, 200, 500, 1000]))),
+        ("Cost", "number", "USD per day", lambda r: str(r.randint(100, 2000))),
+    ]),
+]
+
+
+@compiles(LONGTEXT, "sqlite")
+def _longtext_on_sqlite(element, compiler, **kw):
+    # owner_requests uses MySQL's LONGTEXT; let the default sqlite benchmark database create it
+    return "TEXT"
+
+
+def _category_template(index):
+    name, description, fields = CATEGORY_TEMPLATES[index % len(CATEGORY_TEMPLATES)]
+    if index >= len(CATEGORY_TEMPLATES):
+        name = f"{name} {index // len(CATEGORY_TEMPLATES) + 1}"
+    return name, description, fields
+
+
+def seed(scale, seed_value=42, batch_size=500, progress=None):
+    """Create tables and insert a dataset of the given scale (a SCALES entry or dict of counts).
+
+    Returns the ids the scenarios need. Refuses to run against a database that already has users,
+    so it can never mix benchmark rows into real data.
+    """
+    counts = SCALES[scale] if isinstance(scale, str) else scale
+    rng = random.Random(seed_value)
+    db.create_all()
+    if db.session.query(User.id).first() is not None:
+        raise RuntimeError("Benchmark database is not empty; point --database-url at a scratch database")
+
+    # One bcrypt hash shared by every user, rather than one per user
+    password_hash = hash_password(PASSWORD)
+    created = datetime(2025, 1, 1)
+
+    def add_user(index, role):
+        return User(full_name=f"Bench {role.title()} {index}", phone_number=f"6{index:08d}"[-9:],
+                    email=f"bench-{role}-{index}@example.com", address=rng.choice(LOCATIONS),
+                    birthdate=date(1970, 1, 1) + timedelta(days=rng.randint(0, 12000)),
+                    username=f"bench_{role}_{index}", password=password_hash, role=role,
+                    created_at=created + timedelta(minutes=index))
+
+    admin = add_user(0, "admin")
+    owners = [add_user(i, "owner") for i in range(counts["owners"])]
+    renters = [add_user(i, "user") for i in range(counts["users"])]
+    db.session.add_all([admin] + owners + renters)
+
+    categories = []
+    for index in range(counts["categories"]):
+        name, description, fields = _category_template(index)
+        category = Category(name=name, description=description)
+        category.requirements = [
+            CategoryRequirement(name=field, field_type=field_type, is_required=True, placeholder=placeholder)
+            for field, field_type, placeholder, _ in fields
+        ]
+        categories.append((category, fields))
+        db.session.add(category)
+    db.session.commit()
+    _report(progress, "users", len(owners) + len(renters) + 1)
+    _report(progress, "categories", len(categories))
+
+    item_ids = []
+    for start in range(0, counts["items"], batch_size):
+        items = []
+        for index in range(start, min(start + batch_size, counts["items"])):
+            category, fields = categories[index % len(categories)]
+            data = {field: make_value(rng) for field, _, _, make_value in fields}
+            data["Location"] = rng.choice(LOCATIONS)
+            item = RentalItem(owner_id=rng.choice(owners).id, category_id=category.id,
+                              is_available=rng.random() > 0.2,
+                              created_at=created + timedelta(hours=index))
+            item.set_dynamic_data(data)
+            items.append(item)
+        db.session.add_all(items)
+        db.session.commit()
+        item_ids.extend(item.id for item in items)
+        _report(progress, "rental items", len(item_ids))
+
+    total_bookings = 0
+    for start in range(0, counts["bookings"], batch_size):
+        bookings = []
+        for index in range(start, min(start + batch_size, counts["bookings"])):
+            status, payment_status, owner_status = BOOKING_STATES[index % len(BOOKING_STATES)]
+            placed = created + timedelta(hours=index, minutes=rng.randint(0, 59))
+            amount = float(rng.randint(20, 900))
+            booking = Booking(
+                rental_item_id=rng.choice(item_ids), renter_id=rng.choice(renters).id,
+                status=status, payment_status=payment_status, owner_confirmation_status=owner_status,
+                payment_method=rng.choice(["EVC_PLUS", "ZAAD", "SAHAL", "BANK"]), payment_amount=amount,
+                service_fee=round(amount * 0.05, 2), payment_account=f"61{rng.randint(1000000, 9999999)}",
+                contract_accepted=True, contract_accepted_at=placed, created_at=placed, updated_at=placed,
+                payment_held_at=placed if payment_status in ("HELD", "COMPLETED") else None
+            )
+            if status in ("Confirmed", "Completed"):
+                booking.admin_approved = True
+                booking.renter_confirmed = True
+                booking.owner_confirmed = True
+                booking.delivered_at = placed + timedelta(days=1)
+                booking.payment_released_at = placed + timedelta(days=2)
+            bookings.append(booking)
+        db.session.add_all(bookings)
+        db.session.commit()
+        total_bookings += len(bookings)
+        _report(progress, "bookings", total_bookings)
+
+    # Bookings are inserted in their final states, so post their ledger entries the way a
+    # migrated database gets them: as opening entries from reconciliation
+    opened = reconcile(fix=True)["bookings"]
+    _report(progress, "opening ledger positions", len(opened))
+
+    return _fixture_ids(admin, categories)
+
+
+def _fixture_ids(admin, categories):
+    """The users, category and booking the scenarios request as (the busiest of each)"""
+    owner_id = db.session.query(RentalItem.owner_id).group_by(RentalItem.owner_id).order_by(
+        db.func.count(RentalItem.id).desc(), RentalItem.owner_id).limit(1).scalar()
+    renter_id = db.session.query(Booking.renter_id).group_by(Booking.renter_id).order_by(
+        db.func.count(Booking.id).desc(), Booking.renter_id).limit(1).scalar()
+    receipt_booking_id = db.session.query(Booking.id).filter(
+        Booking.renter_id == renter_id, Booking.status == "Completed").order_by(Booking.id).limit(1).scalar()
+    return {
+        "admin_id": admin.id,
+        "owner_id": owner_id,
+        "renter_id": renter_id,
+        "category_id": categories[0][0].id,
+        "receipt_booking_id": receipt_booking_id,
+    }
+
+
+def _report(progress, label, count):
+    if progress:
+        progress(f"  seeded {count} {label}")
@@ -0,0 +1,133 @@
+"""Times each scenario through the Flask test client and writes the results as JSON."""
+
+import contextlib
+import io
+import json
+import math
+import platform
+import time
+from app.config import Config
+from app.utils.query_stats import record_queries
+from benchmarks.scenarios import select
+
+# Settings that would distort or break a tight request loop
+BENCHMARK_CONFIG = {
+    "RATE_LIMIT_ENABLED": False,
+    "SLOW_QUERY_LOG_ENABLED": False,
+    "PROFILING_ENABLED": False,
+    "ACCESS_TOKEN_TTL": 24 * 3600,
+    "LOG_LEVEL": "CRITICAL",  # Failing endpoints show up in the status column instead
+}
+
+
+def create_benchmark_app(database_url, response_cache=False, log_level=None):
+    """create_app() against database_url, with the BENCHMARK_CONFIG overrides"""
+    overrides = dict(BENCHMARK_CONFIG, SQLALCHEMY_DATABASE_URI=database_url, RESPONSE_CACHE_ENABLED=response_cache)
+    if log_level:
+        overrides["LOG_LEVEL"] = log_level
+    # create_app() reads the Config class directly
+    for key, value in overrides.items():
+        setattr(Config, key, value)
+    from app import create_app
+    app = create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+def percentile(values, fraction):
+    """Linear-interpolated percentile of a non-empty list"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def run_scenarios(app, ids, iterations=20, warmup=2, names=None, progress=None):
+    """{scenario name: timings and query counts} for every selected scenario"""
+    from app.utils.security import generate_jwt
+    client = app.test_client()
+    with app.app_context():
+        headers = {
+            "admin": {"Authorization": f"Bearer {generate_jwt(ids['admin_id'], 'admin')}"},
+            "owner": {"Authorization": f"Bearer {generate_jwt(ids['owner_id'], 'owner')}"},
+            "renter": {"Authorization": f"Bearer {generate_jwt(ids['renter_id'], 'user')}"},
+        }
+
+    results = {}
+    for name, role, build_path in select(names):
+        path = build_path(ids)
+        request_headers = headers[role] if role else {}
+        durations, query_counts, query_times, statuses = [], [], [], set()
+        for attempt in range(warmup + iterations):
+            # Several routes still print debugging output; keep it out of the report
+            with contextlib.redirect_stdout(io.StringIO()), record_queries(name) as stats:
+                started = time.perf_counter()
+                response = client.get(path, headers=request_headers)
+                response.get_data()
+                elapsed = time.perf_counter() - started
+            if attempt < warmup:
+                continue
+            durations.append(elapsed * 1000)
+            query_counts.append(stats.count)
+            query_times.append(stats.total_time * 1000)
+            statuses.add(response.status_code)
+
+        results[name] = {
+            "path": path,
+            "role": role or "anonymous",
+            "status": sorted(statuses),
+            "iterations": iterations,
+            "p50_ms": round(percentile(durations, 0.50), 2),
+            "p95_ms": round(percentile(durations, 0.95), 2),
+            "mean_ms": round(sum(durations) / len(durations), 2),
+            "max_ms": round(max(durations), 2),
+            "queries": max(query_counts),
+            "db_p50_ms": round(percentile(query_times, 0.50), 2),
+        }
+        if progress:
+            result = results[name]
+            progress(f"  {name:<28} p50 {result['p50_ms']:>9.2f}ms  p95 {result['p95_ms']:>9.2f}ms  "
+                     f"{result['queries']:>5} queries  {result['status']}")
+    return results
+
+
+def build_report(app, scale, counts, results, iterations, warmup, response_cache):
+    with app.app_context():
+        from app.extensions import db
+        dialect = db.engine.dialect.name
+    return {
+        "meta": {
+            "scale": scale,
+            "dataset": counts,
+            "iterations": iterations,
+            "warmup": warmup,
+            "response_cache": response_cache,
+            "database": dialect,
+            "python": platform.python_version(),
+        },
+        "endpoints": results,
+    }
+
+
+def write_report(report, path):
+    # Sorted keys and one value per line keep diffs between runs readable
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare_reports(baseline, current, tolerance=0.25):
+    """Lines describing regressions: more queries, or p95 more than tolerance slower"""
+    regressions = []
+    for name, result in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            continue
+        if result["queries"] > before["queries"]:
+            regressions.append(f"{name}: {before['queries']} -> {result['queries']} queries")
+        if before["p95_ms"] and result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']}ms -> {result['p95_ms']}ms")
+        if result["status"] != before["status"]:
+            regressions.append(f"{name}: status {before['status']} -> {result['status']}")
+    return regressions
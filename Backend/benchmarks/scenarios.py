@@ -0,0 +1,34 @@
+"""The endpoints the benchmark times: (name, role to call as, path built from the fixture ids).
+
+Role None means an anonymous request. Keep names stable: they are the keys of the results file.
+"""
+
+SCENARIOS = [
+    ("browse_categories", None, lambda ids: "/rental-browsing/categories"),
+    ("browse_category_items", None, lambda ids: f"/rental-browsing/categories/{ids['category_id']}/items?page=1"),
+    ("search", None, lambda ids: "/rental-browsing/search?q=toyota"),
+    ("search_by_category", None, lambda ids: f"/rental-browsing/search?q=family&category_id={ids['category_id']}"),
+    ("my_bookings", "renter", lambda ids: "/api/booking/my-bookings"),
+    ("my_payments", "renter", lambda ids: "/payment/my-payments"),
+    ("admin_dashboard", "admin", lambda ids: "/admin/dashboard/stats"),
+    ("admin_revenue", "admin", lambda ids: "/admin/dashboard/revenue"),
+    ("admin_bookings", "admin", lambda ids: "/admin/bookings"),
+    ("owner_dashboard", "owner", lambda ids: "/api/owner/dashboard"),
+    ("owner_dashboard_panels", "owner",
+     lambda ids: "/api/owner/dashboard?sections=summary,revenue,category_stats,recent_bookings"),
+    ("owner_bookings", "owner", lambda ids: "/api/owner/bookings"),
+    ("reports_earnings_owner", "owner", lambda ids: "/reports/earnings"),
+    ("reports_system_overview", "admin", lambda ids: "/reports/admin/system-overview"),
+    ("reports_booking_analytics", "admin", lambda ids: "/reports/admin/booking-analytics"),
+    ("receipt", "renter", lambda ids: f"/receipt/{ids['receipt_booking_id']}"),
+]
+
+
+def select(names=None):
+    """Scenarios whose name is in names (all when names is empty)"""
+    if not names:
+        return list(SCENARIOS)
+    unknown = set(names) - {name for name, _, _ in SCENARIOS}
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+    return [scenario for scenario in SCENARIOS if scenario[0] in names]
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Nightly Job: Daily Platform Stats
+=================================
+
+Stores closing totals in daily_platform_stats for the previous UTC day,
+recounted from users, bookings, complaints, rental items and categories.
+Daily deltas are maintained on every write; this job anchors them with a
+fresh count each night, repairs any drift and gives the dashboard trend
+charts their history. Schedule it shortly after midnight UTC, e.g.:
+
+    5 0 * * *  cd /path/to/Backend && python close_platform_stats.py
+
+Usage:
+    python close_platform_stats.py [YYYY-MM-DD]
+"""
+
+import sys
+import os
+from datetime import datetime
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.utils.platform_stats import close_day
+
+def close_platform_stats(day=None):
+    """Write closing totals for day (default: yesterday) and report drifted metrics"""
+    print("Daily Platform Stats Close")
+    print("==========================")
+    
+    try:
+        drifted = close_day(day)
+        for metric, (expected, actual) in sorted(drifted.items()):
+            print(f"  {metric}: {expected} -> {actual}")
+        print(f"✓ Day closed, {len(drifted)} metrics corrected")
+    except Exception as e:
+        print(f"❌ Close failed: {str(e)}")
+        db.session.rollback()
+        return False
+    
+    return True
+
+if __name__ == "__main__":
+    day = None
+    if len(sys.argv) > 1:
+        try:
+            day = datetime.strptime(sys.argv[1], "%Y-%m-%d").date()
+        except ValueError:
+            print("❌ Day must be YYYY-MM-DD")
+            sys.exit(1)
+    
+    app = create_app()
+    
+    with app.app_context():
+        success = close_platform_stats(day)
+    
+    if not success:
+        sys.exit(1)
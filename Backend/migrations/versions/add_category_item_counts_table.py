@@ -0,0 +1,48 @@
+"""Add category_item_counts counters table
+
+Revision ID: add_category_item_counts_table
+Revises: add_item_attributes_table
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_category_item_counts_table'
+down_revision = 'add_item_attributes_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create category_item_counts table (bookable items per category)
+    op.create_table('category_item_counts',
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('available_items', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('category_id')
+    )
+
+    # Backfill one row per category; the bookable rule mirrors app.utils.availability
+    op.execute("""
+        INSERT INTO category_item_counts (category_id, available_items, updated_at)
+        SELECT categories.id, COUNT(rental_items.id), CURRENT_TIMESTAMP
+        FROM categories
+        LEFT JOIN rental_items ON rental_items.category_id = categories.id
+            AND rental_items.is_available = true
+            AND NOT EXISTS (
+                SELECT 1 FROM bookings
+                WHERE bookings.rental_item_id = rental_items.id
+                    AND bookings.payment_status IN ('PENDING', 'HELD', 'COMPLETED')
+                    AND bookings.status IN ('Requirements_Submitted', 'Payment_Held', 'Confirmed', 'Active')
+            )
+        GROUP BY categories.id
+    """)
+
+
+def downgrade():
+    # Drop table
+    op.drop_table('category_item_counts')
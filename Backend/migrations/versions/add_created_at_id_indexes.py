@@ -0,0 +1,41 @@
+"""Add (created_at, id) indexes for keyset pagination
+
+Revision ID: add_created_at_id_indexes
+Revises: add_category_item_counts_table
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_created_at_id_indexes'
+down_revision = 'add_category_item_counts_table'
+branch_labels = None
+depends_on = None
+
+# Tables listed newest-first by cursor pagination
+PAGED_TABLES = ('bookings', 'complaints', 'rental_items', 'users')
+
+
+def upgrade():
+    # Rows without a timestamp would need a coalesce in the sort, which the index cannot serve
+    for table in PAGED_TABLES:
+        op.execute(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=False)
+
+    # Composite indexes backing newest-first cursor pagination
+    for table in PAGED_TABLES:
+        op.create_index(f'ix_{table}_created_at_id', table, ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    # Remove indexes
+    for table in reversed(PAGED_TABLES):
+        op.drop_index(f'ix_{table}_created_at_id', table_name=table)
+
+    for table in PAGED_TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('created_at', existing_type=sa.DateTime(), nullable=True)
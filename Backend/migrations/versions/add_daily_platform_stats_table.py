@@ -0,0 +1,33 @@
+"""Add daily_platform_stats rollup table for the admin dashboard
+
+Revision ID: add_daily_platform_stats_table
+Revises: add_refresh_tokens_table
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_daily_platform_stats_table'
+down_revision = 'add_refresh_tokens_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create daily_platform_stats table (one row per day and metric; the primary key serves lookups)
+    op.create_table('daily_platform_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('metric', sa.String(length=80), nullable=False),
+        sa.Column('delta', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('day', 'metric')
+    )
+
+
+def downgrade():
+    # Drop table
+    op.drop_table('daily_platform_stats')
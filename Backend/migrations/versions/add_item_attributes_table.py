@@ -0,0 +1,50 @@
+"""Add item_attributes typed attribute index table
+
+Revision ID: add_item_attributes_table
+Revises: add_search_tokens_table
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_item_attributes_table'
+down_revision = 'add_search_tokens_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create item_attributes table (typed values extracted from rental_items.dynamic_data)
+    op.create_table('item_attributes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('rental_item_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('requirement_id', sa.Integer(), nullable=False),
+        sa.Column('value_text', sa.String(length=255), nullable=True),
+        sa.Column('value_number', sa.Float(), nullable=True),
+        sa.Column('value_date', sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(['rental_item_id'], ['rental_items.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ),
+        sa.ForeignKeyConstraint(['requirement_id'], ['category_requirements.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Composite indexes for range / equality filters and facet counts per field
+    op.create_index('ix_item_attributes_number', 'item_attributes', ['requirement_id', 'value_number', 'rental_item_id'], unique=False)
+    op.create_index('ix_item_attributes_text', 'item_attributes', ['requirement_id', 'value_text', 'rental_item_id'], unique=False)
+    op.create_index('ix_item_attributes_date', 'item_attributes', ['requirement_id', 'value_date', 'rental_item_id'], unique=False)
+    op.create_index('ix_item_attributes_rental_item_id', 'item_attributes', ['rental_item_id'], unique=False)
+
+
+def downgrade():
+    # Remove indexes
+    op.drop_index('ix_item_attributes_rental_item_id', table_name='item_attributes')
+    op.drop_index('ix_item_attributes_date', table_name='item_attributes')
+    op.drop_index('ix_item_attributes_text', table_name='item_attributes')
+    op.drop_index('ix_item_attributes_number', table_name='item_attributes')
+
+    # Drop table
+    op.drop_table('item_attributes')
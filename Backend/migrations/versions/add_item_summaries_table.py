@@ -0,0 +1,43 @@
+"""Add item_summaries listing card projection table
+
+Revision ID: add_item_summaries_table
+Revises: add_resource_versions_table
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_item_summaries_table'
+down_revision = 'add_resource_versions_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create item_summaries table (pre-rendered listing cards, one per rental item)
+    op.create_table('item_summaries',
+        sa.Column('rental_item_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('price', sa.Float(), nullable=True),
+        sa.Column('thumbnail_url', sa.String(length=500), nullable=True),
+        sa.Column('category_name', sa.String(length=100), nullable=True),
+        sa.Column('owner_username', sa.String(length=50), nullable=True),
+        sa.Column('summary_json', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['rental_item_id'], ['rental_items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('rental_item_id')
+    )
+    op.create_index('ix_item_summaries_category_id', 'item_summaries', ['category_id'], unique=False)
+    op.create_index('ix_item_summaries_owner_id', 'item_summaries', ['owner_id'], unique=False)
+
+
+def downgrade():
+    # Drop indexes and table
+    op.drop_index('ix_item_summaries_owner_id', table_name='item_summaries')
+    op.drop_index('ix_item_summaries_category_id', table_name='item_summaries')
+    op.drop_table('item_summaries')
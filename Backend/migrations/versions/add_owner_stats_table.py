@@ -0,0 +1,84 @@
+"""Add owner_stats projection table for the owner dashboard
+
+Revision ID: add_owner_stats_table
+Revises: add_revenue_ledger_tables
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_owner_stats_table'
+down_revision = 'add_revenue_ledger_tables'
+branch_labels = None
+depends_on = None
+
+rental_items = sa.table('rental_items',
+    sa.column('id', sa.Integer), sa.column('owner_id', sa.Integer), sa.column('category_id', sa.Integer),
+    sa.column('is_available', sa.Boolean)
+)
+bookings = sa.table('bookings',
+    sa.column('id', sa.Integer), sa.column('rental_item_id', sa.Integer), sa.column('status', sa.String),
+    sa.column('payment_status', sa.String), sa.column('payment_amount', sa.Float)
+)
+owner_stats = sa.table('owner_stats',
+    sa.column('owner_id', sa.Integer), sa.column('category_id', sa.Integer), sa.column('metric', sa.String),
+    sa.column('value', sa.Numeric), sa.column('updated_at', sa.DateTime)
+)
+
+
+def upgrade():
+    # Create owner_stats table (one row per owner, category and metric; the primary key serves lookups)
+    op.create_table('owner_stats',
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(length=40), nullable=False),
+        sa.Column('value', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('owner_id', 'category_id', 'metric')
+    )
+
+    # Count the existing items and bookings, as app.utils.owner_stats.compute_owner_stats() does
+    _backfill_stats()
+
+
+def _insert_grouped(metric, source, value, *conditions):
+    """INSERT ... SELECT one metric per (owner_id, category_id), skipping zero values"""
+    op.execute(owner_stats.insert().from_select(
+        ['owner_id', 'category_id', 'metric', 'value', 'updated_at'],
+        sa.select(rental_items.c.owner_id, rental_items.c.category_id, sa.literal(metric), value,
+                  sa.func.current_timestamp())
+        .select_from(source).where(*conditions)
+        .group_by(rental_items.c.owner_id, rental_items.c.category_id)
+        .having(value != 0)
+    ))
+
+
+def _backfill_stats():
+    _insert_grouped('items.total', rental_items, sa.func.count(rental_items.c.id))
+    _insert_grouped('items.available', rental_items, sa.func.count(rental_items.c.id),
+                    rental_items.c.is_available == sa.true())
+
+    booked = bookings.join(rental_items, bookings.c.rental_item_id == rental_items.c.id)
+    amount = sa.func.round(sa.func.sum(sa.func.coalesce(bookings.c.payment_amount, 0)), 2)
+    _insert_grouped('bookings.total', booked, sa.func.count(bookings.c.id))
+    _insert_grouped('bookings.value', booked, amount)
+    _insert_grouped('bookings.pending_value', booked, amount, bookings.c.payment_status == 'PENDING')
+
+    # Buckets as owner_stats.status_bucket() assigns them: the first matching word wins
+    status = sa.func.lower(sa.func.trim(sa.func.coalesce(bookings.c.status, '')))
+    bucket = sa.case(
+        (status.like('%pending%'), 'pending'),
+        (sa.or_(status.like('%accepted%'), status.like('%approved%')), 'accepted'),
+        (sa.or_(*(status.like(f'%{word}%') for word in ('completed', 'delivered', 'returned', 'finished'))),
+         'completed'),
+    )
+    for name in ('pending', 'accepted', 'completed'):
+        _insert_grouped(f'bookings.{name}', booked, sa.func.count(bookings.c.id), bucket == name)
+
+
+def downgrade():
+    # Drop table
+    op.drop_table('owner_stats')
@@ -0,0 +1,31 @@
+"""Add resource_versions table for conditional GET version stamps
+
+Revision ID: add_resource_versions_table
+Revises: add_created_at_id_indexes
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_resource_versions_table'
+down_revision = 'add_created_at_id_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create resource_versions table (one counter per cacheable scope)
+    op.create_table('resource_versions',
+        sa.Column('scope', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade():
+    # Drop table
+    op.drop_table('resource_versions')
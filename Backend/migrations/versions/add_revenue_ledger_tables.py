@@ -0,0 +1,140 @@
+"""Add ledger_entries and account_balances tables for the revenue ledger
+
+Revision ID: add_revenue_ledger_tables
+Revises: add_daily_platform_stats_table
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from collections import Counter
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_revenue_ledger_tables'
+down_revision = 'add_daily_platform_stats_table'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000  # Bookings whose opening entries are rolled into balances at a time
+
+bookings = sa.table('bookings',
+    sa.column('id', sa.Integer), sa.column('rental_item_id', sa.Integer), sa.column('status', sa.String),
+    sa.column('payment_status', sa.String), sa.column('admin_approved', sa.Boolean),
+    sa.column('payment_amount', sa.Float), sa.column('service_fee', sa.Numeric),
+    sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+    sa.column('payment_held_at', sa.DateTime), sa.column('payment_released_at', sa.DateTime)
+)
+rental_items = sa.table('rental_items', sa.column('id', sa.Integer), sa.column('owner_id', sa.Integer))
+ledger_entries = sa.table('ledger_entries',
+    sa.column('booking_id', sa.Integer), sa.column('account', sa.String), sa.column('entry_type', sa.String),
+    sa.column('amount', sa.Numeric), sa.column('note', sa.String), sa.column('created_at', sa.DateTime)
+)
+account_balances = sa.table('account_balances',
+    sa.column('account', sa.String), sa.column('balance', sa.Numeric), sa.column('bookings', sa.Integer),
+    sa.column('updated_at', sa.DateTime)
+)
+
+
+def upgrade():
+    # Create ledger_entries table (append-only; one row per account per payment transition)
+    op.create_table('ledger_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('booking_id', sa.Integer(), nullable=True),
+        sa.Column('account', sa.String(length=60), nullable=False),
+        sa.Column('entry_type', sa.String(length=30), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('note', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Create indexes for per-booking positions and per-account history
+    op.create_index('ix_ledger_entries_booking_id', 'ledger_entries', ['booking_id'], unique=False)
+    op.create_index('ix_ledger_entries_account_created_at', 'ledger_entries', ['account', 'created_at'], unique=False)
+
+    # Create account_balances table (running balance per account and account prefix)
+    op.create_table('account_balances',
+        sa.Column('account', sa.String(length=60), nullable=False),
+        sa.Column('balance', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('bookings', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('account')
+    )
+
+    # Open every existing booking's position, as app.utils.ledger.target_positions() defines it
+    _backfill_entries()
+    _backfill_balances()
+
+
+def _backfill_entries():
+    """One "opening" entry per booking for its fee and one for its payment amount, dated when the money moved"""
+    held = bookings.c.payment_status == 'HELD'
+    completed = bookings.c.payment_status == 'COMPLETED'
+    refunded = sa.and_(bookings.c.payment_status == 'FAILED', bookings.c.payment_held_at.isnot(None))
+    qualifies = sa.and_(completed, sa.or_(bookings.c.status == 'Confirmed', bookings.c.admin_approved == sa.true()))
+    owner_id = sa.cast(rental_items.c.owner_id, sa.String)
+    moved_at = sa.case(
+        (completed, sa.func.coalesce(bookings.c.payment_released_at, bookings.c.payment_held_at, bookings.c.created_at)),
+        (refunded, sa.func.coalesce(bookings.c.updated_at, bookings.c.payment_held_at, bookings.c.created_at)),
+        else_=sa.func.coalesce(bookings.c.payment_held_at, bookings.c.created_at)
+    )
+
+    fee_account = sa.case(
+        (held, sa.literal('held:fees')),
+        (qualifies, sa.literal('platform')),
+        (completed, sa.literal('released:fees')),
+        else_=sa.literal('refunds:fees')
+    )
+    owner_account = sa.case(
+        (held, sa.literal('held:owner:', sa.String) + owner_id),
+        (completed, sa.literal('owner:', sa.String) + owner_id),
+        else_=sa.literal('refunds:owner:', sa.String) + owner_id
+    )
+    for account, amount in ((fee_account, bookings.c.service_fee), (owner_account, bookings.c.payment_amount)):
+        amount = sa.func.round(sa.func.coalesce(amount, 0), 2)
+        op.execute(ledger_entries.insert().from_select(
+            ['booking_id', 'account', 'entry_type', 'amount', 'note', 'created_at'],
+            sa.select(bookings.c.id, account, sa.literal('opening'), amount, sa.literal('ledger backfill'), moved_at)
+            .select_from(bookings.join(rental_items, bookings.c.rental_item_id == rental_items.c.id))
+            .where(sa.or_(held, completed, refunded), amount != 0)
+        ))
+
+
+def _backfill_balances():
+    """Roll the opening entries up into account_balances, a range of bookings at a time"""
+    connection = op.get_bind()
+    balances, booking_counts = Counter(), Counter()
+    last_id = connection.execute(sa.select(sa.func.max(ledger_entries.c.booking_id))).scalar() or 0
+    for start in range(0, last_id, BACKFILL_BATCH_SIZE):
+        positions = {}
+        rows = connection.execute(
+            sa.select(ledger_entries.c.booking_id, ledger_entries.c.account, ledger_entries.c.amount)
+            .where(ledger_entries.c.booking_id > start, ledger_entries.c.booking_id <= start + BACKFILL_BATCH_SIZE)
+        )
+        for booking_id, account, amount in rows:
+            parts = account.split(':')
+            for key in (':'.join(parts[:length]) for length in range(len(parts), 0, -1)):
+                positions.setdefault(booking_id, Counter())[key] += amount
+        for rolled_up in positions.values():
+            for key, value in rolled_up.items():
+                balances[key] += value
+                # bookings counts the booking while its position in the account is non-zero
+                if value:
+                    booking_counts[key] += 1
+
+    now = datetime.utcnow()
+    rows = [{'account': account, 'balance': balance, 'bookings': booking_counts[account], 'updated_at': now}
+            for account, balance in sorted(balances.items())]
+    if rows:
+        op.bulk_insert(account_balances, rows)
+
+
+def downgrade():
+    # Drop indexes and tables
+    op.drop_table('account_balances')
+    op.drop_index('ix_ledger_entries_account_created_at', table_name='ledger_entries')
+    op.drop_index('ix_ledger_entries_booking_id', table_name='ledger_entries')
+    op.drop_table('ledger_entries')
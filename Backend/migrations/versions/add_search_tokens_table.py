@@ -0,0 +1,43 @@
+"""Add search_tokens inverted index table
+
+Revision ID: add_search_tokens_table
+Revises: add_type_to_notifications
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_search_tokens_table'
+down_revision = 'add_type_to_notifications'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create search_tokens table (postings of the rental item full-text index)
+    op.create_table('search_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('token', sa.String(length=64), nullable=False),
+        sa.Column('rental_item_id', sa.Integer(), nullable=False),
+        sa.Column('term_frequency', sa.Integer(), nullable=False),
+        sa.Column('doc_length', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['rental_item_id'], ['rental_items.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Covering index for prefix lookups and BM25 scoring
+    op.create_index('ix_search_tokens_token_item', 'search_tokens',
+                    ['token', 'rental_item_id', 'term_frequency', 'doc_length'], unique=False)
+    op.create_index('ix_search_tokens_rental_item_id', 'search_tokens', ['rental_item_id'], unique=False)
+
+
+def downgrade():
+    # Remove indexes
+    op.drop_index('ix_search_tokens_rental_item_id', table_name='search_tokens')
+    op.drop_index('ix_search_tokens_token_item', table_name='search_tokens')
+
+    # Drop table
+    op.drop_table('search_tokens')
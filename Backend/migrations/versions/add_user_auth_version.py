@@ -0,0 +1,27 @@
+"""Add auth_version to users for token revocation
+
+Revision ID: add_user_auth_version
+Revises: add_item_summaries_table
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_auth_version'
+down_revision = 'add_item_summaries_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tokens carry the auth_version they were issued at; bumping it revokes them
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('auth_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('auth_version')
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Maintenance Script: Purge Expired Refresh Tokens
+================================================
+
+Deletes refresh tokens past their expiry. Rotated and revoked tokens are kept
+until they expire so that reuse of a stolen token can still be detected; after
+that they are dead weight. Safe to run at any time, e.g. daily from cron.
+
+Usage:
+    python purge_refresh_tokens.py
+"""
+
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.utils.tokens import purge_refresh_tokens
+
+def purge_expired_refresh_tokens():
+    """Delete every expired refresh token"""
+    print("Refresh Token Purge")
+    print("===================")
+    
+    try:
+        removed = purge_refresh_tokens()
+        print(f"✓ Removed {removed} expired refresh tokens")
+    except Exception as e:
+        print(f"❌ Purge failed: {str(e)}")
+        db.session.rollback()
+        return False
+    
+    return True
+
+if __name__ == "__main__":
+    app = create_app()
+    
+    with app.app_context():
+        success = purge_expired_refresh_tokens()
+    
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Rebuild Script: Rental Item Attribute Index
+===========================================
+
+Rebuilds the item_attributes table (typed values used for faceted filtering)
+from rental_items.dynamic_data and the category requirements they answer.
+The index is maintained automatically on every write; run this once after
+creating the table, or whenever it is suspected to be out of sync.
+
+Usage:
+    python rebuild_item_attributes.py
+"""
+
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.utils.attribute_index import rebuild_index
+
+def rebuild_item_attributes():
+    """Re-extract typed attributes for every rental item"""
+    print("Rental Item Attribute Index Rebuild")
+    print("===================================")
+    
+    try:
+        indexed = rebuild_index()
+        print(f"✓ Indexed {indexed} rental items")
+    except Exception as e:
+        print(f"❌ Rebuild failed: {str(e)}")
+        db.session.rollback()
+        return False
+    
+    return True
+
+if __name__ == "__main__":
+    app = create_app()
+    
+    with app.app_context():
+        success = rebuild_item_attributes()
+    
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Rebuild Script: Rental Item Summaries
+=====================================
+
+Rebuilds the item_summaries projection (pre-rendered listing cards with name,
+price, thumbnail, category name and owner username) from rental_items and the
+categories and users they reference. Summaries are refreshed automatically on
+every write; run this once after creating the table, or whenever they are
+suspected to be out of sync.
+
+Usage:
+    python rebuild_item_summaries.py
+"""
+
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.utils.item_summary import rebuild_summaries
+
+def rebuild_item_summaries():
+    """Re-render the listing card of every rental item"""
+    print("Rental Item Summary Rebuild")
+    print("===========================")
+    
+    try:
+        refreshed = rebuild_summaries()
+        print(f"✓ Rendered {refreshed} rental item summaries")
+    except Exception as e:
+        print(f"❌ Rebuild failed: {str(e)}")
+        db.session.rollback()
+        return False
+    
+    return True
+
+if __name__ == "__main__":
+    app = create_app()
+    
+    with app.app_context():
+        success = rebuild_item_summaries()
+    
+    if not success:
+        sys.exit(1)
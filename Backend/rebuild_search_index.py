@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Rebuild Script: Rental Item Search Index
+========================================
+
+Rebuilds the search_tokens table from rental_items.dynamic_data.
+The index is maintained automatically on every write; run this once after
+creating the table, or whenever the index is suspected to be out of sync.
+
+Usage:
+    python rebuild_search_index.py
+"""
+
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.utils.search_index import rebuild_index
+
+def rebuild_search_index():
+    """Re-tokenize every rental item into search_tokens"""
+    print("Rental Item Search Index Rebuild")
+    print("================================")
+    
+    try:
+        indexed = rebuild_index()
+        print(f"✓ Indexed {indexed} rental items")
+    except Exception as e:
+        print(f"❌ Rebuild failed: {str(e)}")
+        db.session.rollback()
+        return False
+    
+    return True
+
+if __name__ == "__main__":
+    app = create_app()
+    
+    with app.app_context():
+        success = rebuild_search_index()
+    
+    if not success:
+        sys.exit(1)
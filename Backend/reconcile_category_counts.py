@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Reconcile Script: Category Item Counters
+========================================
+
+Rebuilds the category_item_counts table from rental_items and bookings.
+The counters are maintained transactionally on every write; run this once
+after creating the table, or periodically to repair any drift.
+
+Usage:
+    python reconcile_category_counts.py
+"""
+
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.utils.category_counters import reconcile_counts
+
+def reconcile_category_counts():
+    """Recount bookable items for every category and fix drifted counters"""
+    print("Category Item Counters Reconcile")
+    print("================================")
+    
+    try:
+        drifted = reconcile_counts()
+        for category_id, (old, new) in sorted(drifted.items()):
+            print(f"  Category {category_id}: {old} -> {new}")
+        print(f"✓ {len(drifted)} counters corrected")
+    except Exception as e:
+        print(f"❌ Reconcile failed: {str(e)}")
+        db.session.rollback()
+        return False
+    
+    return True
+
+if __name__ == "__main__":
+    app = create_app()
+    
+    with app.app_context():
+        success = reconcile_category_counts()
+    
+    if not success:
+        sys.exit(1)
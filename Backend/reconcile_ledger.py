@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Maintenance Job: Revenue Ledger Reconciliation
+==============================================
+
+Checks that every booking's position in ledger_entries matches its payment
+state, and that account_balances agrees with the sum of the entries. Run it
+once with --fix after migrating to post opening entries for existing
+bookings; after that, schedule it (e.g. nightly) as an audit:
+
+    15 0 * * *  cd /path/to/Backend && python reconcile_ledger.py
+
+Usage:
+    python reconcile_ledger.py [--fix]
+"""
+
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.utils.ledger import reconcile
+
+def reconcile_ledger(fix=False):
+    """Report (and with fix, correct) bookings and balances that disagree with the ledger"""
+    print("Revenue Ledger Reconciliation")
+    print("=============================")
+    
+    try:
+        result = reconcile(fix=fix)
+        for booking_id, positions, expected in result["bookings"]:
+            print(f"  booking {booking_id}: ledger {_format(positions)} != expected {_format(expected)}")
+        for account, (balance, bookings), (expected_balance, expected_bookings) in result["balances"]:
+            print(f"  {account}: {balance} ({bookings} bookings) != entries {expected_balance} ({expected_bookings} bookings)")
+        
+        drifted = len(result["bookings"]) + len(result["balances"])
+        if not drifted:
+            print("✓ Ledger reconciles with bookings and balances")
+        elif fix:
+            print(f"✓ {len(result['bookings'])} bookings and {len(result['balances'])} balances corrected")
+        else:
+            print(f"❌ {len(result['bookings'])} bookings and {len(result['balances'])} balances out of step (rerun with --fix)")
+            return False
+    except Exception as e:
+        print(f"❌ Reconciliation failed: {str(e)}")
+        db.session.rollback()
+        return False
+    
+    return True
+
+def _format(positions):
+    return "{" + ", ".join(f"{account}: {amount}" for account, amount in sorted(positions.items())) + "}"
+
+if __name__ == "__main__":
+    app = create_app()
+    
+    with app.app_context():
+        success = reconcile_ledger(fix="--fix" in sys.argv[1:])
+    
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Reconcile Script: Owner Dashboard Stats
+=======================================
+
+Rebuilds the owner_stats table from rental_items and bookings. The stats
+are maintained transactionally on every write; run this once after
+creating the table, or periodically to repair any drift.
+
+Usage:
+    python reconcile_owner_stats.py [owner_id]
+"""
+
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app
+from app.extensions import db
+from app.utils.owner_stats import reconcile_owner_stats as reconcile
+
+def reconcile_owner_stats(owner_id=None):
+    """Recount dashboard stats for one owner (default: every owner) and fix drifted values"""
+    print("Owner Dashboard Stats Reconcile")
+    print("===============================")
+    
+    try:
+        drifted = reconcile(owner_id)
+        for (stat_owner, category_id, metric), (old, new) in sorted(drifted.items()):
+            print(f"  Owner {stat_owner}, category {category_id}, {metric}: {old} -> {new}")
+        print(f"✓ {len(drifted)} values corrected")
+    except Exception as e:
+        print(f"❌ Reconcile failed: {str(e)}")
+        db.session.rollback()
+        return False
+    
+    return True
+
+if __name__ == "__main__":
+    owner_id = None
+    if len(sys.argv) > 1:
+        if not sys.argv[1].isdigit():
+            print("❌ owner_id must be a number")
+            sys.exit(1)
+        owner_id = int(sys.argv[1])
+    
+    app = create_app()
+    
+    with app.app_context():
+        success = reconcile_owner_stats(owner_id)
+    
+    if not success:
+        sys.exit(1)
@@ -1,14 +1,13 @@
-
-from app.extensions import db, bcrypt
+from app.extensions import db
 from app.models.user import User
+from app.utils.passwords import BCRYPT_PREFIXES, WERKZEUG_PREFIXES, hash_password
 
 def hash_existing_passwords():
     users = User.query.all()
     for user in users:
-        # Only hash if not already hashed (basic check)
-        if not user.password.startswith("$2b$"):
-            hashed = bcrypt.generate_password_hash(user.password).decode("utf-8")
-            user.password = hashed
+        # Only hash plaintext passwords; bcrypt and legacy werkzeug hashes are upgraded on login
+        if not user.password.startswith(BCRYPT_PREFIXES + WERKZEUG_PREFIXES):
+            user.password = hash_password(user.password)
             print(f"Hashed password for user: {user.username}")
     db.session.commit()
     print("All existing passwords have been hashed.")
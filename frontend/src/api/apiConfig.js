@@ -25,12 +25,50 @@ apiClient.interceptors.request.use((config) => {
   return config;
 });
 
+// Access tokens are short-lived: on 401, exchange the refresh token once and retry.
+// Concurrent 401s share a single refresh request (refresh tokens rotate on every use).
+let refreshRequest = null;
+
+const refreshAccessToken = () => {
+  if (!refreshRequest) {
+    const refreshToken = localStorage.getItem('refreshToken');
+    refreshRequest = axios.post(`${baseURL}/api/auth/refresh`, { refresh_token: refreshToken })
+      .then(({ data }) => {
+        localStorage.setItem('token', data.token);
+        localStorage.setItem('refreshToken', data.refresh_token);
+        localStorage.setItem('tokenTimestamp', Date.now().toString());
+        return data.token;
+      })
+      .finally(() => {
+        refreshRequest = null;
+      });
+  }
+  return refreshRequest;
+};
+
 // Response interceptor for global error handling
 apiClient.interceptors.response.use(
   (response) => {
     return response;
   },
-  (error) => {
+  async (error) => {
+    const canRefresh = error.response?.status === 401 &&
+      !error.config?._retried &&
+      !error.config?.url?.includes('/auth/') &&
+      localStorage.getItem('refreshToken');
+
+    if (canRefresh) {
+      try {
+        const token = await refreshAccessToken();
+        error.config._retried = true;
+        error.config.headers.Authorization = `Bearer ${token}`;
+        return apiClient(error.config);
+      } catch (refreshError) {
+        localStorage.removeItem('refreshToken');
+        // Fall through to the normal 401 handling below
+      }
+    }
+
     console.error('❌ API Error - Status:', error.response?.status);
     console.error('❌ API Error - URL:', error.config?.url);
     console.error('❌ API Error - Message:', error.message);
@@ -66,6 +104,7 @@ apiClient.interceptors.response.use(
           // Only redirect if we have a valid token format and it's not a recent login
           console.log('Token validation failed, redirecting to login');
           localStorage.removeItem('token');
+          localStorage.removeItem('refreshToken');
           localStorage.removeItem('user');
           localStorage.removeItem('tokenTimestamp');
           // Use React Router navigation instead of window.location
@@ -75,6 +114,7 @@ apiClient.interceptors.response.use(
         } else if (!hasValidToken) {
           // Clear invalid token
           localStorage.removeItem('token');
+          localStorage.removeItem('refreshToken');
           localStorage.removeItem('user');
           localStorage.removeItem('tokenTimestamp');
         } else {
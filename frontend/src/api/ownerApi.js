@@ -82,8 +82,8 @@ export const ownerApi = {
 
   // ------------------- DASHBOARD METHODS -------------------
 
-  // Get comprehensive dashboard data
-  getDashboardData: () => apiClient.get('/api/owner/dashboard'),
+  // Get dashboard data; sections limits the response to the panels rendered (all by default)
+  getDashboardData: (sections) => apiClient.get('/api/owner/dashboard', sections ? { params: { sections: sections.join(',') } } : undefined),
 
   // Get dashboard statistics
   getDashboardStats: () => apiClient.get('/api/owner/dashboard/stats'),
@@ -17,6 +17,18 @@ export const paymentApi = {
     return apiClient.get(url);
   },
 
+  // Receipt PDF (or JSON with base64 pdf_data); failures reject with the server's error message
+  downloadReceipt: async (bookingId) => {
+    try {
+      return await apiClient.get(`/receipt/${bookingId}`, { responseType: 'blob' });
+    } catch (error) {
+      // With responseType 'blob' the error body arrives as a Blob too
+      const body = error.response?.data;
+      const errorData = body instanceof Blob ? await body.text().then(JSON.parse).catch(() => ({})) : {};
+      throw new Error(errorData.error || 'Failed to download PDF');
+    }
+  },
+
   // Admin Payment Management
   releasePayment: (bookingId) => apiClient.post(`/payment/release/${bookingId}`),
 
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate, useLocation } from 'react-router-dom';
 import { useNotification } from '../contexts/NotificationContext';
 import { useAuth } from '../contexts/AuthContext';
+import { apiClient } from '../api/apiConfig';
 
 const PaymentForm = () => {
     const navigate = useNavigate();
@@ -70,42 +71,33 @@ const PaymentForm = () => {
 
         setLoading(true);
         try {
-            const response = await fetch('/payment/submit', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'Authorization': `Bearer ${localStorage.getItem('token')}`
-                },
-                body: JSON.stringify({
-                    booking_id: bookingData.booking_id,
-                    payment_method: formData.payment_method,
-                    payment_account: formData.payment_account
-                })
+            const { data } = await apiClient.post('/payment/submit', {
+                booking_id: bookingData.booking_id,
+                payment_method: formData.payment_method,
+                payment_account: formData.payment_account
             });
 
-            const data = await response.json();
+            addNotification('Payment submitted successfully! Your payment is now held until delivery confirmation.', 'success');
 
-            if (response.ok) {
-                addNotification('Payment submitted successfully! Your payment is now held until delivery confirmation.', 'success');
+            // Show additional message about multiple rentals
+            setTimeout(() => {
+                addNotification('💡 You can continue renting more items while waiting for delivery confirmation!', 'info');
+            }, 1000);
 
-                // Show additional message about multiple rentals
-                setTimeout(() => {
-                    addNotification('💡 You can continue renting more items while waiting for delivery confirmation!', 'info');
-                }, 1000);
-
-                // Navigate to payment status page
-                navigate(`/payments/${bookingData.booking_id}`, {
-                    state: {
-                        paymentSubmitted: true,
-                        paymentData: data
-                    }
-                });
-            } else {
-                addNotification(data.error || 'Failed to submit payment.', 'error');
-            }
+            // Navigate to payment status page
+            navigate(`/payments/${bookingData.booking_id}`, {
+                state: {
+                    paymentSubmitted: true,
+                    paymentData: data
+                }
+            });
         } catch (error) {
             console.error('Payment submission error:', error);
-            addNotification('Network error. Please try again.', 'error');
+            if (error.response) {
+                addNotification(error.response.data?.error || 'Failed to submit payment.', 'error');
+            } else {
+                addNotification('Network error. Please try again.', 'error');
+            }
         } finally {
             setLoading(false);
         }
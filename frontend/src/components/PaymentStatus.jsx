@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate, useLocation } from 'react-router-dom';
 import { useNotification } from '../contexts/NotificationContext';
 import { useAuth } from '../contexts/AuthContext';
+import { apiClient } from '../api/apiConfig';
 
 const PaymentStatus = () => {
     const { bookingId } = useParams();
@@ -23,36 +24,18 @@ const PaymentStatus = () => {
 
     const fetchPaymentStatus = async () => {
         try {
-            const response = await fetch(`/payment/${bookingId}`, {
-                headers: {
-                    'Authorization': `Bearer ${localStorage.getItem('token')}`
-                }
-            });
-
-            if (response.ok) {
-                const data = await response.json();
-                setPaymentData(data);
-            } else {
-                addNotification('Failed to fetch payment status.', 'error');
-            }
+            const { data } = await apiClient.get(`/payment/${bookingId}`);
+            setPaymentData(data);
         } catch (error) {
             console.error('Error fetching payment status:', error);
-            addNotification('Network error. Please try again.', 'error');
+            addNotification(error.response ? 'Failed to fetch payment status.' : 'Network error. Please try again.', 'error');
         }
     };
 
     const fetchDeliveryStatus = async () => {
         try {
-            const response = await fetch(`/rental-delivery/${bookingId}`, {
-                headers: {
-                    'Authorization': `Bearer ${localStorage.getItem('token')}`
-                }
-            });
-
-            if (response.ok) {
-                const data = await response.json();
-                setDeliveryData(data);
-            }
+            const { data } = await apiClient.get(`/rental-delivery/${bookingId}`);
+            setDeliveryData(data);
         } catch (error) {
             console.error('Error fetching delivery status:', error);
         } finally {
@@ -70,29 +53,20 @@ const PaymentStatus = () => {
 
         setSubmittingConfirmation(true);
         try {
-            const response = await fetch(`/rental-delivery/${bookingId}/renter-confirm`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'Authorization': `Bearer ${localStorage.getItem('token')}`
-                },
-                body: JSON.stringify({
-                    confirmation_code: confirmationCode
-                })
+            await apiClient.post(`/rental-delivery/${bookingId}/renter-confirm`, {
+                confirmation_code: confirmationCode
             });
 
-            const data = await response.json();
-
-            if (response.ok) {
-                addNotification('Delivery confirmation submitted successfully!', 'success');
-                setConfirmationCode('');
-                fetchDeliveryStatus(); // Refresh delivery status
-            } else {
-                addNotification(data.error || 'Failed to confirm delivery.', 'error');
-            }
+            addNotification('Delivery confirmation submitted successfully!', 'success');
+            setConfirmationCode('');
+            fetchDeliveryStatus(); // Refresh delivery status
         } catch (error) {
             console.error('Error confirming delivery:', error);
-            addNotification('Network error. Please try again.', 'error');
+            if (error.response) {
+                addNotification(error.response.data?.error || 'Failed to confirm delivery.', 'error');
+            } else {
+                addNotification('Network error. Please try again.', 'error');
+            }
         } finally {
             setSubmittingConfirmation(false);
         }
@@ -100,25 +74,15 @@ const PaymentStatus = () => {
 
     const requestConfirmationCode = async () => {
         try {
-            const response = await fetch(`/rental-delivery/${bookingId}/renter-confirm`, {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'Authorization': `Bearer ${token}`
-                },
-                body: JSON.stringify({})
-            });
-
-            const data = await response.json();
-
-            if (response.ok) {
-                addNotification('Confirmation code sent to your email!', 'success');
-            } else {
-                addNotification(data.error || 'Failed to send confirmation code.', 'error');
-            }
+            await apiClient.post(`/rental-delivery/${bookingId}/renter-confirm`, {});
+            addNotification('Confirmation code sent to your email!', 'success');
         } catch (error) {
             console.error('Error requesting confirmation code:', error);
-            addNotification('Network error. Please try again.', 'error');
+            if (error.response) {
+                addNotification(error.response.data?.error || 'Failed to send confirmation code.', 'error');
+            } else {
+                addNotification('Network error. Please try again.', 'error');
+            }
         }
     };
 
@@ -12,11 +12,14 @@ export const AuthProvider = ({ children }) => {
   const isAuthenticatedStrict = !!(token && user);
   const isAuthenticated = hasValidToken; // More lenient - just check token validity
 
-  const login = (token, userData) => {
+  const login = (token, userData, refreshToken) => {
     console.log('🔐 Login called with:', { token: token ? 'present' : 'missing', userData });
 
     // Store in localStorage first with timestamp
     localStorage.setItem('token', token);
+    if (refreshToken) {
+      localStorage.setItem('refreshToken', refreshToken);
+    }
     localStorage.setItem('user', JSON.stringify(userData));
     localStorage.setItem('tokenTimestamp', Date.now().toString());
 
@@ -32,6 +35,7 @@ export const AuthProvider = ({ children }) => {
     setToken(null);
     setUser(null);
     localStorage.removeItem('token');
+    localStorage.removeItem('refreshToken');
     localStorage.removeItem('user');
     localStorage.removeItem('tokenTimestamp');
   };
@@ -81,7 +81,8 @@ const OwnerDashboard = () => {
             setLoading(true);
 
 
-            const response = await ownerApi.getDashboardData();
+            // Items and payments have their own requests below; only fetch the panels rendered here
+            const response = await ownerApi.getDashboardData(['summary', 'revenue', 'category_stats', 'recent_bookings']);
 
 
             if (response.data) {
@@ -95,33 +95,15 @@ const AdminPaymentDetail = () => {
             setDownloadingPDF(true);
             addNotification('Generating PDF receipt...', 'info');
 
-            // Get the authentication token
-            const token = localStorage.getItem('token');
-            if (!token) {
-                addNotification('Authentication required for download', 'error');
-                return;
-            }
-
-            // Make API call to download PDF
-            const response = await fetch(`http://127.0.0.1:5000/receipt/${payment.booking_id}`, {
-                method: 'GET',
-                headers: {
-                    'Authorization': `Bearer ${token}`,
-                    'Content-Type': 'application/json',
-                },
-            });
-
-            if (!response.ok) {
-                const errorData = await response.json();
-                throw new Error(errorData.error || 'Failed to download PDF');
-            }
+            // Through apiClient, so an expired access token is refreshed and the request retried
+            const response = await paymentApi.downloadReceipt(payment.booking_id);
 
             // Check if response is PDF or JSON with base64 data
-            const contentType = response.headers.get('content-type');
+            const contentType = response.headers['content-type'];
 
             if (contentType && contentType.includes('application/pdf')) {
                 // Direct PDF download
-                const pdfBlob = await response.blob();
+                const pdfBlob = response.data;
 
                 // Create download link
                 const url = window.URL.createObjectURL(pdfBlob);
@@ -138,7 +120,7 @@ const AdminPaymentDetail = () => {
                 window.URL.revokeObjectURL(url);
             } else {
                 // Fallback: JSON response with base64 PDF data
-                const data = await response.json();
+                const data = JSON.parse(await response.data.text());
 
                 if (data.pdf_data && data.filename) {
                     // Convert base64 to blob
@@ -29,7 +29,7 @@ const Login = () => {
       const response = await authApi.login({ username, password });
 
       if (response.token && response.user) {
-        login(response.token, response.user);
+        login(response.token, response.user, response.refresh_token);
 
         // Redirect based on user role
         const userRole = response.user.role;
@@ -57,7 +57,7 @@ const Login = () => {
               username: username // Use the username from the form
             };
 
-            login(response.token, userData);
+            login(response.token, userData, response.refresh_token);
 
             // Redirect based on decoded role
             const userRole = payload.role;
@@ -144,42 +144,6 @@ const PaymentDetail = () => {
           config: apiError.config
         });
 
-        // Try a direct test to see if the backend is accessible
-        try {
-          console.log('Testing direct backend access...');
-          const testResponse = await fetch('http://127.0.0.1:5000/payment/my-payments', {
-            headers: {
-              'Authorization': `Bearer ${localStorage.getItem('token')}`,
-              'Content-Type': 'application/json'
-            }
-          });
-          console.log('Direct test response status:', testResponse.status);
-          console.log('Direct test response:', testResponse);
-
-          if (testResponse.ok) {
-            const testData = await testResponse.json();
-            console.log('Direct test data:', testData);
-
-            // Store the payments data in sessionStorage for future use
-            try {
-              sessionStorage.setItem('userPayments', JSON.stringify(testData));
-              console.log('Stored payments data in sessionStorage via direct API');
-            } catch (storageError) {
-              console.error('Error storing payments data:', storageError);
-            }
-
-            // Try to find the payment in the direct response
-            const directPayment = testData.find(p => p.booking_id == id);
-            if (directPayment) {
-              console.log('Found payment via direct API call:', directPayment);
-              setPayment(directPayment);
-              return;
-            }
-          }
-        } catch (directError) {
-          console.error('Direct API test also failed:', directError);
-        }
-
         // If all API calls fail, try to get data from localStorage or sessionStorage
         // This might contain the payment data from the previous page
         console.log('Trying to get payment data from storage...');
@@ -267,33 +231,15 @@ const PaymentDetail = () => {
       // Show loading notification
       addNotification('Generating PDF receipt...', 'info');
 
-      // Get the authentication token
-      const token = localStorage.getItem('token');
-      if (!token) {
-        addNotification('Authentication required for download', 'error');
-        return;
-      }
-
-      // Make API call to download PDF
-      const response = await fetch(`http://127.0.0.1:5000/receipt/${payment.booking_id}`, {
-        method: 'GET',
-        headers: {
-          'Authorization': `Bearer ${token}`,
-          'Content-Type': 'application/json',
-        },
-      });
-
-      if (!response.ok) {
-        const errorData = await response.json();
-        throw new Error(errorData.error || 'Failed to download PDF');
-      }
+      // Through apiClient, so an expired access token is refreshed and the request retried
+      const response = await paymentApi.downloadReceipt(payment.booking_id);
 
       // Check if response is PDF or JSON with base64 data
-      const contentType = response.headers.get('content-type');
+      const contentType = response.headers['content-type'];
 
       if (contentType && contentType.includes('application/pdf')) {
         // Direct PDF download
-        const pdfBlob = await response.blob();
+        const pdfBlob = response.data;
 
         // Create download link
         const url = window.URL.createObjectURL(pdfBlob);
@@ -310,7 +256,7 @@ const PaymentDetail = () => {
         window.URL.revokeObjectURL(url);
       } else {
         // Fallback: JSON response with base64 PDF data
-        const data = await response.json();
+        const data = JSON.parse(await response.data.text());
 
         if (data.pdf_data && data.filename) {
           // Convert base64 to blob